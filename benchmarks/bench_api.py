@@ -0,0 +1,217 @@
+"""
+Бенчмарк API: /check и /check/batch под локальным uvicorn
+и сборка ответа /check/batch в процессе.
+
+Сервер запускается отдельным процессом с текущим окружением
+(переменные конфигурации действуют как обычно). Нагрузку дают
+несколько потоков с постоянными (keep-alive) соединениями; для каждого
+запроса меряется задержка, по ним считаются p50, p99 и запросы в секунду.
+"""
+
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Iterable, List, Tuple
+
+from common import SRC, Results, iter_dump_passwords, measure, percentile
+
+STARTUP_TIMEOUT = 30.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """uvicorn с api:app на свободном порту (контекстный менеджер)."""
+
+    def __init__(self):
+        self.port = _free_port()
+        self.process = None
+
+    def __enter__(self) -> "LocalServer":
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api:app",
+             "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning"],
+            cwd=SRC,
+            env={**os.environ, "PYTHONPATH": SRC},
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=1)
+                connection.request("GET", "/health")
+                if connection.getresponse().status == 200:
+                    connection.close()
+                    return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise RuntimeError("uvicorn не запустился")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def _load(port: int, path: str, bodies: List[bytes], concurrency: int,
+          duration: float) -> Tuple[List[float], int, float]:
+    """
+    Шлет запросы из concurrency потоков в течение duration секунд.
+
+    Returns:
+        Tuple[List[float], int, float]: отсортированные задержки (с),
+            число ошибок, фактическая длительность
+    """
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset: int):
+        nonlocal errors
+        local: List[float] = []
+        failed = 0
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        headers = {"Content-Type": "application/json"}
+        index = offset
+        while time.perf_counter() < deadline:
+            body = bodies[index % len(bodies)]
+            index += concurrency
+            start = time.perf_counter()
+            try:
+                connection.request("POST", path, body, headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return latencies, errors, time.perf_counter() - start
+
+
+def _report(results: Results, name: str, latencies: List[float], errors: int,
+            elapsed: float):
+    results.add(f"{name}.p50_ms", percentile(latencies, 0.50) * 1000, "ms", "lower")
+    results.add(f"{name}.p99_ms", percentile(latencies, 0.99) * 1000, "ms", "lower")
+    results.add(f"{name}.rps", len(latencies) / elapsed, "req/s")
+    if errors:
+        print(f"  ⚠️ {name}: {errors} ошибок")
+
+
+def bench_api(results: Results, duration: float = 5.0, concurrency: int = 8,
+              batch_size: int = 1000):
+    """/check и /check/batch под нагрузкой."""
+    passwords = list(iter_dump_passwords(10_000))
+    single = [
+        json.dumps({"password": password}).encode("utf-8") for password in passwords
+    ]
+    batches = [
+        json.dumps({"passwords": passwords[i:i + batch_size]}).encode("utf-8")
+        for i in range(0, len(passwords), batch_size)
+    ]
+
+    with LocalServer() as server:
+        # Прогрев: первые запросы импортируют и строят ленивые таблицы
+        _load(server.port, "/check/batch", batches[:1], 1, 0.5)
+
+        latencies, errors, elapsed = _load(server.port, "/check", single, concurrency, duration)
+        _report(results, "api.check", latencies, errors, elapsed)
+
+        latencies, errors, elapsed = _load(
+            server.port, "/check/batch", batches, concurrency, duration
+        )
+        _report(results, f"api.batch{batch_size}", latencies, errors, elapsed)
+        results.add(
+            f"api.batch{batch_size}.passwords_per_s",
+            len(latencies) * batch_size / elapsed,
+            "passwords/s",
+        )
+
+
+def bench_serialization(results: Results, sizes: Iterable[int]):
+    """
+    Сборка тела ответа /check/batch: через response_model, как делает
+    FastAPI для возвращенного словаря, через FastJSONResponse и в
+    бинарном формате кадров (codec.py), а также размер ответа.
+    """
+    import asyncio
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    import api
+    from codec import FRAMES_TYPE, column_bytes, encode_results
+
+    field = next(
+        route.response_field for route in api.app.routes
+        if getattr(route, "path", None) == "/check/batch"
+    )
+    loop = asyncio.new_event_loop()
+    try:
+        for size in sizes:
+            passwords = list(iter_dump_passwords(size))
+            policy = api.get_policy()
+            payload = {
+                "results": policy.batch_to_dicts(passwords, policy.evaluate_batch(passwords)),
+                "total_count": size,
+                "strong_count": 0,
+                "weak_count": 0,
+            }
+
+            def with_model(payload=payload):
+                content = loop.run_until_complete(
+                    serialize_response(field=field, response_content=payload)
+                )
+                return JSONResponse(content).body
+
+            model_seconds = measure(with_model, repeat=3)
+            fast_seconds = measure(lambda payload=payload: api.FastJSONResponse(payload).body, repeat=3)
+            results.add(f"api.serialize.model.{size}", size / model_seconds, "passwords/s")
+            results.add(f"api.serialize.fast.{size}", size / fast_seconds, "passwords/s")
+            results.add(f"api.serialize.speedup.{size}", model_seconds / fast_seconds, "x")
+
+            # Бинарный ответ строится из столбцов, без словарей
+            columns = policy.evaluate_batch(passwords)
+
+            def frames(policy=policy, columns=columns):
+                return encode_results(
+                    FRAMES_TYPE, policy.max_score,
+                    column_bytes(columns["score"]), column_bytes(columns["strength"]),
+                    column_bytes(policy.failed_rules(columns)), 0, 0,
+                )
+
+            frames_seconds = measure(frames, repeat=3)
+            results.add(f"api.serialize.frames.{size}", size / frames_seconds, "passwords/s")
+            results.add(f"api.serialize.json_bytes.{size}",
+                        len(api.FastJSONResponse(payload).body) / size, "B/password", "lower")
+            results.add(f"api.serialize.frames_bytes.{size}",
+                        len(frames()) / size, "B/password", "lower")
+    finally:
+        loop.close()
@@ -0,0 +1,54 @@
+"""
+Бенчмарки ядра: evaluate_password по длинам и наборам символов
+и пакетная оценка evaluate_batch.
+"""
+
+import gc
+import time
+from typing import Iterable
+
+from common import (
+    CHARACTER_MIXES,
+    Results,
+    generate_passwords,
+    iter_dump_passwords,
+    measure,
+)
+
+PASSWORD_LENGTHS = (8, 16, 64, 256)
+# Сколько разных паролей перебирается в замере одиночной оценки
+SAMPLE_SIZE = 256
+
+
+def bench_evaluate(results: Results):
+    """evaluate_password для каждой пары (длина, набор символов)."""
+    from checker import evaluate_password
+
+    for length in PASSWORD_LENGTHS:
+        for mix in CHARACTER_MIXES:
+            passwords = generate_passwords(SAMPLE_SIZE, length, mix)
+
+            def run(passwords=passwords):
+                for password in passwords:
+                    evaluate_password(password)
+
+            seconds = measure(run) / len(passwords)
+            results.add(f"checker.evaluate.len{length}.{mix}", 1 / seconds, "ops/s")
+
+
+def bench_batch(results: Results, sizes: Iterable[int]):
+    """evaluate_batch на пакетах разного размера."""
+    from checker import evaluate_batch
+
+    for size in sizes:
+        passwords = list(iter_dump_passwords(size))
+        gc.collect()
+        # Большие пакеты меряем одним прогоном - он и так длится секунды
+        if size >= 1_000_000:
+            start = time.perf_counter()
+            evaluate_batch(passwords)
+            seconds = time.perf_counter() - start
+        else:
+            seconds = measure(lambda passwords=passwords: evaluate_batch(passwords), repeat=3)
+        results.add(f"checker.batch.{size}", size / seconds, "passwords/s")
+        del passwords
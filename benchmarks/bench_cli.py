@@ -0,0 +1,51 @@
+"""
+Бенчмарк CLI: пропускная способность main.py --file на сгенерированных дампах.
+
+Каждый режим запускается отдельным процессом, поэтому замер включает
+запуск интерпретатора и импорт модулей - как у пользователя.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Iterable
+
+from common import ROOT, Results, write_dump
+
+MAIN = os.path.join(ROOT, "src", "main.py")
+
+# Режим -> дополнительные аргументы main.py
+CLI_MODES = {
+    "file": [],
+    "file_json": ["--json"],
+    "stream_json": ["--stream", "--json"],
+    "workers4_json": ["--json", "--workers", "4"],
+}
+
+
+def _run_cli(args, repeat: int) -> float:
+    """Лучшее время работы main.py с аргументами (вывод отбрасывается)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, MAIN, *args],
+            stdout=subprocess.DEVNULL,
+            check=True,
+            cwd=ROOT,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_cli(results: Results, sizes: Iterable[int], repeat: int = 3):
+    """main.py --file в каждом режиме для дампов заданных размеров."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            dump = os.path.join(tmp, f"dump_{size}.txt")
+            write_dump(dump, size)
+            for mode, extra in CLI_MODES.items():
+                seconds = _run_cli(["--file", dump, *extra], repeat)
+                results.add(f"cli.{mode}.{size}", size / seconds, "passwords/s")
@@ -0,0 +1,168 @@
+"""
+Общие инструменты бенчмарков: генерация паролей, замеры и формат результатов.
+
+Каждый замер - это метрика с именем, значением, единицей измерения
+и направлением ("higher" - больше лучше, "lower" - меньше лучше).
+Результаты прогона сохраняются в JSON вместе с описанием окружения,
+чтобы их можно было сравнить командой compare.
+"""
+
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# Наборы символов для генерации паролей
+CHARACTER_MIXES = {
+    "lower": string.ascii_lowercase,
+    "alnum": string.ascii_letters + string.digits,
+    "full": string.ascii_letters + string.digits + "!@#$%^&*()_+-=[]{}|;:,.<>?`~",
+    "unicode": "абвгдеёжзийклмнопрстуфхцчшщъыьэюяАБВГДЕЁЖЗ0123456789!@#äöüßéñ",
+}
+
+# Фиксированное зерно - одинаковые данные в каждом прогоне
+SEED = 20240101
+
+
+def generate_passwords(count: int, length: int, mix: str, seed: int = SEED) -> List[str]:
+    """
+    Генерирует воспроизводимый набор паролей.
+
+    Args:
+        count (int): Число паролей
+        length (int): Длина каждого пароля
+        mix (str): Набор символов из CHARACTER_MIXES
+
+    Returns:
+        List[str]: Пароли
+    """
+    rng = random.Random(seed)
+    alphabet = CHARACTER_MIXES[mix]
+    return ["".join(rng.choices(alphabet, k=length)) for _ in range(count)]
+
+
+def iter_dump_passwords(count: int, seed: int = SEED) -> Iterator[str]:
+    """
+    Пароли, похожие на дамп утечки: разные длины и наборы символов,
+    часть - популярные пароли и их вариации.
+    """
+    from checker import COMMON_PASSWORDS
+
+    rng = random.Random(seed)
+    common = sorted(COMMON_PASSWORDS)
+    mixes = list(CHARACTER_MIXES.values())
+    for _ in range(count):
+        if rng.random() < 0.2:
+            yield rng.choice(common) + str(rng.randint(0, 99))
+        else:
+            length = rng.choice((6, 8, 8, 10, 12, 16, 24))
+            yield "".join(rng.choices(rng.choice(mixes), k=length))
+
+
+def write_dump(path: str, count: int):
+    """Записывает сгенерированный дамп паролей, один на строку."""
+    with open(path, "w", encoding="utf-8") as file:
+        for password in iter_dump_passwords(count):
+            file.write(password + "\n")
+
+
+def measure(func: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> float:
+    """
+    Время одного вызова func в секундах (лучшее из repeat серий).
+
+    Число вызовов в серии подбирается так, чтобы серия длилась
+    не меньше min_time - как в timeit.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Перцентиль отсортированного списка (fraction от 0 до 1)."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+class Results:
+    """Набор метрик одного прогона."""
+
+    def __init__(self):
+        self.metrics: Dict[str, dict] = {}
+
+    def add(self, name: str, value: float, unit: str, better: str = "higher"):
+        """
+        Добавляет метрику и печатает ее.
+
+        Args:
+            name (str): Имя метрики, например "checker.evaluate.len16.full"
+            value (float): Значение
+            unit (str): Единица измерения
+            better (str): "higher" или "lower" - какое изменение - улучшение
+        """
+        self.metrics[name] = {"value": value, "unit": unit, "better": better}
+        print(f"  {name:<55} {value:>14,.2f} {unit}")
+
+    def save(self, path: str, suites: List[str]):
+        """Сохраняет метрики и описание окружения в JSON."""
+        data = {"environment": environment(suites), "metrics": self.metrics}
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def environment(suites: List[str]) -> dict:
+    """Описание окружения прогона (для сравнения сопоставимых результатов)."""
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy_version,
+        "suites": suites,
+    }
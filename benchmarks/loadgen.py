@@ -0,0 +1,709 @@
+"""
+Генератор нагрузки для API: оценка пропускной способности и точки насыщения.
+
+    cd benchmarks
+    python -m loadgen --mode closed --concurrency 32 --duration 10
+    python -m loadgen --mode open --rps 2000 --mix check=0.8,batch=0.2
+    python -m loadgen --mode open --ramp 500:5000:500 --slo-ms 50
+    python -m loadgen --url http://127.0.0.1:8000 --hdr-output check.hgrm
+
+Без --url запускается локальный uvicorn с api:app (как в bench_api.py).
+Клиент асинхронный, с пулом постоянных (keep-alive) соединений HTTP/1.1
+и без сторонних зависимостей.
+
+Режимы:
+    closed - N пользователей; следующий запрос уходит после ответа на
+        предыдущий. --rps дополнительно ограничивает общий темп.
+    open - запросы уходят по расписанию с темпом --rps независимо от
+        ответов. Задержка считается от запланированного момента отправки,
+        поэтому очередь на стороне клиента тоже попадает в задержку
+        (без "coordinated omission").
+
+--ramp START:STOP:STEP повторяет прогон, увеличивая нагрузку (темп в
+режиме open, число пользователей в closed), до первого шага, на котором
+сервис насыщен: не держит заданный темп, перестает расти пропускная
+способность, растут ошибки или p99 выходит за --slo-ms.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from common import Results, iter_dump_passwords
+
+MODES = ("closed", "open")
+
+# Маршруты нагрузки: имя в --mix -> путь
+ROUTES = {"check": "/check", "batch": "/check/batch"}
+DEFAULT_MIX = "check=0.9,batch=0.1"
+DEFAULT_BATCH_SIZE = 100
+
+# Число разных тел запросов для каждого маршрута
+BODY_COUNT = 1000
+
+# Признаки насыщения: доля заданного темпа, которую сервис должен
+# держать (open), минимальный прирост пропускной способности между
+# шагами (closed) и допустимая доля ошибок
+SATURATION_THROUGHPUT = 0.95
+SATURATION_GROWTH = 0.05
+SATURATION_ERROR_RATE = 0.01
+
+# Сколько ждать ответов на уже отправленные запросы после окончания шага, с
+DRAIN_TIMEOUT = 10.0
+
+# Перцентили в кратком отчете
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9, 99.99)
+
+
+# =====================================================================
+# ГИСТОГРАММА ЗАДЕРЖЕК
+# =====================================================================
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек в микросекундах в духе HdrHistogram.
+
+    Значения меньше 2^SUB_BITS хранятся точно, большие - в корзинах,
+    ширина которых растет вместе со значением, так что относительная
+    погрешность не превышает 1 / 2^(SUB_BITS - 1) (около 1.6%). Память
+    зависит только от диапазона значений, а не от их числа.
+    """
+
+    SUB_BITS = 7
+    SUB_COUNT = 1 << SUB_BITS
+    HALF_COUNT = SUB_COUNT >> 1
+
+    def __init__(self):
+        self.counts: List[int] = []
+        self.total = 0
+        self.sum = 0
+        self.sum_squares = 0
+        self.min = 0
+        self.max = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        if value < cls.SUB_COUNT:
+            return value
+        shift = value.bit_length() - cls.SUB_BITS
+        return cls.SUB_COUNT + (shift - 1) * cls.HALF_COUNT + (value >> shift) - cls.HALF_COUNT
+
+    @classmethod
+    def _highest_value(cls, index: int) -> int:
+        """Наибольшее значение, попадающее в корзину index."""
+        if index < cls.SUB_COUNT:
+            return index
+        shift = (index - cls.SUB_COUNT) // cls.HALF_COUNT + 1
+        sub = (index - cls.SUB_COUNT) % cls.HALF_COUNT + cls.HALF_COUNT
+        return ((sub + 1) << shift) - 1
+
+    def record(self, microseconds: int):
+        """Учитывает одну задержку."""
+        value = max(0, int(microseconds))
+        index = self._index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        if not self.total or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total += 1
+        self.sum += value
+        self.sum_squares += value * value
+
+    def merge(self, other: "LatencyHistogram"):
+        """Добавляет значения другой гистограммы."""
+        if not other.total:
+            return
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.min = other.min if not self.total else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.sum += other.sum
+        self.sum_squares += other.sum_squares
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+    @property
+    def stddev(self) -> float:
+        if not self.total:
+            return 0.0
+        return math.sqrt(max(0.0, self.sum_squares / self.total - self.mean ** 2))
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Задержка (мкс), не меньше которой percentile% значений."""
+        if not self.total:
+            return 0
+        target = max(1, int(percentile / 100 * self.total + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest_value(index), self.max)
+        return self.max
+
+    def percentile_distribution(self, ticks_per_half: int = 5) -> List[Tuple[int, float, int]]:
+        """
+        Распределение перцентилей как в выводе HdrHistogram: шаг по
+        перцентилям уменьшается вдвое с каждой "половиной" хвоста.
+
+        Returns:
+            List[Tuple[int, float, int]]: (значение, перцентиль от 0 до 1,
+                число значений не больше него)
+        """
+        rows: List[Tuple[int, float, int]] = []
+        if not self.total:
+            return rows
+        percentile = 0.0
+        while percentile < 100.0:
+            value = self.value_at_percentile(percentile)
+            count = self._count_at_or_below(value)
+            if count == self.total:
+                break
+            rows.append((value, percentile / 100, count))
+            # Как в HdrHistogram: с каждой половиной оставшегося хвоста
+            # шаг по перцентилям уменьшается вдвое
+            half_distance = 2 ** (int(math.log2(100.0 / (100.0 - percentile))) + 1)
+            percentile += 100.0 / (ticks_per_half * half_distance)
+        rows.append((self.max, 1.0, self.total))
+        return rows
+
+    def _count_at_or_below(self, value: int) -> int:
+        limit = self._index(value)
+        return sum(self.counts[:limit + 1])
+
+    def to_hgrm(self, scale: float = 1000.0) -> str:
+        """
+        Распределение в текстовом формате .hgrm (для HdrHistogram Plotter).
+
+        Args:
+            scale (float): Делитель значений; 1000 - миллисекунды
+        """
+        lines = [f"{'Value':>12} {'Percentile':>14} {'TotalCount':>10} {'1/(1-Percentile)':>14}", ""]
+        for value, fraction, count in self.percentile_distribution():
+            inverse = "" if fraction >= 1.0 else f"{1 / (1 - fraction):14.2f}"
+            lines.append(f"{value / scale:12.3f} {fraction:14.12f} {count:10d} {inverse}".rstrip())
+        lines.append(
+            f"#[Mean    = {self.mean / scale:12.3f}, StdDeviation   = {self.stddev / scale:12.3f}]"
+        )
+        lines.append(
+            f"#[Max     = {self.max / scale:12.3f}, Total count    = {self.total:12d}]"
+        )
+        return "\n".join(lines) + "\n"
+
+
+# =====================================================================
+# HTTP-КЛИЕНТ
+# =====================================================================
+
+class _Connection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class HttpPool:
+    """
+    Пул постоянных соединений HTTP/1.1 к одному серверу.
+
+    Соединения открываются по мере надобности, но не больше size;
+    запрос, которому не хватило соединения, ждет освободившееся.
+    Соединение с ошибкой закрывается, вместо него откроется новое.
+    """
+
+    def __init__(self, host: str, port: int, size: int):
+        self.host = host
+        self.port = port
+        self.size = size
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(size)
+        self._open: List[_Connection] = []
+
+    async def _acquire(self) -> _Connection:
+        await self._slots.acquire()
+        if not self._idle.empty():
+            return self._idle.get_nowait()
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except BaseException:
+            self._slots.release()
+            raise
+        connection = _Connection(reader, writer)
+        self._open.append(connection)
+        return connection
+
+    def _release(self, connection: _Connection, reusable: bool):
+        if reusable:
+            self._idle.put_nowait(connection)
+        else:
+            connection.close()
+            self._open.remove(connection)
+        self._slots.release()
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+        """
+        Отправляет запрос и читает ответ целиком.
+
+        Returns:
+            Tuple[int, bytes]: Код ответа и тело
+        """
+        connection = await self._acquire()
+        reusable = False
+        try:
+            connection.writer.write(
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+            )
+            status, payload, keep_alive = await _read_response(connection.reader)
+            reusable = keep_alive
+            return status, payload
+        finally:
+            self._release(connection, reusable)
+
+    async def close(self):
+        """Закрывает все соединения."""
+        for connection in self._open:
+            connection.close()
+        self._open.clear()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes, bool]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("сервер закрыл соединение")
+    status = int(status_line.split(None, 2)[1])
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        payload = b"".join(chunks)
+    else:
+        payload = await reader.readexactly(int(headers.get("content-length", 0)))
+    keep_alive = headers.get("connection", "").lower() != "close"
+    return status, payload, keep_alive
+
+
+# =====================================================================
+# НАГРУЗКА
+# =====================================================================
+
+def parse_mix(text: str) -> List[Tuple[str, float]]:
+    """
+    Разбирает смесь маршрутов вида "check=0.8,batch=0.2".
+
+    Returns:
+        List[Tuple[str, float]]: (маршрут, доля); доли нормированы к 1
+
+    Raises:
+        ValueError: Неизвестный маршрут или доли не положительны
+    """
+    weights: List[Tuple[str, float]] = []
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"неизвестный маршрут {name!r}, есть: {', '.join(ROUTES)}")
+        weights.append((name, float(weight) if weight else 1.0))
+    total = sum(weight for _, weight in weights)
+    if total <= 0 or any(weight < 0 for _, weight in weights):
+        raise ValueError("доли маршрутов должны быть положительными")
+    return [(name, weight / total) for name, weight in weights if weight > 0]
+
+
+class Workload:
+    """Заранее закодированные тела запросов и выбор маршрута по смеси."""
+
+    def __init__(self, mix: Sequence[Tuple[str, float]], batch_size: int, seed: int = 1):
+        self.names = [name for name, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self._rng = random.Random(seed)
+        passwords = list(iter_dump_passwords(BODY_COUNT))
+        self.bodies: Dict[str, List[bytes]] = {}
+        if "check" in self.names:
+            self.bodies["check"] = [
+                json.dumps({"password": password}).encode("utf-8") for password in passwords
+            ]
+        if "batch" in self.names:
+            self.bodies["batch"] = [
+                json.dumps({
+                    "passwords": [passwords[(i + j) % len(passwords)] for j in range(batch_size)]
+                }).encode("utf-8")
+                for i in range(0, len(passwords), max(1, len(passwords) // 100))
+            ]
+
+    def next(self) -> Tuple[str, str, bytes]:
+        """Следующий запрос: (маршрут, путь, тело)."""
+        name = self._rng.choices(self.names, self.weights)[0]
+        return name, ROUTES[name], self._rng.choice(self.bodies[name])
+
+
+class StepStats:
+    """Итоги одного прогона: задержки по маршрутам, ошибки, темп."""
+
+    def __init__(self, load: float):
+        self.load = load
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.sent = 0
+        self.elapsed = 0.0
+
+    def record(self, route: str, microseconds: int):
+        histogram = self.histograms.get(route)
+        if histogram is None:
+            histogram = self.histograms[route] = LatencyHistogram()
+        histogram.record(microseconds)
+
+    def error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    @property
+    def overall(self) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for route_histogram in self.histograms.values():
+            histogram.merge(route_histogram)
+        return histogram
+
+    @property
+    def completed(self) -> int:
+        return sum(histogram.total for histogram in self.histograms.values())
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        """Успешные ответы в секунду."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.error_count / self.sent if self.sent else 0.0
+
+
+async def _send(pool: HttpPool, workload: Workload, stats: StepStats,
+                scheduled: Optional[float] = None):
+    """Один запрос; задержка считается от scheduled (если задан)."""
+    route, path, body = workload.next()
+    start = time.perf_counter() if scheduled is None else scheduled
+    stats.sent += 1
+    try:
+        status, _ = await pool.request("POST", path, body)
+    except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+        stats.error(type(e).__name__)
+        return
+    if status != 200:
+        stats.error(f"HTTP {status}")
+        return
+    stats.record(route, int((time.perf_counter() - start) * 1_000_000))
+
+
+class _Pacer:
+    """Общий темп для пользователей закрытого цикла."""
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps
+        self.next_slot = time.perf_counter()
+
+    async def wait(self):
+        now = time.perf_counter()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def run_closed(pool: HttpPool, workload: Workload, concurrency: int,
+                     duration: float, rps: Optional[float] = None) -> StepStats:
+    """Закрытый цикл: concurrency пользователей шлют запросы друг за другом."""
+    stats = StepStats(concurrency)
+    pacer = _Pacer(rps) if rps else None
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            if pacer is not None:
+                await pacer.wait()
+            await _send(pool, workload, stats)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+async def run_open(pool: HttpPool, workload: Workload, rps: float,
+                   duration: float) -> StepStats:
+    """
+    Открытый цикл: запросы уходят по расписанию с темпом rps.
+
+    Если соединений не хватает, запрос ждет свободное, и это ожидание
+    входит в его задержку. Ответы, не пришедшие за DRAIN_TIMEOUT после
+    конца прогона, считаются ошибками.
+    """
+    stats = StepStats(rps)
+    tasks = set()
+    start = time.perf_counter()
+    total = int(rps * duration)
+    scheduled = 0
+    while scheduled < total:
+        now = time.perf_counter()
+        due = min(total, int((now - start) * rps) + 1)
+        while scheduled < due:
+            slot = start + scheduled / rps
+            task = asyncio.ensure_future(_send(pool, workload, stats, slot))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            scheduled += 1
+        await asyncio.sleep(max(0.0, start + scheduled / rps - time.perf_counter()))
+
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=DRAIN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+            stats.error("timeout")
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+# =====================================================================
+# ТОЧКА НАСЫЩЕНИЯ
+# =====================================================================
+
+def is_saturated(mode: str, stats: StepStats, previous: Optional[StepStats],
+                 slo_ms: Optional[float] = None) -> Optional[str]:
+    """
+    Проверяет признаки насыщения на шаге нагрузки.
+
+    Args:
+        mode (str): "open" или "closed"
+        stats: Итоги шага
+        previous: Итоги предыдущего шага (для closed)
+        slo_ms: Допустимый p99 в миллисекундах
+
+    Returns:
+        Optional[str]: Причина насыщения или None
+    """
+    if stats.error_rate > SATURATION_ERROR_RATE:
+        return f"ошибки {stats.error_rate:.1%}"
+    if slo_ms is not None and stats.overall.value_at_percentile(99) / 1000 > slo_ms:
+        return f"p99 больше {slo_ms:g} мс"
+    if mode == "open" and stats.throughput < stats.load * SATURATION_THROUGHPUT:
+        return f"держит {stats.throughput:,.0f} из {stats.load:,.0f} запросов/с"
+    if (mode == "closed" and previous is not None
+            and stats.throughput < previous.throughput * (1 + SATURATION_GROWTH)):
+        return "пропускная способность не растет"
+    return None
+
+
+def parse_ramp(text: str) -> List[float]:
+    """Шаги нагрузки из "START:STOP:STEP"."""
+    start, stop, step = (float(part) for part in text.split(":"))
+    if start <= 0 or step <= 0 or stop < start:
+        raise ValueError("ожидается START:STOP:STEP с 0 < START <= STOP и STEP > 0")
+    steps = []
+    value = start
+    while value <= stop + 1e-9:
+        steps.append(value)
+        value += step
+    return steps
+
+
+# =====================================================================
+# ОТЧЕТ
+# =====================================================================
+
+def _ms(microseconds: float) -> str:
+    return f"{microseconds / 1000:9.2f}"
+
+
+def print_step(mode: str, stats: StepStats):
+    """Строка таблицы шагов."""
+    histogram = stats.overall
+    load = f"{stats.load:,.0f} rps" if mode == "open" else f"{stats.load:,.0f} польз."
+    print(
+        f"  {load:>14} {stats.throughput:>11,.0f} {_ms(histogram.value_at_percentile(50))}"
+        f" {_ms(histogram.value_at_percentile(99))} {_ms(histogram.value_at_percentile(99.9))}"
+        f" {stats.error_count:>7}"
+    )
+
+
+def print_report(stats: StepStats):
+    """Подробный отчет по прогону: перцентили по маршрутам и ошибки."""
+    print(f"\n📊 Запросов: {stats.sent:,}, успешно: {stats.completed:,}, "
+          f"{stats.throughput:,.0f} запросов/с за {stats.elapsed:.1f} с")
+    header = "".join(f"{'p' + format(p, 'g'):>10}" for p in REPORT_PERCENTILES)
+    print(f"  {'маршрут':<8}{'min':>10}{'mean':>10}{header}{'max':>10}   (мс)")
+    routes = sorted(stats.histograms.items())
+    if len(routes) > 1:
+        routes.append(("все", stats.overall))
+    for route, histogram in routes:
+        values = "".join(
+            f"{_ms(histogram.value_at_percentile(p)):>10}" for p in REPORT_PERCENTILES
+        )
+        print(f"  {route:<8}{_ms(histogram.min):>10}{_ms(histogram.mean):>10}"
+              f"{values}{_ms(histogram.max):>10}")
+    if stats.errors:
+        errors = ", ".join(f"{kind}: {count}" for kind, count in sorted(stats.errors.items()))
+        print(f"  ⚠️ Ошибки ({stats.error_rate:.2%}): {errors}")
+
+
+# =====================================================================
+# CLI
+# =====================================================================
+
+async def _run(args, host: str, port: int) -> Tuple[List[StepStats], Optional[float]]:
+    workload = Workload(parse_mix(args.mix), args.batch_size)
+    steps = parse_ramp(args.ramp) if args.ramp else [
+        args.rps if args.mode == "open" else args.concurrency
+    ]
+    connections = args.connections or (
+        args.concurrency if args.mode == "closed" and not args.ramp else 64
+    )
+    if args.mode == "closed":
+        connections = max(connections, int(max(steps)))
+
+    pool = HttpPool(host, port, connections)
+    results: List[StepStats] = []
+    saturation: Optional[float] = None
+    try:
+        # Прогрев: соединения, ленивые таблицы и кэши сервера
+        await run_closed(pool, workload, min(connections, 8), args.warmup)
+
+        print(f"\n⏱ {args.mode}: смесь {args.mix}, пакет {args.batch_size}, "
+              f"{args.duration:g} с на шаг, соединений {connections}")
+        print(f"  {'нагрузка':>14} {'ответов/с':>11} {'p50 мс':>9} {'p99 мс':>9}"
+              f" {'p99.9 мс':>9} {'ошибок':>7}")
+        for load in steps:
+            if args.mode == "open":
+                stats = await run_open(pool, workload, load, args.duration)
+            else:
+                stats = await run_closed(pool, workload, int(load), args.duration, args.rps)
+            print_step(args.mode, stats)
+            reason = is_saturated(args.mode, stats, results[-1] if results else None,
+                                  args.slo_ms)
+            if reason and args.ramp:
+                print(f"  🔴 Насыщение: {reason}")
+                saturation = max((s.throughput for s in results), default=0.0)
+                results.append(stats)
+                break
+            results.append(stats)
+    finally:
+        await pool.close()
+    return results, saturation
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI генератора нагрузки."""
+    parser = argparse.ArgumentParser(description="Генератор нагрузки для API проверки паролей")
+    parser.add_argument("--url", help="Адрес сервиса (по умолчанию - локальный uvicorn с api:app)")
+    parser.add_argument("--mode", choices=MODES, default="closed",
+                        help="closed - пользователи ждут ответа; open - фиксированный темп")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Число пользователей в режиме closed (по умолчанию 16)")
+    parser.add_argument("--rps", type=float,
+                        help="Темп запросов/с: обязателен для open, ограничение для closed")
+    parser.add_argument("--connections", type=int,
+                        help="Размер пула соединений (по умолчанию: concurrency или 64)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"Доли маршрутов (по умолчанию {DEFAULT_MIX})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Паролей в /check/batch (по умолчанию {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="Длительность прогона (шага) в секундах")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Прогрев в секундах")
+    parser.add_argument("--ramp", metavar="START:STOP:STEP",
+                        help="Поиск точки насыщения: шаги темпа (open) или пользователей (closed)")
+    parser.add_argument("--slo-ms", type=float, help="Допустимый p99 для поиска насыщения, мс")
+    parser.add_argument("--hdr-output", metavar="PATH",
+                        help="Сохранить гистограмму последнего шага в формате .hgrm")
+    parser.add_argument("-o", "--output", metavar="PATH",
+                        help="Сохранить метрики в JSON (для run.py compare)")
+    args = parser.parse_args(argv)
+
+    if args.mode == "open" and not args.rps and not args.ramp:
+        parser.error("для режима open нужен --rps или --ramp")
+    try:
+        parse_mix(args.mix)
+        if args.ramp:
+            parse_ramp(args.ramp)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.url:
+        parts = urlsplit(args.url)
+        server = nullcontext()
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    else:
+        from bench_api import LocalServer
+        server = LocalServer()
+        host, port = "127.0.0.1", server.port
+
+    with server:
+        steps, saturation = asyncio.run(_run(args, host, port))
+
+    final = steps[-1] if saturation is None else max(steps[:-1] or steps,
+                                                     key=lambda s: s.throughput)
+    print_report(final)
+    if args.ramp:
+        if saturation is None:
+            print("\n🟢 Насыщение не достигнуто на заданных шагах")
+        elif len(steps) == 1:
+            print("\n🔴 Сервис насыщен уже на первом шаге")
+        else:
+            print(f"\n🎯 Точка насыщения: около {saturation:,.0f} запросов/с")
+
+    if args.hdr_output:
+        with open(args.hdr_output, "w", encoding="utf-8") as file:
+            file.write(final.overall.to_hgrm())
+        print(f"💾 Гистограмма сохранена в {args.hdr_output}")
+
+    if args.output:
+        results = Results()
+        name = f"loadgen.{args.mode}"
+        histogram = final.overall
+        results.add(f"{name}.rps", final.throughput, "req/s")
+        results.add(f"{name}.p50_ms", histogram.value_at_percentile(50) / 1000, "ms", "lower")
+        results.add(f"{name}.p99_ms", histogram.value_at_percentile(99) / 1000, "ms", "lower")
+        results.add(f"{name}.error_rate", final.error_rate, "ratio", "lower")
+        if saturation is not None:
+            results.add(f"{name}.saturation_rps", saturation, "req/s")
+        results.save(args.output, ["loadgen"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Запуск бенчмарков и сравнение результатов.
+
+    python benchmarks/run.py run --output results.json
+    python benchmarks/run.py run --suite checker --suite batch --quick
+    python benchmarks/run.py compare baseline.json results.json --threshold 10
+
+compare печатает изменение каждой метрики и завершается с кодом 1,
+если какая-то из них ухудшилась больше чем на порог (в процентах).
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+from common import Results
+
+SUITES = ("checker", "batch", "cli", "api", "serialize")
+
+# Размеры пакетов и дампов: полный прогон и быстрый (--quick)
+BATCH_SIZES = (1_000, 100_000, 10_000_000)
+QUICK_BATCH_SIZES = (1_000, 100_000)
+CLI_SIZES = (10_000, 200_000)
+QUICK_CLI_SIZES = (10_000,)
+SERIALIZE_SIZES = (100, 1_000, 10_000)
+QUICK_SERIALIZE_SIZES = (100, 1_000)
+
+DEFAULT_THRESHOLD = 10.0
+
+
+def run_suites(suites: List[str], quick: bool = False) -> Results:
+    """Запускает выбранные наборы бенчмарков."""
+    results = Results()
+    for suite in suites:
+        print(f"\n⏱ {suite}")
+        if suite == "checker":
+            from bench_checker import bench_evaluate
+            bench_evaluate(results)
+        elif suite == "batch":
+            from bench_checker import bench_batch
+            bench_batch(results, QUICK_BATCH_SIZES if quick else BATCH_SIZES)
+        elif suite == "cli":
+            from bench_cli import bench_cli
+            bench_cli(results, QUICK_CLI_SIZES if quick else CLI_SIZES,
+                      repeat=1 if quick else 3)
+        elif suite == "api":
+            from bench_api import bench_api
+            bench_api(results, duration=2.0 if quick else 5.0)
+        elif suite == "serialize":
+            from bench_api import bench_serialization
+            bench_serialization(results, QUICK_SERIALIZE_SIZES if quick else SERIALIZE_SIZES)
+    return results
+
+
+def compare_metrics(base: Dict[str, dict], new: Dict[str, dict],
+                    threshold: float) -> List[Tuple[str, float, float, float, str]]:
+    """
+    Сравнивает метрики двух прогонов.
+
+    Args:
+        base: Метрики базового прогона
+        new: Метрики нового прогона
+        threshold (float): Допустимое ухудшение в процентах
+
+    Returns:
+        List[Tuple[str, float, float, float, str]]: (метрика, было, стало,
+            изменение в %, статус "ok" / "improved" / "regression")
+            для метрик, которые есть в обоих прогонах
+    """
+    rows = []
+    for name in sorted(base.keys() & new.keys()):
+        before, after = base[name]["value"], new[name]["value"]
+        if not before:
+            continue
+        change = (after - before) / before * 100
+        # Изменение в сторону "лучше" положительно
+        gain = change if new[name].get("better", "higher") == "higher" else -change
+        if gain < -threshold:
+            status = "regression"
+        elif gain > threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((name, before, after, change, status))
+    return rows
+
+
+def _load_metrics(path: str) -> Dict[str, dict]:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)["metrics"]
+
+
+def compare_files(base_path: str, new_path: str, threshold: float) -> int:
+    """Печатает сравнение двух файлов результатов; возвращает код выхода."""
+    base, new = _load_metrics(base_path), _load_metrics(new_path)
+    rows = compare_metrics(base, new, threshold)
+    marks = {"ok": "  ", "improved": "✅", "regression": "❌"}
+    for name, before, after, change, status in rows:
+        print(f"{marks[status]} {name:<55} {before:>14,.2f} -> {after:>14,.2f} ({change:+.1f}%)")
+
+    missing = sorted(base.keys() - new.keys())
+    if missing:
+        print(f"\n⚠️ Нет в новом прогоне: {', '.join(missing)}")
+
+    regressions = [row for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"\n❌ Ухудшение больше {threshold}%: {len(regressions)} метрик")
+        return 1
+    print(f"\n✅ Ухудшений больше {threshold}% нет")
+    return 0
+
+
+def main():
+    """CLI бенчмарков."""
+    parser = argparse.ArgumentParser(description="Бенчмарки проверки паролей")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Запустить бенчмарки")
+    run.add_argument("--suite", action="append", choices=SUITES,
+                     help="Набор бенчмарков (можно несколько; по умолчанию все)")
+    run.add_argument("--quick", action="store_true",
+                     help="Уменьшенные объемы данных (без пакета 10M)")
+    run.add_argument("-o", "--output", default="benchmark_results.json",
+                     help="Файл для результатов (JSON)")
+
+    compare = commands.add_parser("compare", help="Сравнить два прогона")
+    compare.add_argument("base", help="Базовые результаты (JSON)")
+    compare.add_argument("new", help="Новые результаты (JSON)")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help=f"Допустимое ухудшение, % (по умолчанию {DEFAULT_THRESHOLD})")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        suites = args.suite or list(SUITES)
+        results = run_suites(suites, args.quick)
+        results.save(args.output, suites)
+        print(f"\n💾 Результаты сохранены в {args.output}")
+    else:
+        sys.exit(compare_files(args.base, args.new, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Ограничение нагрузки на API (admission control).
+
+Одиночные проверки и пакеты получают раздельные бюджеты: число
+одновременно выполняемых запросов и ограниченную очередь ожидающих.
+Если очередь полна или запрос прождал в ней дольше таймаута, он сразу
+получает 503 с Retry-After - всплеск пакетов не копится без предела
+и не растягивает задержку дешевого /check.
+
+Состояние меняется только в event loop процесса, поэтому блокировки
+не нужны; при нескольких воркерах (API_WORKERS) бюджеты у каждого свои.
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Dict, List, Mapping, Optional
+
+from metrics import gauge_lines
+
+# Классы запросов и их маршруты; остальные маршруты (/health,
+# /metrics, /config) не ограничиваются
+SINGLE = "single"
+BATCH = "batch"
+ROUTE_CLASSES = {
+    "/check": SINGLE,
+    "/check/batch": BATCH,
+    "/check/batch/binary": BATCH,
+    "/check/stream": BATCH,
+}
+
+_REJECT_BODY = json.dumps(
+    {"detail": "Сервис перегружен, повторите запрос позже"}, ensure_ascii=False
+).encode("utf-8")
+
+
+class AdmissionLimiter:
+    """
+    Бюджет класса запросов: limit выполняемых и queue_size ожидающих.
+
+    Освободившееся место передается первому в очереди (FIFO).
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: deque = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        """Число запросов в очереди."""
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """
+        Занимает место; ждет в очереди не дольше timeout секунд.
+
+        Returns:
+            bool: Место получено; False - запрос нужно отклонить
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                self.rejected += 1
+                return False
+        except asyncio.CancelledError:
+            # Клиент ушел: место, если его уже передали, возвращаем
+            if self._abandon(waiter):
+                self.release()
+            raise
+        self.admitted += 1
+        return True
+
+    def _abandon(self, waiter: asyncio.Future) -> bool:
+        """Убирает ожидающего из очереди; True - место ему уже передано."""
+        if waiter.done():
+            return True
+        waiter.cancel()
+        self._waiters.remove(waiter)
+        return False
+
+    def release(self):
+        """Освобождает место (или передает его первому в очереди)."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Текущее состояние бюджета."""
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+def build_limiters(config: Mapping) -> Optional[Dict[str, AdmissionLimiter]]:
+    """
+    Бюджеты по конфигурации.
+
+    Returns:
+        Optional[Dict[str, AdmissionLimiter]]: Класс запросов -> бюджет;
+            None, если ограничение выключено (ADMISSION_ENABLED)
+    """
+    if not config["admission_enabled"]:
+        return None
+    timeout = config["admission_queue_timeout"]
+    return {
+        SINGLE: AdmissionLimiter(
+            config["admission_single_limit"], config["admission_single_queue"], timeout
+        ),
+        BATCH: AdmissionLimiter(
+            config["admission_batch_limit"], config["admission_batch_queue"], timeout
+        ),
+    }
+
+
+class AdmissionMiddleware:
+    """ASGI-middleware: пропускает запросы в пределах бюджета их класса."""
+
+    def __init__(self, app, limiters: Mapping[str, AdmissionLimiter], retry_after: int):
+        self.app = app
+        self._limiters = limiters
+        self._retry_after = str(retry_after).encode("ascii")
+
+    async def __call__(self, scope, receive, send):
+        request_class = ROUTE_CLASSES.get(scope["path"]) if scope["type"] == "http" else None
+        if request_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self._limiters[request_class]
+        if not await limiter.acquire():
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _reject(self, send):
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_REJECT_BODY)).encode("ascii")),
+                (b"retry-after", self._retry_after),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _REJECT_BODY})
+
+
+def collect_admission(limiters: Mapping[str, AdmissionLimiter]) -> List[str]:
+    """Строки метрик ограничения нагрузки (сборщик для metrics.Registry)."""
+    stats = {name: limiter.stats() for name, limiter in limiters.items()}
+    lines = []
+    for name, documentation, kind, key in (
+        ("admission_in_flight", "Выполняемые запросы по классам", "gauge", "active"),
+        ("admission_queue_depth", "Запросы в очереди по классам", "gauge", "queue_depth"),
+        ("admission_admitted_total", "Пропущенные запросы по классам", "counter", "admitted"),
+        ("admission_rejected_total", "Отклоненные (503) запросы по классам", "counter", "rejected"),
+    ):
+        lines.extend(gauge_lines(
+            name, documentation, kind,
+            (({"class": request_class}, values[key]) for request_class, values in stats.items()),
+        ))
+    return lines
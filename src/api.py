@@ -3,12 +3,142 @@ Web API для проверки паролей.
 Позволяет проверять пароли через HTTP-запросы.
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+)
+
+from fastapi import (
+    APIRouter,
+    FastAPI,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import Response, StreamingResponse
+from fastapi.routing import APIRoute
 from pydantic import BaseModel
-from typing import List, Optional
 
-from checker import evaluate_password
+from admission import AdmissionMiddleware, build_limiters, collect_admission
+from cache import build_result_cache
+from checker import (
+    STRENGTH_LEVELS,
+    BatchSummary,
+    Evaluation,
+    PasswordState,
+    Policy,
+    RuleProfile,
+)
+from codec import (
+    BINARY_TYPES,
+    column_bytes,
+    decode_passwords,
+    encode_results,
+    is_supported,
+)
 from config import config
+from metrics import (
+    BATCH_SIZE_BUCKETS,
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    Registry,
+    gauge_lines,
+)
+from policy import (
+    configure_policy,
+    get_policy,
+    install_reload_signal,
+    start_policy_watcher,
+    stop_policy_watcher,
+)
+from resources import load_resources
+
+try:
+    import orjson  # Быстрая сериализация ответов (необязательная зависимость)
+except ImportError:
+    orjson = None
+
+
+# Подключаем блок-лист (mmap - страницы общие для всех воркеров)
+# и автомат поиска словарных слов
+load_resources(config)
+
+# Кэш результатов для /check (None, если выключен в конфигурации)
+result_cache = build_result_cache(config)
+
+# Метрики для /metrics. Время по правилам замеряется в этом процессе
+# (с пулом процессов пакеты оцениваются без замеров)
+metrics_enabled = config["metrics_enabled"]
+rule_profile = RuleProfile() if metrics_enabled else None
+configure_policy(config, rule_profile)
+
+registry = Registry()
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Число HTTP-запросов", ("route", "method", "status")
+)
+HTTP_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Длительность HTTP-запросов", ("route",)
+)
+BATCH_SIZE = registry.histogram(
+    "password_batch_size", "Число паролей в пакетном запросе", ("route",),
+    buckets=BATCH_SIZE_BUCKETS,
+)
+STRENGTH_TOTAL = registry.counter(
+    "password_strength_total", "Проверенные пароли по уровню сложности", ("strength",)
+)
+_strength_counters = [STRENGTH_TOTAL.labels(level) for level in STRENGTH_LEVELS]
+_strength_by_name = dict(zip(STRENGTH_LEVELS, _strength_counters, strict=True))
+_batch_sizes = {
+    route: BATCH_SIZE.labels(route) for route in ("/check/batch", "/check/batch/binary", "/check/stream")
+}
+
+
+def _collect_rule_profile() -> List[str]:
+    snapshot = rule_profile.snapshot()
+    return gauge_lines(
+        "password_rule_evaluations_total", "Число оценок по правилам", "counter",
+        (({"rule": rule}, calls) for rule, (calls, _) in snapshot.items()),
+    ) + gauge_lines(
+        "password_rule_duration_seconds_total", "Время оценки по правилам", "counter",
+        (({"rule": rule}, nanoseconds / 1e9) for rule, (_, nanoseconds) in snapshot.items()),
+    )
+
+
+def _collect_result_cache() -> List[str]:
+    stats = result_cache.stats()
+    lines = []
+    for name, documentation, kind, key in (
+        ("result_cache_hits_total", "Попадания в кэш результатов", "counter", "hits"),
+        ("result_cache_misses_total", "Промахи кэша результатов", "counter", "misses"),
+        ("result_cache_size", "Число записей в кэше результатов", "gauge", "size"),
+        ("result_cache_hit_ratio", "Доля попаданий в кэш результатов", "gauge", "hit_rate"),
+    ):
+        lines.extend(gauge_lines(name, documentation, kind, [({}, stats[key])]))
+    return lines
+
+
+# Бюджеты одиночных и пакетных запросов (None, если выключены)
+limiters = build_limiters(config)
+
+if rule_profile is not None:
+    registry.add_collector(_collect_rule_profile)
+if metrics_enabled and result_cache is not None:
+    registry.add_collector(_collect_result_cache)
+if metrics_enabled and limiters is not None:
+    registry.add_collector(lambda: collect_admission(limiters))
 
 
 # Создаем FastAPI приложение
@@ -18,6 +148,265 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Ограничение добавляется раньше метрик, чтобы отказы 503 попадали в метрики
+if limiters is not None:
+    app.add_middleware(
+        AdmissionMiddleware, limiters=limiters, retry_after=config["admission_retry_after"]
+    )
+if metrics_enabled:
+    app.add_middleware(MetricsMiddleware, requests=HTTP_REQUESTS, durations=HTTP_DURATION)
+
+
+# Пул для пакетной проверки: оценка пакета не блокирует event loop,
+# и /check или /health не ждут, пока посчитается большой пакет
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Executor:
+    """Возвращает пул для пакетной проверки (создается при первом вызове)."""
+    global _executor
+    if _executor is None:
+        workers = config["api_executor_workers"]
+        if config["api_executor"] == "process":
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=load_resources,
+                initargs=(config,),
+            )
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers)
+    return _executor
+
+
+@app.on_event("startup")
+def start_policy_reload():
+    """Включает перезагрузку политики по SIGHUP и по изменению POLICY_FILE."""
+    install_reload_signal()
+    start_policy_watcher(config["policy_file"], config["policy_reload_interval"])
+
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    """Останавливает пул при остановке приложения."""
+    global _executor
+    stop_policy_watcher()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def dumps_json(content) -> bytes:
+    """JSON в UTF-8 без пробелов: через orjson, если он установлен."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """
+    JSON-ответ из готовых словарей оценщика.
+
+    Если эндпоинт возвращает Response, FastAPI отдает его как есть:
+    результат не проверяется и не пересобирается моделью response_model
+    (на больших пакетах это дороже самой оценки), а схема OpenAPI
+    по-прежнему строится по response_model.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+
+# Уровни "Сильный" и выше считаются сильными, "Слабый" и ниже - слабыми
+STRONG_LEVEL = 3
+WEAK_LEVEL = 1
+
+
+def _count_chunk_levels(columns) -> List[int]:
+    levels = [0] * len(STRENGTH_LEVELS)
+    for level in columns["strength"]:
+        levels[level] += 1
+    return levels
+
+
+def _evaluate_chunk(passwords: List[str], policy: Policy) -> Tuple[List[dict], List[int]]:
+    """Оценивает порцию пакета (выполняется в пуле); возвращает и число паролей по уровням."""
+    columns = policy.evaluate_batch(passwords)
+    return policy.batch_to_dicts(passwords, columns), _count_chunk_levels(columns)
+
+
+def _evaluate_chunk_binary(passwords: List[str], policy: Policy) -> Tuple[tuple, List[int]]:
+    """Как _evaluate_chunk, но столбцы (баллы, уровни, провалы) - байтами для codec."""
+    columns = policy.evaluate_batch(passwords)
+    encoded = (
+        column_bytes(columns["score"]),
+        column_bytes(columns["strength"]),
+        column_bytes(policy.failed_rules(columns)),
+    )
+    return encoded, _count_chunk_levels(columns)
+
+
+def _summarize_chunk(passwords: List[str], policy: Policy) -> BatchSummary:
+    """Сводка по порции пакета (выполняется в пуле)."""
+    return BatchSummary.from_columns(policy.evaluate_batch(passwords), policy)
+
+
+async def _evaluate_chunks(passwords: List[str], evaluate_chunk: Callable,
+                           policy: Optional[Policy] = None) -> list:
+    """
+    Делит пакет на порции и оценивает их в пуле; весь пакет оценивается
+    одной политикой (по умолчанию - активной на момент вызова), даже
+    если ее перезагрузят.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    policy = policy or get_policy()
+    size = config["batch_chunk_size"]
+    return await asyncio.gather(*(
+        loop.run_in_executor(executor, evaluate_chunk, passwords[i:i + size], policy)
+        for i in range(0, len(passwords), size)
+    ))
+
+
+def _count_levels(levels: List[int]) -> Tuple[int, int]:
+    """Учитывает уровни в метриках; возвращает число сильных и слабых паролей."""
+    if metrics_enabled:
+        for counter, count in zip(_strength_counters, levels, strict=True):
+            if count:
+                counter.inc(count)
+    return sum(levels[STRONG_LEVEL:]), sum(levels[:WEAK_LEVEL + 1])
+
+
+def _check_password_length(password: str):
+    """Отклоняет слишком длинные пароли (ограничение из конфигурации)."""
+    if len(password) > config["max_password_length"]:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Пароль длиннее {config['max_password_length']} символов",
+        )
+
+
+def _check_batch(passwords: List[str], route: str = "/check/batch"):
+    """Проверяет ограничения пакета и учитывает его размер в метриках."""
+    if len(passwords) > config["max_batch_size"]:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Слишком много паролей: максимум {config['max_batch_size']}",
+        )
+    if passwords:
+        _check_password_length(max(passwords, key=len))
+    if metrics_enabled:
+        _batch_sizes[route].observe(len(passwords))
+
+
+# Режимы /check/batch: полные результаты или только сводка
+BatchMode = Literal["full", "summary"]
+BATCH_MODES = get_args(BatchMode)
+
+
+async def _summarize_batch(passwords: List[str]) -> Response:
+    """
+    Сводка по пакету без результатов по каждому паролю: порции
+    сводятся в пуле, размер ответа не зависит от размера пакета.
+    """
+    try:
+        chunks = await _evaluate_chunks(passwords, _summarize_chunk)
+        summary = BatchSummary(chunks[0].policy if chunks else get_policy())
+        for chunk in chunks:
+            summary.merge(chunk)
+        strong_passwords, weak_passwords = _count_levels(summary.strengths)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка при массовой проверке: {str(e)}") from e
+    return FastJSONResponse({
+        "total_count": summary.total,
+        "strong_count": strong_passwords,
+        "weak_count": weak_passwords,
+        **summary.to_dict(),
+    })
+
+
+def _content_type(request: Request) -> str:
+    return request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+async def _check_batch_binary(request: Request, content_type: str,
+                              mode: str = "full") -> Response:
+    """Пакетная проверка в бинарном формате (см. codec.py); ответ - в том же формате."""
+    if not is_supported(content_type):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Формат {content_type or 'не указан'} не поддерживается",
+        )
+    try:
+        passwords = decode_passwords(
+            await request.body(), content_type, config["max_password_length"]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Некорректное тело запроса: {e}") from e
+    _check_batch(passwords, request.url.path)
+    if mode == "summary":
+        return await _summarize_batch(passwords)
+
+    # max_score ответа - от той же политики, что оценивала пакет
+    policy = get_policy()
+    try:
+        chunks = await _evaluate_chunks(passwords, _evaluate_chunk_binary, policy)
+        columns = ([], [], [])
+        strong_passwords = weak_passwords = 0
+        for encoded, levels in chunks:
+            for column, data in zip(columns, encoded, strict=True):
+                column.append(data)
+            strong, weak = _count_levels(levels)
+            strong_passwords += strong
+            weak_passwords += weak
+        body = encode_results(
+            content_type, policy.max_score,
+            *(b"".join(column) for column in columns),
+            strong_passwords, weak_passwords,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка при массовой проверке: {str(e)}") from e
+    return Response(body, media_type=content_type)
+
+
+class BinaryBatchRoute(APIRoute):
+    """
+    Маршрут, который по Content-Type принимает и бинарные форматы.
+
+    Запросы в форматах codec.BINARY_TYPES обрабатывает _check_batch_binary,
+    остальные - обычный обработчик FastAPI (JSON, модели и их проверка).
+    """
+
+    def get_route_handler(self) -> Callable:
+        json_handler = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            content_type = _content_type(request)
+            if content_type in BINARY_TYPES:
+                mode = request.query_params.get("mode", "full")
+                if mode not in BATCH_MODES:
+                    raise HTTPException(
+                        status_code=422,
+                        detail=f"mode: ожидается {' или '.join(BATCH_MODES)}",
+                    )
+                return await _check_batch_binary(request, content_type, mode)
+            return await json_handler(request)
+
+        return handler
+
+
+# Бинарные форматы в схеме OpenAPI (JSON описывают модели)
+_BINARY_SCHEMA = {"schema": {"type": "string", "format": "binary"}}
+BINARY_OPENAPI = {
+    "requestBody": {"content": {content_type: _BINARY_SCHEMA for content_type in BINARY_TYPES}},
+    "responses": {
+        "200": {"content": {content_type: _BINARY_SCHEMA for content_type in BINARY_TYPES}},
+    },
+}
+
+batch_router = APIRouter(route_class=BinaryBatchRoute)
+
 
 # Модель для запроса
 class PasswordRequest(BaseModel):
@@ -50,6 +439,28 @@ class BatchResult(BaseModel):
     weak_count: int
 
 
+class ScoreStats(BaseModel):
+    """Статистика баллов пакета."""
+    mean: float
+    min: int
+    max: int
+    p50: int
+    p90: int
+    p99: int
+
+
+# Модель для ответа в режиме mode=summary
+class BatchSummaryResult(BaseModel):
+    """Сводка массовой проверки без результатов по каждому паролю."""
+    total_count: int
+    strong_count: int
+    weak_count: int
+    max_score: int
+    strength_histogram: Dict[str, int]
+    score: ScoreStats
+    failed_rules: Dict[str, int]
+
+
 @app.get("/")
 async def root():
     """Корневой эндпоинт - информация о API."""
@@ -60,8 +471,12 @@ async def root():
             "GET /": "Эта информация",
             "POST /check": "Проверить один пароль",
             "POST /check/batch": "Проверить несколько паролей",
+            "POST /check/batch/binary": "Пакетная проверка в MessagePack или кадрах с длиной",
+            "POST /check/stream": "Потоковая проверка (пароли построчно, ответ NDJSON)",
+            "WS /check/ws": "Индикатор сложности: правки пароля, в ответ - изменения оценки",
             "GET /config": "Показать текущую конфигурацию",
             "GET /health": "Проверить работоспособность сервиса",
+            "GET /metrics": "Метрики в формате Prometheus",
         },
         "documentation": "/docs или /redoc"
     }
@@ -78,64 +493,337 @@ async def check_password(request: PasswordRequest):
     Returns:
         Результат проверки пароля
     """
+    # Один пароль ограниченной длины оценивается за микросекунды -
+    # дешевле посчитать его прямо здесь, чем передавать в пул
+    _check_password_length(request.password)
+    
     try:
-        result = evaluate_password(request.password)
-        return result
+        policy = get_policy()
+        if result_cache is not None:
+            result = result_cache.evaluate(request.password, policy)
+        else:
+            result = policy.evaluate_password(request.password)
+        if metrics_enabled:
+            _strength_by_name[result["strength"]].inc()
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка при проверке пароля: {str(e)}")
 
 
-@app.post("/check/batch", response_model=BatchResult)
-async def check_passwords_batch(request: BatchRequest):
+@batch_router.post("/check/batch", response_model=Union[BatchResult, BatchSummaryResult],
+                   openapi_extra=BINARY_OPENAPI)
+async def check_passwords_batch(request: BatchRequest, mode: BatchMode = "full"):
     """
     Проверяет несколько паролей за один запрос.
     
+    Кроме JSON принимает application/msgpack и
+    application/x-password-frames - тогда и ответ компактный бинарный
+    (см. /check/batch/binary).
+    
+    С mode=summary вместо результатов по каждому паролю возвращается
+    сводка: число паролей по уровням, статистика баллов и число
+    провалов по каждому правилу (в любом формате запроса - JSON).
+    
     Args:
         request: Объект со списком паролей
+        mode: full - результаты по каждому паролю, summary - только сводка
         
     Returns:
-        Результаты проверки всех паролей
+        Результаты проверки всех паролей или сводка
     """
+    passwords = request.passwords
+    _check_batch(passwords)
+    if mode == "summary":
+        return await _summarize_batch(passwords)
+    
     try:
-        results = [evaluate_password(pwd) for pwd in request.passwords]
+        chunks = await _evaluate_chunks(passwords, _evaluate_chunk)
         
-        # Считаем статистику
-        strong_passwords = sum(1 for r in results if r["score"] >= 70)
-        weak_passwords = sum(1 for r in results if r["score"] < 50)
+        results = []
+        strong_passwords = weak_passwords = 0
+        for chunk_results, levels in chunks:
+            results.extend(chunk_results)
+            strong, weak = _count_levels(levels)
+            strong_passwords += strong
+            weak_passwords += weak
         
-        return {
+        return FastJSONResponse({
             "results": results,
-            "total_count": len(results),
+            "total_count": len(passwords),
             "strong_count": strong_passwords,
             "weak_count": weak_passwords,
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка при массовой проверке: {str(e)}")
 
 
+@app.post("/check/batch/binary", response_class=Response,
+          openapi_extra={**BINARY_OPENAPI, "requestBody": {
+              **BINARY_OPENAPI["requestBody"], "required": True}})
+async def check_passwords_batch_binary(request: Request, mode: BatchMode = "full"):
+    """
+    Пакетная проверка в компактном бинарном формате.
+    
+    Тело - application/msgpack (список паролей) или
+    application/x-password-frames (кадры: длина uint32 и пароль в UTF-8).
+    Ответ в том же формате: по байту на пароль - балл, код уровня и
+    маска непройденных правил. Форматы описаны в codec.py.
+    С mode=summary - сводка в JSON, как у /check/batch.
+    """
+    return await _check_batch_binary(request, _content_type(request), mode)
+
+
+app.include_router(batch_router)
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse, которая читает тело запроса во время ответа.
+    
+    Обычная StreamingResponse параллельно ждет отключения клиента через
+    receive() и тем самым забирает себе чанки тела запроса. Здесь тело
+    читает сам генератор ответа, а отключение клиента проявляется как
+    ошибка чтения или отправки.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _iter_body_lines(request: Request) -> AsyncIterator[str]:
+    """
+    Читает тело запроса построчно, не накапливая его целиком.
+    
+    Raises:
+        ValueError: Строка длиннее MAX_PASSWORD_LENGTH
+    """
+    max_length = config["max_password_length"]
+    # В UTF-8 символ занимает не больше 4 байт
+    max_bytes = max_length * 4 + 2
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > max_bytes:
+            raise ValueError(f"Пароль длиннее {max_length} символов")
+        for line in lines:
+            password = line.decode("utf-8", errors="replace").strip()
+            if len(password) > max_length:
+                raise ValueError(f"Пароль длиннее {max_length} символов")
+            if password:
+                yield password
+    password = buffer.decode("utf-8", errors="replace").strip()
+    if len(password) > max_length:
+        raise ValueError(f"Пароль длиннее {max_length} символов")
+    if password:
+        yield password
+
+
+async def _stream_results(request: Request) -> AsyncIterator[bytes]:
+    """Оценивает пароли порциями по мере чтения и отдает NDJSON."""
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    policy = get_policy()
+    size = config["batch_chunk_size"]
+    total = strong_total = weak_total = 0
+    
+    async def flush(chunk: List[str]) -> bytes:
+        nonlocal total, strong_total, weak_total
+        results, levels = await loop.run_in_executor(executor, _evaluate_chunk, chunk, policy)
+        strong, weak = _count_levels(levels)
+        total += len(chunk)
+        strong_total += strong
+        weak_total += weak
+        return b"".join(dumps_json(result) + b"\n" for result in results)
+    
+    chunk: List[str] = []
+    try:
+        async for password in _iter_body_lines(request):
+            chunk.append(password)
+            if len(chunk) >= size:
+                yield await flush(chunk)
+                chunk = []
+        if chunk:
+            yield await flush(chunk)
+    except ValueError as e:
+        # Статус уже отправлен - сообщаем об ошибке строкой потока
+        yield dumps_json({"error": str(e)}) + b"\n"
+        return
+    
+    if metrics_enabled:
+        _batch_sizes["/check/stream"].observe(total)
+    summary = {
+        "total_count": total,
+        "strong_count": strong_total,
+        "weak_count": weak_total,
+    }
+    yield dumps_json({"summary": summary}) + b"\n"
+
+
+@app.post("/check/stream")
+async def check_passwords_stream(request: Request):
+    """
+    Потоковая проверка паролей.
+    
+    Тело запроса - пароли по одному на строку (можно передавать
+    чанками). Ответ - NDJSON: по результату на строку, последняя
+    строка - {"summary": {...}} со статистикой. Результаты отдаются
+    по мере чтения, память сервера не зависит от размера загрузки.
+    """
+    return DuplexStreamingResponse(_stream_results(request), media_type="application/x-ndjson")
+
+
+def _meter_view(evaluation: Evaluation) -> dict:
+    """Состояние индикатора сложности (без самого пароля)."""
+    return {
+        "score": evaluation.score,
+        "max_score": evaluation.policy.max_score,
+        "strength": evaluation.strength,
+        "rules": evaluation.rule_states(),
+    }
+
+
+def _meter_diff(previous: dict, current: dict) -> dict:
+    """Поля состояния индикатора, изменившиеся с прошлого ответа."""
+    diff = {
+        key: value for key, value in current.items()
+        if key != "rules" and previous.get(key) != value
+    }
+    rules, old_rules = current["rules"], previous.get("rules", {})
+    if rules.keys() != old_rules.keys():
+        diff["rules"] = rules
+    else:
+        changed = {name: passed for name, passed in rules.items() if old_rules[name] != passed}
+        if changed:
+            diff["rules"] = changed
+    return diff
+
+
+# Код закрытия WebSocket для сообщений неподдерживаемого типа (RFC 6455)
+WS_UNSUPPORTED_DATA = 1003
+
+
+def _apply_edit(state: PasswordState, message: str):
+    """
+    Применяет правку из сообщения WebSocket к паролю.
+
+    Raises:
+        ValueError: Некорректное сообщение или пароль стал бы слишком длинным
+    """
+    edit = json.loads(message)
+    if not isinstance(edit, dict):
+        raise ValueError("ожидается объект {\"op\": ...}")
+    op = edit.get("op")
+    if op == "delete":
+        count = edit.get("count", 1)
+        if not isinstance(count, int) or count < 0:
+            raise ValueError("count: ожидается неотрицательное число")
+        state.delete(count)
+        return
+    text = edit.get("text")
+    if op not in ("append", "set", "replace") or not isinstance(text, str):
+        raise ValueError("ожидается op append/set/replace с text или delete с count")
+    if op == "replace":
+        start, end = edit.get("start"), edit.get("end")
+        if not (isinstance(start, int) and isinstance(end, int) and 0 <= start <= end <= len(state)):
+            raise ValueError(f"start/end: ожидается диапазон внутри пароля длины {len(state)}")
+        length = len(state) - (end - start) + len(text)
+    else:
+        length = len(text) if op == "set" else len(state) + len(text)
+    if length > config["max_password_length"]:
+        raise ValueError(f"Пароль длиннее {config['max_password_length']} символов")
+    if op == "append":
+        state.append(text)
+    elif op == "replace":
+        state.replace_range(start, end, text)
+    else:
+        state.set(text)
+
+
+@app.websocket("/check/ws")
+async def check_password_ws(websocket: WebSocket):
+    """
+    Индикатор сложности для формы регистрации: одно соединение на форму.
+
+    Клиент присылает правки пароля JSON-сообщениями:
+    {"op": "append", "text": "a"}, {"op": "delete", "count": 1},
+    {"op": "replace", "start": 2, "end": 4, "text": "..."} (символы
+    [start, end) заменяются на text) или {"op": "set", "text": "..."}
+    (пароль целиком). Сразу после
+    подключения сервер присылает полное состояние {"score", "max_score",
+    "strength", "rules"}, а после каждой правки - только изменившиеся поля
+    (в "rules" - только изменившиеся правила); если ничего не изменилось,
+    ответа нет. Пароль в ответах не возвращается. Оценка инкрементальная
+    (checker.PasswordState): символ не пересканирует весь пароль.
+    На некорректную правку приходит {"error": ...}; бинарное сообщение
+    закрывает соединение с кодом 1003.
+    """
+    await websocket.accept()
+    state = PasswordState(get_policy())
+    view = _meter_view(state.result())
+    await websocket.send_text(dumps_json(view).decode("utf-8"))
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            text = message.get("text")
+            if text is None:
+                await websocket.close(code=WS_UNSUPPORTED_DATA, reason="Ожидаются текстовые JSON-сообщения")
+                return
+            try:
+                _apply_edit(state, text)
+            except ValueError as e:
+                await websocket.send_text(dumps_json({"error": str(e)}).decode("utf-8"))
+                continue
+            policy = get_policy()
+            if state.policy is not policy:
+                # Политику перезагрузили - дальше оцениваем по новой
+                state = PasswordState(policy, state.password)
+            current = _meter_view(state.result())
+            diff = _meter_diff(view, current)
+            view = current
+            if diff:
+                await websocket.send_text(dumps_json(diff).decode("utf-8"))
+    except WebSocketDisconnect:
+        pass
+
+
 @app.get("/config")
 async def get_config():
-    """Возвращает текущую конфигурацию приложения."""
+    """
+    Возвращает текущую конфигурацию приложения.
+    
+    password_rules - активная политика (с учетом перезагрузок),
+    config - настройки на момент запуска.
+    """
     return {
         "config": config,
-        "password_rules": {
-            "min_length": config["min_password_length"],
-            "require_digits": config["require_digits"],
-            "require_uppercase": config["require_uppercase"],
-            "require_lowercase": config["require_lowercase"],
-            "require_special": config["require_special_chars"],
-        }
+        "password_rules": get_policy().to_dict(),
     }
 
 
 @app.get("/health")
 async def health_check():
     """Проверяет работоспособность сервиса."""
-    return {
+    status = {
         "status": "healthy",
         "service": "password-checker",
-        "timestamp": "2024-01-01T12:00:00Z"  # В реальном приложении здесь будет datetime.now()
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
     }
+    if result_cache is not None:
+        status["result_cache"] = result_cache.stats()
+    return status
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Метрики сервиса в текстовом формате Prometheus."""
+    if not metrics_enabled:
+        raise HTTPException(status_code=404, detail="Метрики выключены (METRICS_ENABLED)")
+    return Response(registry.render(), media_type=CONTENT_TYPE)
 
 
 # Если файл запущен напрямую (для тестирования)
@@ -149,9 +837,12 @@ if __name__ == "__main__":
     for key, value in config.items():
         print(f"  {key}: {value}")
     
+    # Несколько процессов uvicorn запускает только по строке импорта
     uvicorn.run(
-        app,
+        "api:app" if config["api_workers"] > 1 else app,
         host=config["api_host"],
         port=config["api_port"],
+        workers=config["api_workers"],
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
         log_level=config["log_level"].lower()
     )
\ No newline at end of file
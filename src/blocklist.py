@@ -0,0 +1,273 @@
+"""
+Компилируемый блок-лист утекших паролей.
+
+Текстовый словарь (один пароль на строку) компилируется в компактный
+индекс на диске:
+
+    [заголовок][фильтр Блума][отсортированные 8-байтовые хэши]
+
+Во время работы индекс открывается через mmap: запуск почти мгновенный,
+а страницы файла разделяются между всеми процессами через page cache.
+Фильтр Блума быстро отвечает "нет" для большинства паролей, а точный
+ответ дает двоичный поиск по отсортированным хэшам - O(log n).
+"""
+
+import argparse
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+# Формат заголовка: сигнатура, число записей, размер фильтра в битах,
+# число хэш-функций фильтра
+MAGIC = b"PWBLIDX1"
+_HEADER = struct.Struct("<8sQQI4x")
+_ENTRY_SIZE = 8
+
+# ~10 бит на запись и 7 хэшей дают около 1% ложных срабатываний фильтра
+BITS_PER_ENTRY = 10
+BLOOM_HASHES = 7
+
+# Сборка индекса: хэшей в одной сортируемой порции и хэшей в блоке чтения
+BUILD_CHUNK_SIZE = 1 << 20
+BUILD_READ_BLOCK = 1 << 16
+
+
+def password_hash(password: str) -> int:
+    """
+    Вычисляет 64-битный хэш нормализованного пароля.
+
+    Args:
+        password (str): Пароль (регистр не учитывается)
+
+    Returns:
+        int: Хэш пароля
+    """
+    digest = hashlib.blake2b(password.lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _bloom_positions(value: int, bloom_bits: int, hashes: int) -> Iterable[int]:
+    """Позиции битов фильтра для хэша (двойное хэширование)."""
+    h1 = value & 0xFFFFFFFF
+    h2 = (value >> 32) | 1
+    for i in range(hashes):
+        yield (h1 + i * h2) % bloom_bits
+
+
+def _write_run(values: List[int], directory: str, number: int) -> str:
+    """Сортирует порцию хэшей и записывает ее во временный файл."""
+    values.sort()
+    path = os.path.join(directory, f"run-{number}")
+    with open(path, "wb") as file:
+        array("Q", values).tofile(file)
+    return path
+
+
+def _write_block(file: BinaryIO, block: array, byteswap: bool) -> int:
+    """Дописывает блок хэшей в таблицу индекса; возвращает их число."""
+    if byteswap:
+        block.byteswap()
+    block.tofile(file)
+    return len(block)
+
+
+def _read_values(file: BinaryIO, byteswap: bool = False) -> Iterator[int]:
+    """Читает 8-байтовые хэши из файла блоками по BUILD_READ_BLOCK."""
+    while True:
+        block = array("Q")
+        try:
+            block.fromfile(file, BUILD_READ_BLOCK)
+        except EOFError:
+            # fromfile уже добавил в block остаток файла
+            pass
+        if byteswap:
+            block.byteswap()
+        yield from block
+        if len(block) < BUILD_READ_BLOCK:
+            return
+
+
+def _read_run(path: str) -> Iterator[int]:
+    with open(path, "rb") as file:
+        yield from _read_values(file)
+
+
+def build_blocklist(source_path: str, index_path: str) -> int:
+    """
+    Компилирует текстовый словарь в индекс блок-листа.
+
+    Словарь может не помещаться в память: хэши сортируются порциями по
+    BUILD_CHUNK_SIZE во временные файлы рядом с индексом, затем порции
+    сливаются с удалением повторов. В памяти одновременно только одна
+    порция и фильтр Блума.
+
+    Args:
+        source_path (str): Файл со словарем, один пароль на строку
+        index_path (str): Куда записать индекс
+
+    Returns:
+        int: Число уникальных записей в индексе
+    """
+    # Временные файлы нужны только при сборке - не тратим на них
+    # время запуска CLI
+    import shutil
+    import tempfile
+
+    # Таблица в индексе хранится в big-endian: байтовое сравнение
+    # записей при поиске совпадает с числовым
+    byteswap = sys.byteorder == "little"
+    directory = os.path.dirname(os.path.abspath(index_path))
+    with tempfile.TemporaryDirectory(prefix="blocklist-build-", dir=directory) as tmp:
+        runs: List[str] = []
+        chunk: List[int] = []
+        with open(source_path, "r", encoding="utf-8", errors="replace") as file:
+            for line in file:
+                password = line.strip()
+                if password:
+                    chunk.append(password_hash(password))
+                    if len(chunk) >= BUILD_CHUNK_SIZE:
+                        runs.append(_write_run(chunk, tmp, len(runs)))
+                        chunk = []
+        if chunk or not runs:
+            runs.append(_write_run(chunk, tmp, len(runs)))
+        del chunk
+
+        # Слияние порций в отсортированную таблицу без повторов
+        table_path = os.path.join(tmp, "table")
+        count = 0
+        with open(table_path, "wb") as table:
+            block = array("Q")
+            previous = None
+            for value in heapq.merge(*(_read_run(path) for path in runs)):
+                if value == previous:
+                    continue
+                previous = value
+                block.append(value)
+                if len(block) >= BUILD_READ_BLOCK:
+                    count += _write_block(table, block, byteswap)
+                    block = array("Q")
+            count += _write_block(table, block, byteswap)
+
+        # Размер фильтра выравниваем до 8 байт, чтобы таблица хэшей была выровнена
+        bloom_bits = max(64, count * BITS_PER_ENTRY)
+        bloom_bits = (bloom_bits + 63) // 64 * 64
+        bloom = bytearray(bloom_bits // 8)
+        with open(table_path, "rb") as table:
+            for value in _read_values(table, byteswap):
+                for pos in _bloom_positions(value, bloom_bits, BLOOM_HASHES):
+                    bloom[pos >> 3] |= 1 << (pos & 7)
+
+        with open(index_path, "wb") as out, open(table_path, "rb") as table:
+            out.write(_HEADER.pack(MAGIC, count, bloom_bits, BLOOM_HASHES))
+            out.write(bloom)
+            shutil.copyfileobj(table, out)
+
+    return count
+
+
+class Blocklist:
+    """Блок-лист, отображенный в память через mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"Файл '{path}' не является индексом блок-листа")
+        magic, count, bloom_bits, hashes = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Файл '{path}' не является индексом блок-листа")
+
+        self._count = count
+        self._bloom_bits = bloom_bits
+        self._hashes = hashes
+        self._bloom_offset = _HEADER.size
+        self._table_offset = self._bloom_offset + bloom_bits // 8
+        if len(self._mm) != self._table_offset + count * _ENTRY_SIZE:
+            raise ValueError(f"Индекс блок-листа '{path}' поврежден")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, password: object) -> bool:
+        if not isinstance(password, str):
+            return False
+        return self.contains_hash(password_hash(password))
+
+    def contains_hash(self, value: int) -> bool:
+        """Проверяет наличие готового хэша (см. password_hash) в индексе."""
+        mm = self._mm
+        bloom_offset = self._bloom_offset
+        for pos in _bloom_positions(value, self._bloom_bits, self._hashes):
+            if not mm[bloom_offset + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+
+        # Двоичный поиск по отсортированной таблице
+        target = value.to_bytes(_ENTRY_SIZE, "big")
+        lo, hi = 0, self._count
+        base = self._table_offset
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = base + mid * _ENTRY_SIZE
+            entry = mm[offset:offset + _ENTRY_SIZE]
+            if entry < target:
+                lo = mid + 1
+            elif entry > target:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def close(self):
+        """Закрывает отображение файла."""
+        self._mm.close()
+
+
+# Активный блок-лист процесса (подключается из конфигурации)
+_active: Optional[Blocklist] = None
+
+
+def configure_blocklist(path: str) -> Optional[Blocklist]:
+    """
+    Подключает индекс блок-листа для check_common_passwords.
+
+    Args:
+        path (str): Путь к индексу; пустая строка отключает блок-лист
+
+    Returns:
+        Optional[Blocklist]: Подключенный блок-лист или None
+    """
+    global _active
+    previous = _active
+    _active = Blocklist(path) if path else None
+    if previous is not None:
+        previous.close()
+    return _active
+
+
+def is_blocklisted(password: str) -> bool:
+    """Проверяет пароль по активному блок-листу (если он подключен)."""
+    return _active is not None and password in _active
+
+
+def main():
+    """CLI для компиляции словаря в индекс."""
+    parser = argparse.ArgumentParser(
+        description="Компиляция словаря утекших паролей в индекс блок-листа"
+    )
+    parser.add_argument("wordlist", help="Текстовый словарь, один пароль на строку")
+    parser.add_argument("index", help="Файл индекса для записи")
+    args = parser.parse_args()
+
+    count = build_blocklist(args.wordlist, args.index)
+    print(f"✅ Индекс '{args.index}' создан: {count} уникальных паролей")
+
+
+if __name__ == "__main__":
+    main()
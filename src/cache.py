@@ -0,0 +1,161 @@
+"""
+Кэш результатов проверки паролей.
+
+Формы регистрации и смены пароля присылают одни и те же пароли
+повторно (повторы запросов, обновление индикатора сложности).
+Кэш хранит готовые результаты evaluate_password ограниченное время.
+
+Пароли в открытом виде не хранятся нигде: ключ - это хэш BLAKE2b
+с секретной солью процесса и версией политики проверки, а в значении
+нет поля "password" - оно подставляется при выдаче из кэша.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from checker import DEFAULT_POLICY, Policy
+
+# Настройки конфигурации, от которых зависит результат проверки.
+# Их изменение меняет версию политики и тем самым сбрасывает кэш.
+# Правила, перезагружаемые на лету, учитываются через Policy.version
+POLICY_KEYS = (
+    "min_password_length",
+    "require_digits",
+    "require_uppercase",
+    "require_lowercase",
+    "require_special_chars",
+    "blocklist_path",
+    "word_matcher_path",
+    "guess_estimator_enabled",
+)
+
+
+def policy_version(config: Dict[str, Any]) -> str:
+    """
+    Вычисляет версию политики проверки по конфигурации.
+
+    Args:
+        config: Конфигурация приложения
+
+    Returns:
+        str: Короткий хэш настроек политики
+    """
+    policy = repr([(key, config.get(key)) for key in POLICY_KEYS])
+    return hashlib.blake2b(policy.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _copy_result(result: dict) -> dict:
+    """
+    Копия результата без поля "password".
+
+    Список details копируется вместе со словарями правил: изменения
+    результата у вызывающего не должны попадать в запись кэша.
+    """
+    copy = {}
+    for name, value in result.items():
+        if name == "details":
+            value = [dict(detail) for detail in value]
+        if name != "password":
+            copy[name] = value
+    return copy
+
+
+class ResultCache:
+    """LRU-кэш результатов с ограничением по размеру и времени жизни."""
+
+    def __init__(self, maxsize: int, ttl: float, version: str,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._salt = os.urandom(32)
+        self._data: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, password: str, policy_version: str = "") -> bytes:
+        """Ключ кэша: солёный хэш пароля и версий политики."""
+        digest = hashlib.blake2b(key=self._salt, digest_size=16)
+        digest.update(self.version.encode("ascii"))
+        digest.update(policy_version.encode("ascii"))
+        digest.update(b"\0")
+        digest.update(password.encode("utf-8", errors="surrogatepass"))
+        return digest.digest()
+
+    def get(self, password: str, policy_version: str = "") -> Optional[dict]:
+        """Возвращает результат из кэша или None (промах)."""
+        key = self.key(password, policy_version)
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires, result = entry
+                if expires > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return {"password": password, **_copy_result(result)}
+                del self._data[key]
+            self.misses += 1
+        return None
+
+    def put(self, password: str, result: dict, policy_version: str = ""):
+        """Сохраняет результат (без пароля в открытом виде)."""
+        key = self.key(password, policy_version)
+        stored = _copy_result(result)
+        expires = self._clock() + self.ttl
+        with self._lock:
+            self._data[key] = (expires, stored)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def evaluate(self, password: str, policy: Policy = DEFAULT_POLICY) -> dict:
+        """
+        Оценка по политике с кэшированием результата.
+
+        После перезагрузки политики ключи меняются, и старые записи
+        вытесняются по размеру или времени жизни.
+        """
+        result = self.get(password, policy.version)
+        if result is None:
+            result = policy.evaluate_password(password)
+            self.put(password, result, policy.version)
+        return result
+
+    def clear(self):
+        """Очищает кэш (счетчики сохраняются)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика кэша: размер, попадания, промахи."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def build_result_cache(config: Dict[str, Any]) -> Optional[ResultCache]:
+    """
+    Создает кэш результатов по конфигурации.
+
+    Returns:
+        Optional[ResultCache]: Кэш или None, если кэш выключен
+    """
+    if not config["result_cache_enabled"]:
+        return None
+    return ResultCache(
+        maxsize=config["result_cache_size"],
+        ttl=config["result_cache_ttl"],
+        version=policy_version(config),
+    )
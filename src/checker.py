@@ -1,24 +1,185 @@
-def check_length(password: str, min_length: int = 8) -> dict:
+"""
+Ядро логики оценки сложности паролей.
+
+Все правила питаются от одного прохода по символам пароля
+(см. scan_password), поэтому длинные фразы и массовые проверки
+не обходят строку заново для каждого правила.
+"""
+
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from blocklist import is_blocklisted
+from wordmatch import CoverageState, get_word_matcher, word_coverage
+
+# NumPy нужен только пакетной оценке и импортируется при первом пакете,
+# так что одиночная проверка (например, из CLI) не платит за его загрузку.
+# Оценщик подбора (estimator.py) тоже импортируется, только когда включен
+np = None
+_numpy_checked = False
+
+
+def _load_numpy():
+    """Импортирует NumPy при первом вызове; None, если он не установлен."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+        except ImportError:  # пакетная оценка работает и без NumPy, но медленнее
+            numpy = None
+        np = numpy
+        _numpy_checked = True
+    return np
+
+# Набор спецсимволов, которые засчитываются правилом "Специальные символы"
+SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?`~"
+_SPECIAL_SET = frozenset(SPECIAL_CHARS)
+
+# Битовые флаги классов символов
+HAS_DIGIT = 1
+HAS_UPPER = 2
+HAS_LOWER = 4
+HAS_SPECIAL = 8
+ALL_CLASSES = HAS_DIGIT | HAS_UPPER | HAS_LOWER | HAS_SPECIAL
+
+# Уровни сложности по возрастанию и нижние границы баллов для них
+STRENGTH_LEVELS = ["Очень слабый", "Слабый", "Средний", "Сильный", "Очень сильный"]
+STRENGTH_THRESHOLDS = [30, 50, 70, 90]
+
+# Почему пароль считается простым: найден в списках (встроенном или
+# блок-листе) или в основном состоит из словарных слов (wordmatch.py)
+NOT_COMMON = 0
+COMMON_LISTED = 1
+COMMON_WORD_BASED = 2
+
+# Какая доля пароля должна быть покрыта словарными словами, чтобы
+# считать его построенным на словарном слове
+WORD_COVERAGE_LIMIT = 0.5
+
+# Встроенный список самых частых паролей. Большие словари утечек
+# подключаются как индекс блок-листа (см. blocklist.py)
+COMMON_PASSWORDS = frozenset([
+    "123456", "password", "12345678", "qwerty", "123456789",
+    "12345", "1234", "111111", "1234567", "dragon",
+    "123123", "baseball", "abc123", "football", "monkey",
+    "letmein", "shadow", "master", "666666", "qwertyuiop"
+])
+
+
+def scan_password(password: str) -> int:
     """
-    Проверяет длину пароля.
+    Классифицирует символы пароля за один проход.
+    
+    Каждый уникальный символ проверяется один раз; проход
+    прекращается, как только найдены все классы.
     
     Args:
         password (str): Пароль для проверки
-        min_length (int): Минимальная требуемая длина
         
     Returns:
-        dict: Результат проверки
+        int: Битовая маска из флагов HAS_*
     """
-    is_valid = len(password) >= min_length
-    
+    flags = 0
+    for char in set(password):
+        if char.isdigit():
+            flags |= HAS_DIGIT
+        if char.isupper():
+            flags |= HAS_UPPER
+        if char.islower():
+            flags |= HAS_LOWER
+        if char in _SPECIAL_SET:
+            flags |= HAS_SPECIAL
+        if flags == ALL_CLASSES:
+            break
+    return flags
+
+
+# ==========================================
+# РЕЗУЛЬТАТЫ ПРАВИЛ - формируются по готовым признакам
+# ==========================================
+
+def _length_result(length: int, min_length: int) -> dict:
+    is_valid = length >= min_length
     return {
         "rule": "Минимальная длина",
         "passed": is_valid,
-        "message": f"Длина: {len(password)} символов (минимум {min_length})",
+        "message": f"Длина: {length} символов (минимум {min_length})",
         "score": 20 if is_valid else 0  # 20 баллов за длину
     }
 
 
+def _digits_result(has_digits: bool) -> dict:
+    return {
+        "rule": "Наличие цифр",
+        "passed": has_digits,
+        "message": "Есть цифры" if has_digits else "Нет цифр",
+        "score": 15 if has_digits else 0  # 15 баллов за цифры
+    }
+
+
+def _uppercase_result(has_upper: bool) -> dict:
+    return {
+        "rule": "Заглавные буквы",
+        "passed": has_upper,
+        "message": "Есть заглавные буквы" if has_upper else "Нет заглавных букв",
+        "score": 15 if has_upper else 0
+    }
+
+
+def _lowercase_result(has_lower: bool) -> dict:
+    return {
+        "rule": "Строчные буквы",
+        "passed": has_lower,
+        "message": "Есть строчные буквы" if has_lower else "Нет строчных букв",
+        "score": 15 if has_lower else 0
+    }
+
+
+def _special_result(has_special: bool) -> dict:
+    return {
+        "rule": "Специальные символы",
+        "passed": has_special,
+        "message": "Есть спецсимволы" if has_special else "Нет спецсимволов",
+        "score": 20 if has_special else 0
+    }
+
+
+def _common_result(is_common: bool, word_based: bool = False) -> dict:
+    if not is_common:
+        message = "Не является простым паролем"
+    elif word_based:
+        message = "Пароль построен на словарном слове"
+    else:
+        message = "Слишком простой пароль!"
+    return {
+        "rule": "Не слишком простой",
+        "passed": not is_common,
+        "message": message,
+        "score": 15 if not is_common else 0
+    }
+
+
+# ==========================================
+# ОТДЕЛЬНЫЕ ПРАВИЛА
+# ==========================================
+
+def check_length(password: str, min_length: int = 8) -> dict:
+    """
+    Проверяет длину пароля.
+    
+    Args:
+        password (str): Пароль для проверки
+        min_length (int): Минимальная требуемая длина
+        
+    Returns:
+        dict: Результат проверки
+    """
+    return _length_result(len(password), min_length)
+
+
 def check_digits(password: str) -> dict:
     """
     Проверяет наличие цифр в пароле.
@@ -29,14 +190,7 @@ def check_digits(password: str) -> dict:
     Returns:
         dict: Результат проверки
     """
-    has_digits = any(char.isdigit() for char in password)
-    
-    return {
-        "rule": "Наличие цифр",
-        "passed": has_digits,
-        "message": "Есть цифры" if has_digits else "Нет цифр",
-        "score": 15 if has_digits else 0  # 15 баллов за цифры
-    }
+    return _digits_result(bool(scan_password(password) & HAS_DIGIT))
 
 
 def check_uppercase(password: str) -> dict:
@@ -49,14 +203,7 @@ def check_uppercase(password: str) -> dict:
     Returns:
         dict: Результат проверки
     """
-    has_upper = any(char.isupper() for char in password)
-    
-    return {
-        "rule": "Заглавные буквы",
-        "passed": has_upper,
-        "message": "Есть заглавные буквы" if has_upper else "Нет заглавных букв",
-        "score": 15 if has_upper else 0
-    }
+    return _uppercase_result(bool(scan_password(password) & HAS_UPPER))
 
 
 def check_lowercase(password: str) -> dict:
@@ -69,14 +216,7 @@ def check_lowercase(password: str) -> dict:
     Returns:
         dict: Результат проверки
     """
-    has_lower = any(char.islower() for char in password)
-    
-    return {
-        "rule": "Строчные буквы",
-        "passed": has_lower,
-        "message": "Есть строчные буквы" if has_lower else "Нет строчных букв",
-        "score": 15 if has_lower else 0
-    }
+    return _lowercase_result(bool(scan_password(password) & HAS_LOWER))
 
 
 def check_special_chars(password: str) -> dict:
@@ -89,15 +229,7 @@ def check_special_chars(password: str) -> dict:
     Returns:
         dict: Результат проверки
     """
-    special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?`~"
-    has_special = any(char in special_chars for char in password)
-    
-    return {
-        "rule": "Специальные символы",
-        "passed": has_special,
-        "message": "Есть спецсимволы" if has_special else "Нет спецсимволов",
-        "score": 20 if has_special else 0
-    }
+    return _special_result(bool(scan_password(password) & HAS_SPECIAL))
 
 
 def check_common_passwords(password: str) -> dict:
@@ -110,86 +242,1091 @@ def check_common_passwords(password: str) -> dict:
     Returns:
         dict: Результат проверки
     """
-    common_passwords = [
-        "123456", "password", "12345678", "qwerty", "123456789",
-        "12345", "1234", "111111", "1234567", "dragon",
-        "123123", "baseball", "abc123", "football", "monkey",
-        "letmein", "shadow", "master", "666666", "qwertyuiop"
-    ]
+    kind = _common_kind(password)
+    return _common_result(kind != NOT_COMMON, kind == COMMON_WORD_BASED)
+
+
+def _is_listed(password: str) -> bool:
+    """Пароль есть во встроенном списке или в блок-листе."""
+    lowered = password.lower()
+    return lowered in COMMON_PASSWORDS or is_blocklisted(lowered)
+
+
+def _common_kind(password: str) -> int:
+    """Почему пароль считается простым (NOT_COMMON, если не считается)."""
+    if _is_listed(password):
+        return COMMON_LISTED
+    if word_coverage(password) >= WORD_COVERAGE_LIMIT:
+        return COMMON_WORD_BASED
+    return NOT_COMMON
+
+
+def _guessability_result(guess_score: int, guesses_log10: float) -> dict:
+    passed = guess_score >= GUESS_SCORE_REQUIRED
+    return {
+        "rule": "Устойчивость к подбору",
+        "passed": passed,
+        "message": f"Подбор займет около 10^{guesses_log10:.0f} попыток",
+        "score": 0  # баллы не добавляет, но ограничивает итоговый балл
+    }
+
+
+def check_guessability(password: str) -> dict:
+    """
+    Оценивает, за сколько попыток подбирается пароль (см. estimator.py).
     
-    is_common = password.lower() in common_passwords
+    Args:
+        password (str): Пароль для проверки
+        
+    Returns:
+        dict: Результат проверки
+    """
+    from estimator import estimate_guesses
     
+    estimate = estimate_guesses(password)
+    return _guessability_result(estimate["score"], estimate["guesses_log10"])
+
+
+def _empty_result() -> dict:
     return {
-        "rule": "Не слишком простой",
-        "passed": not is_common,
-        "message": "Не является простым паролем" if not is_common else "Слишком простой пароль!",
-        "score": 15 if not is_common else 0
+        "password": "",
+        "score": 0,
+        "strength": "Очень слабый",
+        "details": [{
+            "rule": "Пустой пароль",
+            "passed": False,
+            "message": "Пароль не может быть пустым",
+            "score": 0
+        }]
     }
 
 
+# ==========================================
+# ПРОФИЛЬ ПРАВИЛ - время оценки по правилам
+# ==========================================
+
+# Правила, время которых учитывается отдельно. Классы символов
+# проверяются одним проходом (scan_password), поэтому четыре правила
+# классов учитываются вместе; сравнение длины не замеряется
+PROFILED_RULES = ("character_classes", "not_common", "guessability")
+PROFILE_CLASSES, PROFILE_COMMON, PROFILE_GUESSES = range(len(PROFILED_RULES))
+
+
+class RuleProfile:
+    """
+    Накопленные число оценок и время (нс) по правилам.
+    
+    Каждый поток пишет в собственный список счетчиков, поэтому запись
+    обходится без блокировок; snapshot() суммирует счетчики всех потоков.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[List[int]] = []
+        self._lock = threading.Lock()
+    
+    def counters(self) -> List[int]:
+        """
+        Счетчики текущего потока.
+        
+        Для правила с индексом i (PROFILE_*): [2 * i] - число оценок,
+        [2 * i + 1] - время в наносекундах.
+        """
+        try:
+            return self._local.counters
+        except AttributeError:
+            counters = [0] * (2 * len(PROFILED_RULES))
+            with self._lock:
+                self._shards.append(counters)
+            self._local.counters = counters
+            return counters
+    
+    def add(self, rule: int, calls: int, nanoseconds: int):
+        """Учитывает calls оценок правила rule, занявших nanoseconds."""
+        counters = self.counters()
+        counters[2 * rule] += calls
+        counters[2 * rule + 1] += nanoseconds
+    
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Суммы по всем потокам: правило -> (число оценок, время в нс)."""
+        with self._lock:
+            shards = [list(counters) for counters in self._shards]
+        totals = ([sum(column) for column in zip(*shards, strict=True)]
+                  or [0] * (2 * len(PROFILED_RULES)))
+        return {
+            name: (totals[2 * i], totals[2 * i + 1])
+            for i, name in enumerate(PROFILED_RULES)
+        }
+    
+    def total_ns(self) -> int:
+        """Суммарное время по всем правилам в наносекундах."""
+        return sum(nanoseconds for _, nanoseconds in self.snapshot().values())
+    
+    def reset(self):
+        """Обнуляет счетчики всех потоков."""
+        with self._lock:
+            for counters in self._shards:
+                counters[:] = [0] * len(counters)
+
+
+# ==========================================
+# КОМПАКТНЫЙ РЕЗУЛЬТАТ - сообщения строятся только при выводе
+# ==========================================
+
+# Биты пройденных правил. Биты классов символов совпадают с HAS_* << 1
+RULE_LENGTH = 1
+RULE_DIGITS = HAS_DIGIT << 1
+RULE_UPPERCASE = HAS_UPPER << 1
+RULE_LOWERCASE = HAS_LOWER << 1
+RULE_SPECIAL = HAS_SPECIAL << 1
+RULE_NOT_COMMON = 32
+# Не правило, а причина провала RULE_NOT_COMMON: пароль построен на слове
+RULE_WORD_BASED = 64
+# Только в маске провалов (Policy.failed_rules): не пройдена оценка подбора
+RULE_GUESSES = 128
+
+# Баллы за каждое правило, в порядке вывода деталей
+RULE_SCORES = [
+    (RULE_LENGTH, 20),
+    (RULE_DIGITS, 15),
+    (RULE_UPPERCASE, 15),
+    (RULE_LOWERCASE, 15),
+    (RULE_SPECIAL, 20),
+    (RULE_NOT_COMMON, 15),
+]
+
+DEFAULT_MIN_LENGTH = 8
+
+# Оценка подбора (estimator.py): правило пройдено с этого уровня 0..4,
+# а итоговый балл не может превышать границу для уровня пароля
+# (Policy.caps, считаются по уровням сложности под максимум политики)
+GUESS_SCORE_REQUIRED = 3
+
+# Правила, которые отключаются в конфигурации (REQUIRE_*)
+OPTIONAL_RULES = RULE_DIGITS | RULE_UPPERCASE | RULE_LOWERCASE | RULE_SPECIAL
+
+# Детали по каждому правилу, в порядке RULE_SCORES
+_RULE_RESULTS = [
+    (RULE_LENGTH, lambda ev: _length_result(ev.length, ev.policy.min_length)),
+    (RULE_DIGITS, lambda ev: _digits_result(bool(ev.passed & RULE_DIGITS))),
+    (RULE_UPPERCASE, lambda ev: _uppercase_result(bool(ev.passed & RULE_UPPERCASE))),
+    (RULE_LOWERCASE, lambda ev: _lowercase_result(bool(ev.passed & RULE_LOWERCASE))),
+    (RULE_SPECIAL, lambda ev: _special_result(bool(ev.passed & RULE_SPECIAL))),
+    (RULE_NOT_COMMON, lambda ev: _common_result(
+        not ev.passed & RULE_NOT_COMMON, bool(ev.passed & RULE_WORD_BASED))),
+]
+
+
+def _no_classes(password: str) -> int:
+    """Замена scan_password, когда все правила классов выключены."""
+    return 0
+
+
+@lru_cache(maxsize=32)
+def _restore_policy(*args) -> "Policy":
+    """Восстанавливает политику после pickle (воркеры пула процессов)."""
+    return Policy(*args)
+
+
+class Policy:
+    """
+    Скомпилированная политика проверки паролей.
+    
+    Строится один раз из настроек (см. from_config). Выключенные
+    правила убираются и из проверки, и из деталей, а минимальная длина,
+    таблица баллов и границы уровней подставляются в оценщик как
+    константы - во время оценки конфигурация не читается.
+    
+    Атрибут evaluate - собранная под политику функция
+    evaluate(password) -> Evaluation.
+    
+    Если часть правил выключена, максимальный балл меньше 100,
+    а уровень сложности считается по доле от максимума.
+    
+    С profile оценщик собирается с замером времени по правилам
+    (RuleProfile); без него замеров нет вовсе. Профиль не передается
+    в другие процессы и не влияет на version.
+    """
+    
+    __slots__ = ("min_length", "rules", "estimate", "max_score", "version",
+                 "scores", "levels", "caps", "profile", "_results", "evaluate")
+    
+    def __init__(self, min_length: int = DEFAULT_MIN_LENGTH,
+                 require_digits: bool = True, require_uppercase: bool = True,
+                 require_lowercase: bool = True, require_special: bool = True,
+                 estimate: bool = False, profile: Optional[RuleProfile] = None):
+        rules = RULE_LENGTH | RULE_NOT_COMMON
+        optional = (
+            (require_digits, RULE_DIGITS),
+            (require_uppercase, RULE_UPPERCASE),
+            (require_lowercase, RULE_LOWERCASE),
+            (require_special, RULE_SPECIAL),
+        )
+        for required, bit in optional:
+            if required:
+                rules |= bit
+        
+        self.min_length = min_length
+        self.rules = rules
+        self.estimate = estimate
+        self.profile = profile
+        enabled = [(bit, score) for bit, score in RULE_SCORES if rules & bit]
+        self.max_score = sum(score for _, score in enabled)
+        # Балл для каждой маски пройденных правил
+        self.scores = [
+            sum(score for bit, score in enabled if mask & bit)
+            for mask in range(128)
+        ]
+        # Индекс уровня в STRENGTH_LEVELS для каждого возможного балла
+        self.levels = [
+            sum(1 for threshold in STRENGTH_THRESHOLDS
+                if score * 100 >= threshold * self.max_score)
+            for score in range(self.max_score + 1)
+        ]
+        # Наибольший балл, допустимый при каждом уровне оценки подбора
+        self.caps = [
+            max(score for score, level in enumerate(self.levels) if level <= guess_level)
+            for guess_level in range(len(STRENGTH_LEVELS))
+        ]
+        self._results = [result for bit, result in _RULE_RESULTS if rules & bit]
+        # Версия - сами настройки в компактном виде (для ключей кэша и /config)
+        self.version = "p{}-{:d}{:d}{:d}{:d}-{:d}".format(*self._args())
+        self.evaluate = self._compile()
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, object],
+                    profile: Optional[RuleProfile] = None) -> "Policy":
+        """Строит политику по конфигурации приложения (config.py)."""
+        return cls(
+            min_length=config["min_password_length"],
+            require_digits=config["require_digits"],
+            require_uppercase=config["require_uppercase"],
+            require_lowercase=config["require_lowercase"],
+            require_special=config["require_special_chars"],
+            estimate=config["guess_estimator_enabled"],
+            profile=profile,
+        )
+    
+    def _args(self) -> tuple:
+        rules = self.rules
+        return (
+            self.min_length,
+            bool(rules & RULE_DIGITS),
+            bool(rules & RULE_UPPERCASE),
+            bool(rules & RULE_LOWERCASE),
+            bool(rules & RULE_SPECIAL),
+            self.estimate,
+        )
+    
+    def __reduce__(self):
+        # Собранная функция не сериализуется - воркер собирает ее заново
+        return _restore_policy, self._args()
+    
+    def __repr__(self) -> str:
+        return f"Policy{self._args()!r}"
+    
+    def to_dict(self) -> Dict[str, object]:
+        """Правила политики (для /config)."""
+        min_length, digits, uppercase, lowercase, special, estimate = self._args()
+        return {
+            "min_length": min_length,
+            "require_digits": digits,
+            "require_uppercase": uppercase,
+            "require_lowercase": lowercase,
+            "require_special": special,
+            "guess_estimator": estimate,
+            "max_score": self.max_score,
+            "version": self.version,
+        }
+    
+    def _compile(self) -> Callable[[str], "Evaluation"]:
+        """Собирает функцию оценки с настройками политики в замыкании."""
+        policy = self
+        min_length = self.min_length
+        class_rules = self.rules & OPTIONAL_RULES
+        scores = self.scores
+        caps = self.caps
+        profile = self.profile
+        clock = time.perf_counter_ns
+        # Без правил классов символов пароль не сканируется вовсе
+        scan = scan_password if class_rules else _no_classes
+        
+        def evaluate(password: str) -> "Evaluation":
+            if not password:
+                return Evaluation(password, 0, 0, 0, policy=policy)
+            length = len(password)
+            passed = (scan(password) << 1) & class_rules
+            if length >= min_length:
+                passed |= RULE_LENGTH
+            kind = _common_kind(password)
+            if kind == NOT_COMMON:
+                passed |= RULE_NOT_COMMON
+            elif kind == COMMON_WORD_BASED:
+                passed |= RULE_WORD_BASED
+            return Evaluation(password, length, passed, scores[passed], policy=policy)
+        
+        def evaluate_profiled(password: str) -> "Evaluation":
+            if not password:
+                return Evaluation(password, 0, 0, 0, policy=policy)
+            counters = profile.counters()
+            length = len(password)
+            start = clock()
+            passed = (scan(password) << 1) & class_rules
+            scanned = clock()
+            kind = _common_kind(password)
+            finished = clock()
+            # Счетчики PROFILE_CLASSES и PROFILE_COMMON
+            counters[0] += 1
+            counters[1] += scanned - start
+            counters[2] += 1
+            counters[3] += finished - scanned
+            if length >= min_length:
+                passed |= RULE_LENGTH
+            if kind == NOT_COMMON:
+                passed |= RULE_NOT_COMMON
+            elif kind == COMMON_WORD_BASED:
+                passed |= RULE_WORD_BASED
+            return Evaluation(password, length, passed, scores[passed], policy=policy)
+        
+        base = evaluate if profile is None else evaluate_profiled
+        if not self.estimate:
+            return base
+        
+        from estimator import estimate_guesses
+        
+        def evaluate_estimated(password: str) -> "Evaluation":
+            evaluation = base(password)
+            if evaluation.length:
+                if profile is None:
+                    guesses = estimate_guesses(password)
+                else:
+                    start = clock()
+                    guesses = estimate_guesses(password)
+                    profile.add(PROFILE_GUESSES, 1, clock() - start)
+                evaluation.score = min(evaluation.score, caps[guesses["score"]])
+                evaluation.guess_score = guesses["score"]
+                evaluation.guesses_log10 = guesses["guesses_log10"]
+            return evaluation
+        
+        return evaluate_estimated
+    
+    def passed_mask(self, length: int, flags: int, common_kind: int) -> int:
+        """Собирает маску пройденных правил из признаков пароля."""
+        mask = (flags << 1) & self.rules & OPTIONAL_RULES
+        if length >= self.min_length:
+            mask |= RULE_LENGTH
+        if common_kind == NOT_COMMON:
+            mask |= RULE_NOT_COMMON
+        elif common_kind == COMMON_WORD_BASED:
+            mask |= RULE_WORD_BASED
+        return mask
+    
+    def failed_rules(self, columns: Dict[str, object]):
+        """
+        Маска непройденных правил для каждого пароля пакета.
+        
+        Биты - RULE_* включенных правил; RULE_WORD_BASED уточняет провал
+        RULE_NOT_COMMON, RULE_GUESSES - провал оценки подбора.
+        
+        Args:
+            columns: Результат evaluate_batch по этой политике
+            
+        Returns:
+            Столбец масок (uint8 с NumPy, иначе список)
+        """
+        guess_scores = columns.get("guess_score")
+        if np is not None and not isinstance(columns["length"], list):
+            passed = _passed_masks_numpy(
+                columns["length"], columns["flags"], columns["common"], self
+            )
+            failed = (self.rules & ~passed) | (passed & RULE_WORD_BASED)
+            if guess_scores is not None:
+                failed |= np.where(guess_scores < GUESS_SCORE_REQUIRED, RULE_GUESSES, 0)
+            return failed.astype(np.uint8)
+        
+        failed = []
+        rows = zip(columns["length"], columns["flags"], columns["common"], strict=True)
+        for length, flags, common in rows:
+            passed = self.passed_mask(length, flags, common)
+            failed.append((self.rules & ~passed) | (passed & RULE_WORD_BASED))
+        if guess_scores is not None:
+            failed = [
+                mask | RULE_GUESSES if guess_score < GUESS_SCORE_REQUIRED else mask
+                for mask, guess_score in zip(failed, guess_scores, strict=True)
+            ]
+        return failed
+    
+    def evaluate_scanned(self, password: str, flags: int,
+                         common_kind: Optional[int] = None) -> "Evaluation":
+        """
+        Как evaluate, но классы символов (флаги HAS_*) и, если передан,
+        результат проверки на простоту уже известны - для PasswordState,
+        который считает их по мере ввода.
+        """
+        if not password:
+            return Evaluation(password, 0, 0, 0, policy=self)
+        length = len(password)
+        if common_kind is None:
+            common_kind = _common_kind(password)
+        passed = self.passed_mask(length, flags, common_kind)
+        evaluation = Evaluation(password, length, passed, self.scores[passed], policy=self)
+        if self.estimate:
+            from estimator import estimate_guesses
+            
+            guesses = estimate_guesses(password)
+            evaluation.score = min(evaluation.score, self.caps[guesses["score"]])
+            evaluation.guess_score = guesses["score"]
+            evaluation.guesses_log10 = guesses["guesses_log10"]
+        return evaluation
+    
+    def evaluate_password(self, password: str) -> dict:
+        """Оценивает пароль и возвращает результат в формате evaluate_password."""
+        return self.evaluate(password).to_dict()
+    
+    def evaluate_batch(self, passwords: Sequence[str]) -> Dict[str, object]:
+        """Пакетная оценка по политике (см. evaluate_batch)."""
+        if len(passwords) < BATCH_MIN_VECTOR_SIZE or _load_numpy() is None:
+            columns = _evaluate_batch_python(passwords, self)
+        else:
+            columns = _evaluate_batch_numpy(passwords, self)
+        if self.estimate:
+            _apply_guess_estimates(passwords, columns, self)
+        return columns
+    
+    def batch_to_dicts(self, passwords: Sequence[str],
+                       columns: Dict[str, object]) -> List[dict]:
+        """Столбцы evaluate_batch в виде словарей (см. batch_to_dicts)."""
+        count = len(passwords)
+        guess_scores = columns.get("guess_score", [None] * count)
+        guesses_log10 = columns.get("guesses_log10", [0.0] * count)
+        rows = zip(
+            passwords,
+            columns["length"],
+            columns["flags"],
+            columns["common"],
+            columns["score"],
+            guess_scores,
+            guesses_log10,
+            strict=True,
+        )
+        return [
+            Evaluation(
+                password,
+                int(length),
+                self.passed_mask(int(length), int(flags), int(common)),
+                int(score),
+                None if guess_score is None else int(guess_score),
+                float(log10),
+                self,
+            ).to_dict()
+            for password, length, flags, common, score, guess_score, log10 in rows
+        ]
+
+
+# Политика по умолчанию: все правила, минимум DEFAULT_MIN_LENGTH символов
+DEFAULT_POLICY = Policy()
+# Та же политика с оценкой подбора (создается при первом использовании)
+_estimating_policy: Optional[Policy] = None
+
+
+def _default_policy(estimate: bool) -> Policy:
+    global _estimating_policy
+    if not estimate:
+        return DEFAULT_POLICY
+    if _estimating_policy is None:
+        _estimating_policy = Policy(estimate=True)
+    return _estimating_policy
+
+
+class Evaluation:
+    """
+    Компактный результат оценки пароля.
+    
+    Хранит только длину, маску пройденных правил, балл и ссылку на
+    политику. Словарь с деталями и текстами сообщений строится лишь
+    в to_dict(). Если включена оценка подбора, хранит и ее уровень
+    (guess_score).
+    """
+    
+    __slots__ = ("password", "length", "passed", "score", "guess_score",
+                 "guesses_log10", "policy")
+    
+    def __init__(self, password: str, length: int, passed: int, score: int,
+                 guess_score: Optional[int] = None, guesses_log10: float = 0.0,
+                 policy: Policy = DEFAULT_POLICY):
+        self.password = password
+        self.length = length
+        self.passed = passed
+        self.score = score
+        self.guess_score = guess_score
+        self.guesses_log10 = guesses_log10
+        self.policy = policy
+    
+    @property
+    def strength(self) -> str:
+        """Уровень сложности."""
+        return STRENGTH_LEVELS[self.policy.levels[self.score]]
+    
+    def details(self) -> List[dict]:
+        """Детали проверки по каждому правилу политики."""
+        details = [result(self) for result in self.policy._results]
+        if self.guess_score is not None:
+            details.append(_guessability_result(self.guess_score, self.guesses_log10))
+        return details
+    
+    def rule_states(self) -> Dict[str, bool]:
+        """Пройдено ли каждое правило политики (имена - как в FAILED_RULE_NAMES)."""
+        states = {
+            name: bool(self.passed & bit)
+            for bit, name in FAILED_RULE_NAMES
+            if self.policy.rules & bit
+        }
+        if self.guess_score is not None:
+            states["guessability"] = self.guess_score >= GUESS_SCORE_REQUIRED
+        return states
+    
+    def to_dict(self) -> dict:
+        """Результат в формате evaluate_password."""
+        if not self.length:
+            return _empty_result()
+        return {
+            "password": self.password,
+            "score": self.score,
+            "strength": self.strength,
+            "max_score": self.policy.max_score,
+            "details": self.details(),
+        }
+
+
 # ==========================================
 # ГЛАВНАЯ ФУНКЦИЯ - СБИРАЕМ ВСЕ ДЕТАЛИ ВМЕСТЕ
 # ==========================================
 
-def evaluate_password(password: str) -> dict:
+def evaluate(password: str, estimate: bool = False) -> Evaluation:
+    """
+    Оценивает пароль по политике по умолчанию и возвращает компактный результат.
+    
+    Подходит, когда нужны только балл и уровень: тексты сообщений
+    не формируются. Для политики из конфигурации - Policy.evaluate.
+    
+    Args:
+        password (str): Пароль для проверки
+        estimate (bool): Добавить правило оценки подбора (estimator.py);
+            слабый по этой оценке пароль не получит высокий балл
+        
+    Returns:
+        Evaluation: Результат проверки
+    """
+    return _default_policy(estimate).evaluate(password)
+
+
+def evaluate_password(password: str, estimate: bool = False) -> dict:
     """
     Основная функция для оценки пароля.
     Собирает все проверки вместе и выдает итоговый результат.
     
     Args:
         password (str): Пароль для проверки
+        estimate (bool): Добавить правило оценки подбора (см. evaluate)
         
     Returns:
         dict: Полный результат проверки
     """
-    if not password:
-        return {
-            "password": "",
-            "score": 0,
-            "strength": "Очень слабый",
-            "details": [{
-                "rule": "Пустой пароль",
-                "passed": False,
-                "message": "Пароль не может быть пустым",
-                "score": 0
-            }]
-        }
+    return evaluate(password, estimate).to_dict()
+
+
+# ==========================================
+# ИНКРЕМЕНТАЛЬНАЯ ОЦЕНКА - пароль, который вводят по символу
+# ==========================================
+
+def char_classes(char: str) -> int:
+    """Флаги HAS_* одного символа (как в scan_password)."""
+    flags = 0
+    if char.isdigit():
+        flags |= HAS_DIGIT
+    if char.isupper():
+        flags |= HAS_UPPER
+    if char.islower():
+        flags |= HAS_LOWER
+    if char in _SPECIAL_SET:
+        flags |= HAS_SPECIAL
+    return flags
+
+
+# Биты HAS_* по порядку счетчиков PasswordState
+_CLASS_BITS = (HAS_DIGIT, HAS_UPPER, HAS_LOWER, HAS_SPECIAL)
+
+
+class PasswordState:
+    """
+    Пароль с оценкой, которая обновляется по мере редактирования.
     
-    # Выполняем все проверки
-    checks = [
-        check_length(password),
-        check_digits(password),
-        check_uppercase(password),
-        check_lowercase(password),
-        check_special_chars(password),
-        check_common_passwords(password),
-    ]
+    Для индикаторов сложности (WebSocket /check/ws, интерактивный режим
+    CLI): на каждое нажатие клавиши пароль не сканируется заново.
+    Хранятся длина, счетчики символов каждого класса и состояние поиска
+    словарных слов по каждому префиксу (wordmatch.CoverageState), так что
+    append и delete в конце стоят O(1) на символ (амортизированно).
+    Правка в середине (replace_range) пересчитывает слова только после
+    места правки. Точные совпадения (встроенный список и блок-лист)
+    проверяются одним хэшем строки в result(), оценка подбора (если
+    включена) - заново. result() запоминает оценку до следующей правки.
+    """
     
-    # Считаем общий балл
-    total_score = sum(check["score"] for check in checks)
-    
-    # Определяем уровень сложности
-    if total_score >= 90:
-        strength = "Очень сильный"
-    elif total_score >= 70:
-        strength = "Сильный"
-    elif total_score >= 50:
-        strength = "Средний"
-    elif total_score >= 30:
-        strength = "Слабый"
-    else:
-        strength = "Очень слабый"
+    __slots__ = ("policy", "_chars", "_counts", "_words", "_evaluation")
+    
+    def __init__(self, policy: Policy = DEFAULT_POLICY, password: str = ""):
+        self.policy = policy
+        self._chars: List[str] = []
+        # Число символов каждого класса, в порядке _CLASS_BITS
+        self._counts = [0] * len(_CLASS_BITS)
+        # Поиск слов по префиксам пароля (создается в result())
+        self._words: Optional[CoverageState] = None
+        self._evaluation: Optional[Evaluation] = None
+        self.append(password)
+    
+    def __len__(self) -> int:
+        return len(self._chars)
+    
+    @property
+    def password(self) -> str:
+        """Текущий пароль."""
+        return "".join(self._chars)
+    
+    @property
+    def flags(self) -> int:
+        """Флаги HAS_* классов, которые есть в пароле."""
+        flags = 0
+        for bit, count in zip(_CLASS_BITS, self._counts, strict=True):
+            if count:
+                flags |= bit
+        return flags
     
-    # Возвращаем полный результат
+    def _count(self, text, delta: int):
+        counts = self._counts
+        for char in text:
+            classes = char_classes(char)
+            if classes:
+                for i, bit in enumerate(_CLASS_BITS):
+                    if classes & bit:
+                        counts[i] += delta
+    
+    def append(self, text: str):
+        """Дописывает символы в конец пароля."""
+        if text:
+            self._chars.extend(text)
+            self._count(text, 1)
+            self._evaluation = None
+    
+    def delete(self, count: int = 1):
+        """Удаляет count последних символов (Backspace)."""
+        count = min(count, len(self._chars))
+        if count > 0:
+            self.replace_range(len(self._chars) - count, len(self._chars), "")
+    
+    def replace_range(self, start: int, end: int, text: str):
+        """
+        Заменяет символы [start, end) на text (вставка - start == end,
+        удаление - пустой text).
+        
+        Raises:
+            IndexError: Диапазон вне пароля
+        """
+        if not 0 <= start <= end <= len(self._chars):
+            raise IndexError(f"диапазон [{start}, {end}) вне пароля длины {len(self._chars)}")
+        removed = self._chars[start:end]
+        if not removed and not text:
+            return
+        self._count(removed, -1)
+        self._count(text, 1)
+        self._chars[start:end] = text
+        if self._words is not None:
+            self._words.truncate(start)
+        self._evaluation = None
+    
+    def set(self, password: str):
+        """
+        Заменяет пароль целиком (вставка из буфера, правка в середине):
+        общее начало со старым паролем не пересчитывается.
+        """
+        chars = self._chars
+        common = 0
+        limit = min(len(chars), len(password))
+        while common < limit and chars[common] == password[common]:
+            common += 1
+        self.replace_range(common, len(chars), password[common:])
+    
+    def _common_kind(self, password: str) -> int:
+        if _is_listed(password):
+            return COMMON_LISTED
+        matcher = get_word_matcher()
+        if matcher is None:
+            return NOT_COMMON
+        words = self._words
+        if words is None or words.matcher is not matcher:
+            # Первый поиск слов или словарь переподключили
+            words = self._words = CoverageState(matcher)
+        for char in self._chars[len(words):]:
+            words.append(char)
+        return COMMON_WORD_BASED if words.coverage >= WORD_COVERAGE_LIMIT else NOT_COMMON
+    
+    def result(self) -> Evaluation:
+        """Оценка текущего пароля."""
+        if self._evaluation is None:
+            password = self.password
+            common_kind = self._common_kind(password) if password else NOT_COMMON
+            self._evaluation = self.policy.evaluate_scanned(password, self.flags, common_kind)
+        return self._evaluation
+
+
+# ==========================================
+# ПАКЕТНАЯ ОЦЕНКА - столбцы вместо словарей
+# ==========================================
+
+# Пароли длиннее этого порога оцениваются поштучно, чтобы один длинный
+# пароль не раздувал выровненный массив всего пакета
+BATCH_MAX_VECTOR_LENGTH = 256
+BATCH_CHUNK_SIZE = 65536
+
+# Пакеты меньше этого размера оцениваются обычным циклом: им невыгодно
+# платить за импорт NumPy и построение таблицы классов
+BATCH_MIN_VECTOR_SIZE = 256
+
+# Таблица классов для символов BMP (строится при первом вызове)
+_class_table = None
+
+
+def _get_class_table():
+    """Флаги HAS_* для каждого символа BMP (как scan_password)."""
+    global _class_table
+    if _class_table is None:
+        # Те же проверки str.isdigit/isupper/islower, но над массивом
+        # всех символов сразу, а не 65 тыс. вызовов scan_password
+        chars = np.arange(0x10000, dtype=np.uint32).view("<U1")
+        table = (
+            np.char.isdigit(chars) * HAS_DIGIT
+            | np.char.isupper(chars) * HAS_UPPER
+            | np.char.islower(chars) * HAS_LOWER
+        ).astype(np.uint8)
+        table[np.frombuffer(SPECIAL_CHARS.encode("ascii"), dtype=np.uint8)] |= HAS_SPECIAL
+        # Код 0 - выравнивание коротких строк в массиве пакета
+        table[0] = 0
+        _class_table = table
+    return _class_table
+
+
+def prepare_batch():
+    """
+    Заранее загружает NumPy и таблицу классов пакетной оценки.
+
+    Обычно это происходит при первом большом пакете; профиль проверки
+    (--profile) вызывает функцию до замера, чтобы разовая подготовка
+    не попадала во время правила character_classes.
+    """
+    if _load_numpy() is not None:
+        _get_class_table()
+
+
+def _batch_flags(passwords: Sequence[str], lengths) -> "np.ndarray":
+    """Векторно вычисляет битовые маски классов для пакета паролей."""
+    table = _get_class_table()
+    flags = np.zeros(len(passwords), dtype=np.uint8)
+    short = np.flatnonzero((lengths > 0) & (lengths <= BATCH_MAX_VECTOR_LENGTH))
+
+    if len(short):
+        # UTF-32 без выравнивания по NUL: каждая строка - ряд кодов символов
+        width = int(lengths[short].max())
+        codes = np.array([passwords[i] for i in short], dtype=f"<U{width}")
+        codes = codes.view(np.uint32).reshape(len(short), width)
+        bmp = codes < 0x10000
+        row_flags = np.bitwise_or.reduce(table[np.where(bmp, codes, 0)], axis=1)
+        flags[short] = row_flags
+        # Символы вне BMP досчитываем поштучно
+        for row in np.flatnonzero(~bmp.all(axis=1)):
+            flags[short[row]] = scan_password(passwords[short[row]])
+
+    for i in np.flatnonzero(lengths > BATCH_MAX_VECTOR_LENGTH):
+        flags[i] = scan_password(passwords[i])
+    return flags
+
+
+def evaluate_batch(passwords: Sequence[str], estimate: bool = False) -> Dict[str, object]:
+    """
+    Оценивает пакет паролей и возвращает результат по столбцам.
+    
+    Длины, классы символов, баллы и уровни считаются операциями NumPy
+    над всем пакетом (без NumPy и для пакетов меньше
+    BATCH_MIN_VECTOR_SIZE - обычным циклом). Использует политику
+    по умолчанию; для политики из конфигурации - Policy.evaluate_batch.
+    
+    Args:
+        passwords: Пароли для проверки
+        estimate (bool): Добавить оценку подбора (см. evaluate) -
+            она считается поштучно и добавляет столбцы "guess_score"
+            и "guesses_log10"
+        
+    Returns:
+        Dict[str, object]: Столбцы одинаковой длины:
+            "length" - длина пароля,
+            "flags" - битовая маска классов символов (HAS_*),
+            "common" - почему пароль простой (NOT_COMMON, COMMON_*),
+            "score" - итоговый балл,
+            "strength" - индекс уровня в STRENGTH_LEVELS
+    """
+    return _default_policy(estimate).evaluate_batch(passwords)
+
+
+def _evaluate_batch_numpy(passwords: Sequence[str], policy: Policy) -> Dict[str, object]:
+    count = len(passwords)
+    lengths = np.fromiter(map(len, passwords), dtype=np.int64, count=count)
+    flags = np.zeros(count, dtype=np.uint8)
+    class_rules = policy.rules & OPTIONAL_RULES
+    started = time.perf_counter_ns()
+    if class_rules:
+        for start in range(0, count, BATCH_CHUNK_SIZE):
+            stop = start + BATCH_CHUNK_SIZE
+            flags[start:stop] = _batch_flags(passwords[start:stop], lengths[start:stop])
+    scanned = time.perf_counter_ns()
+    common = np.fromiter(
+        (_common_kind(pwd) for pwd in passwords), dtype=np.uint8, count=count
+    )
+    if policy.profile is not None:
+        policy.profile.add(PROFILE_CLASSES, count, scanned - started)
+        policy.profile.add(PROFILE_COMMON, count, time.perf_counter_ns() - scanned)
+
+    passed = _passed_masks_numpy(lengths, flags, common, policy)
+    score = np.asarray(policy.scores)[passed]
+    score[lengths == 0] = 0
+    strength = np.asarray(policy.levels, dtype=np.uint8)[score]
+
     return {
-        "password": password,
-        "score": total_score,
+        "length": lengths,
+        "flags": flags,
+        "common": common,
+        "score": score,
         "strength": strength,
-        "max_score": 100,
-        "details": checks
     }
 
 
+def _passed_masks_numpy(lengths, flags, common, policy: Policy):
+    """Policy.passed_mask для столбцов пакета."""
+    return (
+        (flags.astype(np.int64) << 1) & policy.rules & OPTIONAL_RULES
+        | np.where(lengths >= policy.min_length, RULE_LENGTH, 0)
+        | np.where(common == NOT_COMMON, RULE_NOT_COMMON, 0)
+        | np.where(common == COMMON_WORD_BASED, RULE_WORD_BASED, 0)
+    )
+
+
+def _evaluate_batch_python(passwords: Sequence[str], policy: Policy) -> Dict[str, object]:
+    """Запасной вариант evaluate_batch без NumPy (те же столбцы, но списки)."""
+    scan = scan_password if policy.rules & OPTIONAL_RULES else _no_classes
+    started = time.perf_counter_ns()
+    flags = [scan(password) for password in passwords]
+    scanned = time.perf_counter_ns()
+    common = [_common_kind(password) for password in passwords]
+    if policy.profile is not None:
+        policy.profile.add(PROFILE_CLASSES, len(passwords), scanned - started)
+        policy.profile.add(PROFILE_COMMON, len(passwords), time.perf_counter_ns() - scanned)
+    
+    lengths, scores, strengths = [], [], []
+    for password, flag, kind in zip(passwords, flags, common, strict=True):
+        score = 0
+        if password:
+            score = policy.scores[policy.passed_mask(len(password), flag, kind)]
+        lengths.append(len(password))
+        scores.append(score)
+        strengths.append(policy.levels[score])
+    return {
+        "length": lengths,
+        "flags": flags,
+        "common": common,
+        "score": scores,
+        "strength": strengths,
+    }
+
+
+def _apply_guess_estimates(passwords: Sequence[str], columns: Dict[str, object],
+                           policy: Policy):
+    """Добавляет к столбцам оценку подбора и ограничивает по ней баллы."""
+    from estimator import estimate_guesses
+    
+    guess_scores, guesses_log10 = [], []
+    # Одинаковые пароли в пакете оцениваются один раз
+    estimates: Dict[str, Tuple[int, float]] = {"": (0, 0.0)}
+    started = time.perf_counter_ns()
+    for password in passwords:
+        estimate = estimates.get(password)
+        if estimate is None:
+            guesses = estimate_guesses(password)
+            estimate = estimates[password] = (guesses["score"], guesses["guesses_log10"])
+        guess_scores.append(estimate[0])
+        guesses_log10.append(estimate[1])
+    if policy.profile is not None:
+        policy.profile.add(PROFILE_GUESSES, len(passwords), time.perf_counter_ns() - started)
+    scores = [
+        min(int(score), policy.caps[guess_score])
+        for score, guess_score in zip(columns["score"], guess_scores, strict=True)
+    ]
+    strengths = [policy.levels[score] for score in scores]
+    
+    if np is not None and not isinstance(columns["length"], list):
+        columns["score"] = np.asarray(scores, dtype=np.int64)
+        columns["strength"] = np.asarray(strengths, dtype=np.uint8)
+        columns["guess_score"] = np.asarray(guess_scores, dtype=np.uint8)
+        columns["guesses_log10"] = np.asarray(guesses_log10)
+    else:
+        columns["score"] = scores
+        columns["strength"] = strengths
+        columns["guess_score"] = guess_scores
+        columns["guesses_log10"] = guesses_log10
+
+
+def batch_to_dicts(passwords: Sequence[str], columns: Dict[str, object],
+                   estimate: bool = False) -> List[dict]:
+    """
+    Превращает столбцы evaluate_batch в привычные словари evaluate_password.
+    
+    Args:
+        passwords: Те же пароли, что были переданы в evaluate_batch
+        columns: Результат evaluate_batch
+        estimate (bool): То же значение, что было передано в evaluate_batch
+        
+    Returns:
+        List[dict]: Результаты в формате evaluate_password
+    """
+    return _default_policy(estimate).batch_to_dicts(passwords, columns)
+
+
+# ==========================================
+# СВОДКА ПО ПАКЕТУ - без результатов по каждому паролю
+# ==========================================
+
+# Имена битов маски провалов (Policy.failed_rules) в сводке
+FAILED_RULE_NAMES = [
+    (RULE_LENGTH, "min_length"),
+    (RULE_DIGITS, "digits"),
+    (RULE_UPPERCASE, "uppercase"),
+    (RULE_LOWERCASE, "lowercase"),
+    (RULE_SPECIAL, "special"),
+    (RULE_NOT_COMMON, "not_common"),
+    (RULE_WORD_BASED, "word_based"),
+    (RULE_GUESSES, "guessability"),
+]
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class BatchSummary:
+    """
+    Сводка по пакету: число паролей по уровням, гистограмма баллов и
+    число провалов по каждому правилу.
+    
+    Размер сводки не зависит от числа паролей. Баллы - целые от 0 до
+    max_score, поэтому квантили по гистограмме точные. Сводки порций
+    складываются (merge), так что пакет можно считать по частям в пуле.
+    """
+    
+    __slots__ = ("policy", "strengths", "scores", "failed")
+    
+    def __init__(self, policy: Policy):
+        self.policy = policy
+        self.strengths = [0] * len(STRENGTH_LEVELS)
+        self.scores = [0] * (policy.max_score + 1)
+        self.failed = [0] * len(FAILED_RULE_NAMES)
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, object], policy: Policy,
+                     weights: Optional[Sequence[int]] = None) -> "BatchSummary":
+        """
+        Сводка по столбцам evaluate_batch этой политики.
+        
+        Args:
+            weights: Сколько раз встречается каждый пароль (режим --dedup);
+                None - каждый пароль считается один раз
+        """
+        summary = cls(policy)
+        failed = policy.failed_rules(columns)
+        if np is not None and not isinstance(failed, list):
+            if weights is None:
+                summary.strengths = np.bincount(
+                    columns["strength"], minlength=len(summary.strengths)).tolist()
+                summary.scores = np.bincount(
+                    columns["score"], minlength=len(summary.scores)).tolist()
+                summary.failed = [
+                    int(np.count_nonzero(failed & bit)) for bit, _ in FAILED_RULE_NAMES
+                ]
+                return summary
+            weights = np.asarray(weights, dtype=np.int64)
+            summary.strengths = np.bincount(
+                columns["strength"], weights, len(summary.strengths)).astype(np.int64).tolist()
+            summary.scores = np.bincount(
+                columns["score"], weights, len(summary.scores)).astype(np.int64).tolist()
+            summary.failed = [int(weights[(failed & bit) != 0].sum()) for bit, _ in FAILED_RULE_NAMES]
+            return summary
+        
+        if weights is None:
+            weights = [1] * len(failed)
+        for level, weight in zip(columns["strength"], weights, strict=True):
+            summary.strengths[level] += weight
+        for score, weight in zip(columns["score"], weights, strict=True):
+            summary.scores[score] += weight
+        for mask, weight in zip(failed, weights, strict=True):
+            if mask:
+                for i, (bit, _) in enumerate(FAILED_RULE_NAMES):
+                    if mask & bit:
+                        summary.failed[i] += weight
+        return summary
+    
+    @property
+    def total(self) -> int:
+        return sum(self.strengths)
+    
+    def merge(self, other: "BatchSummary"):
+        """Добавляет сводку другой порции той же политики."""
+        for mine, theirs in ((self.strengths, other.strengths),
+                             (self.scores, other.scores),
+                             (self.failed, other.failed)):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+    
+    def quantile(self, fraction: float) -> int:
+        """Балл, не больше которого fraction паролей (ближайший ранг)."""
+        target = max(1, math.ceil(fraction * self.total))
+        seen = 0
+        for score, count in enumerate(self.scores):
+            seen += count
+            if seen >= target:
+                return score
+        return 0
+    
+    def to_dict(self) -> Dict[str, object]:
+        """Сводка для ответа API: уровни, статистика баллов, провалы правил."""
+        total = self.total
+        present = [score for score, count in enumerate(self.scores) if count]
+        score_stats = {
+            "mean": round(sum(score * count for score, count in enumerate(self.scores))
+                          / total, 2) if total else 0.0,
+            "min": present[0] if present else 0,
+            "max": present[-1] if present else 0,
+        }
+        for fraction in SUMMARY_QUANTILES:
+            score_stats[f"p{fraction * 100:g}"] = self.quantile(fraction) if total else 0
+        # Только правила политики: выключенные не проваливаются
+        reported = self.policy.rules | RULE_WORD_BASED
+        if self.policy.estimate:
+            reported |= RULE_GUESSES
+        return {
+            "max_score": self.policy.max_score,
+            "strength_histogram": dict(zip(STRENGTH_LEVELS, self.strengths, strict=True)),
+            "score": score_stats,
+            "failed_rules": {
+                name: count
+                for (bit, name), count in zip(FAILED_RULE_NAMES, self.failed, strict=True)
+                if reported & bit
+            },
+        }
+
+
 # ==========================================
 # ТЕСТИРОВАНИЕ - проверяем, что все работает
 # ==========================================
@@ -212,7 +1349,7 @@ if __name__ == "__main__":
         print(f"\n Проверяем пароль: '{pwd}'")
         result = evaluate_password(pwd)
         
-        print(f"   Балл: {result['score']}/100")
+        print(f"   Балл: {result['score']}/{result['max_score']}")
         print(f"   Уровень: {result['strength']}")
         
         # Показываем детали
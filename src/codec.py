@@ -0,0 +1,136 @@
+"""
+Компактные бинарные форматы пакетной проверки.
+
+Для сервисов, которые шлют сотни тысяч паролей: вместо JSON
+(BatchRequest / BatchResult) - MessagePack или поток кадров с длиной.
+
+Запрос:
+    application/msgpack - массив строк или {"passwords": [...]}
+    application/x-password-frames - кадры подряд: длина (uint32,
+        сетевой порядок байт) и пароль в UTF-8
+
+Ответ - по одному байту на пароль в трех столбцах: балл, код уровня
+(индекс в STRENGTH_LEVELS) и маска непройденных правил
+(Policy.failed_rules, биты RULE_*):
+    application/msgpack - {"max_score", "total_count", "strong_count",
+        "weak_count", "scores", "strengths", "failed"}, столбцы - bin
+    application/x-password-frames - заголовок (uint32 число паролей,
+        uint16 максимальный балл, uint32 сильных, uint32 слабых,
+        сетевой порядок байт), затем столбцы scores, strengths, failed
+"""
+
+import struct
+from typing import List, Sequence
+
+try:
+    import msgpack  # Необязательная зависимость
+except ImportError:
+    msgpack = None
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+FRAMES_TYPE = "application/x-password-frames"
+BINARY_TYPES = MSGPACK_TYPES + (FRAMES_TYPE,)
+
+FRAME_LENGTH = struct.Struct("!I")
+FRAMES_HEADER = struct.Struct("!IHII")
+
+
+def is_supported(content_type: str) -> bool:
+    """Формат можно разобрать (для MessagePack нужен пакет msgpack)."""
+    if content_type in MSGPACK_TYPES:
+        return msgpack is not None
+    return content_type == FRAMES_TYPE
+
+
+def encode_frames(passwords: Sequence[str]) -> bytes:
+    """Кодирует пароли потоком кадров (для клиентов и тестов)."""
+    parts = []
+    for password in passwords:
+        data = password.encode("utf-8")
+        parts.append(FRAME_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def decode_frames(data: bytes, max_bytes: int) -> List[str]:
+    """
+    Разбирает поток кадров.
+
+    Args:
+        data (bytes): Тело запроса
+        max_bytes (int): Наибольшая допустимая длина кадра
+
+    Raises:
+        ValueError: Обрезанный или слишком длинный кадр, не UTF-8
+    """
+    passwords = []
+    view = memoryview(data)
+    offset = 0
+    size = len(data)
+    while offset < size:
+        if offset + FRAME_LENGTH.size > size:
+            raise ValueError("обрезанная длина кадра")
+        (length,) = FRAME_LENGTH.unpack_from(view, offset)
+        offset += FRAME_LENGTH.size
+        if length > max_bytes:
+            raise ValueError(f"кадр длиннее {max_bytes} байт")
+        if offset + length > size:
+            raise ValueError("обрезанный кадр")
+        passwords.append(str(view[offset:offset + length], "utf-8"))
+        offset += length
+    return passwords
+
+
+def decode_msgpack(data: bytes) -> List[str]:
+    """
+    Разбирает запрос MessagePack: массив строк или {"passwords": [...]}.
+
+    Raises:
+        ValueError: Некорректный MessagePack или не список строк
+    """
+    try:
+        payload = msgpack.unpackb(data, raw=False)
+    except Exception as e:
+        raise ValueError(f"некорректный MessagePack: {e}") from e
+    if isinstance(payload, dict):
+        payload = payload.get("passwords")
+    if not isinstance(payload, list) or not all(isinstance(p, str) for p in payload):
+        raise ValueError("ожидается список строк или {\"passwords\": [...]}")
+    return payload
+
+
+def decode_passwords(data: bytes, content_type: str, max_length: int) -> List[str]:
+    """Пароли из тела запроса в бинарном формате content_type."""
+    if content_type == FRAMES_TYPE:
+        # В UTF-8 символ занимает не больше 4 байт
+        return decode_frames(data, max_length * 4)
+    return decode_msgpack(data)
+
+
+def column_bytes(column) -> bytes:
+    """Столбец значений 0..255 (список или массив NumPy) в байтах."""
+    if hasattr(column, "astype"):
+        return column.astype("uint8").tobytes()
+    return bytes(column)
+
+
+def encode_results(content_type: str, max_score: int, scores: bytes, strengths: bytes,
+                   failed: bytes, strong_count: int, weak_count: int) -> bytes:
+    """
+    Ответ в бинарном формате content_type.
+
+    Args:
+        scores, strengths, failed: Столбцы по байту на пароль (column_bytes)
+    """
+    if content_type == FRAMES_TYPE:
+        header = FRAMES_HEADER.pack(len(scores), max_score, strong_count, weak_count)
+        return b"".join((header, scores, strengths, failed))
+    return msgpack.packb({
+        "max_score": max_score,
+        "total_count": len(scores),
+        "strong_count": strong_count,
+        "weak_count": weak_count,
+        "scores": scores,
+        "strengths": strengths,
+        "failed": failed,
+    })
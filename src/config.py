@@ -1,29 +1,102 @@
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional
 
 
-def load_config() -> Dict[str, Any]:
+def read_env_file(path: str) -> Dict[str, str]:
+    """
+    Читает файл настроек в формате .env (KEY=VALUE, # - комментарий).
+    
+    Args:
+        path (str): Путь к файлу
+        
+    Returns:
+        Dict[str, str]: Переменные из файла
+    """
+    values = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            name, value = line.split("=", 1)
+            values[name.strip()] = value.strip().strip("\"'")
+    return values
+
+
+def load_config(environ: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
     """
     Загружает конфигурацию приложения.
     
+    Настройки берутся из переменных окружения; если задан POLICY_FILE,
+    значения из этого файла имеют приоритет над окружением.
+    
+    Args:
+        environ: Переменные окружения (по умолчанию os.environ)
+        
     Returns:
         Dict[str, Any]: Словарь с настройками
     """
+    env = dict(os.environ if environ is None else environ)
+    policy_file = env.get("POLICY_FILE", "")
+    if policy_file:
+        env.update(read_env_file(policy_file))
+    
     return {
         # Настройки проверки паролей
-        "min_password_length": int(os.getenv("MIN_PASSWORD_LENGTH", "8")),
-        "require_digits": os.getenv("REQUIRE_DIGITS", "true").lower() == "true",
-        "require_uppercase": os.getenv("REQUIRE_UPPERCASE", "true").lower() == "true",
-        "require_lowercase": os.getenv("REQUIRE_LOWERCASE", "true").lower() == "true",
-        "require_special_chars": os.getenv("REQUIRE_SPECIAL_CHARS", "true").lower() == "true",
+        "min_password_length": int(env.get("MIN_PASSWORD_LENGTH", "8")),
+        "require_digits": env.get("REQUIRE_DIGITS", "true").lower() == "true",
+        "require_uppercase": env.get("REQUIRE_UPPERCASE", "true").lower() == "true",
+        "require_lowercase": env.get("REQUIRE_LOWERCASE", "true").lower() == "true",
+        "require_special_chars": env.get("REQUIRE_SPECIAL_CHARS", "true").lower() == "true",
+        # Оценка числа попыток подбора (estimator.py) как дополнительное правило
+        "guess_estimator_enabled": env.get("GUESS_ESTIMATOR_ENABLED", "false").lower() == "true",
+        # Индекс блок-листа утекших паролей (python src/blocklist.py)
+        "blocklist_path": env.get("BLOCKLIST_PATH", ""),
+        # Автомат поиска словарных слов внутри пароля (python src/wordmatch.py)
+        "word_matcher_path": env.get("WORD_MATCHER_PATH", ""),
+        # Файл с настройками политики (формат .env): при его изменении или
+        # по сигналу SIGHUP политика перезагружается без перезапуска
+        "policy_file": policy_file,
+        "policy_reload_interval": float(env.get("POLICY_RELOAD_INTERVAL", "2")),
         
         # Настройки приложения
-        "debug": os.getenv("DEBUG", "false").lower() == "true",
-        "log_level": os.getenv("LOG_LEVEL", "INFO"),
+        "debug": env.get("DEBUG", "false").lower() == "true",
+        "log_level": env.get("LOG_LEVEL", "INFO"),
         
         # Настройки API
-        "api_host": os.getenv("API_HOST", "0.0.0.0"),
-        "api_port": int(os.getenv("API_PORT", "8000")),
+        "api_host": env.get("API_HOST", "0.0.0.0"),
+        "api_port": int(env.get("API_PORT", "8000")),
+        # Число процессов uvicorn; индексы (блок-лист, автомат слов)
+        # открываются через mmap и делятся между ними
+        "api_workers": int(env.get("API_WORKERS", "1")),
+        
+        # Пакетная проверка в API: пул ("thread" или "process"),
+        # число воркеров пула и размер порции, отправляемой в пул
+        "api_executor": env.get("API_EXECUTOR", "thread"),
+        "api_executor_workers": int(env.get("API_EXECUTOR_WORKERS", "4")),
+        "batch_chunk_size": int(env.get("BATCH_CHUNK_SIZE", "1000")),
+        
+        # Ограничение нагрузки: одновременно выполняемые запросы и очередь
+        # для /check и для пакетов; при полной очереди - 503 с Retry-After
+        "admission_enabled": env.get("ADMISSION_ENABLED", "true").lower() == "true",
+        "admission_single_limit": int(env.get("ADMISSION_SINGLE_LIMIT", "256")),
+        "admission_single_queue": int(env.get("ADMISSION_SINGLE_QUEUE", "1024")),
+        "admission_batch_limit": int(env.get("ADMISSION_BATCH_LIMIT", "4")),
+        "admission_batch_queue": int(env.get("ADMISSION_BATCH_QUEUE", "16")),
+        "admission_queue_timeout": float(env.get("ADMISSION_QUEUE_TIMEOUT", "1")),
+        "admission_retry_after": int(env.get("ADMISSION_RETRY_AFTER", "1")),
+        
+        # Кэш результатов проверки (ключ - солёный хэш, не сам пароль)
+        "result_cache_enabled": env.get("RESULT_CACHE_ENABLED", "false").lower() == "true",
+        "result_cache_size": int(env.get("RESULT_CACHE_SIZE", "10000")),
+        "result_cache_ttl": float(env.get("RESULT_CACHE_TTL", "300")),
+        
+        # Метрики в формате Prometheus (GET /metrics)
+        "metrics_enabled": env.get("METRICS_ENABLED", "true").lower() == "true",
+        
+        # Ограничения на размер запросов
+        "max_batch_size": int(env.get("MAX_BATCH_SIZE", "10000")),
+        "max_password_length": int(env.get("MAX_PASSWORD_LENGTH", "1024")),
     }
 
 
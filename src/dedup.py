@@ -0,0 +1,150 @@
+"""
+Подсчет повторов паролей перед проверкой (режим --dedup).
+
+В дампах утечек одни и те же пароли повторяются миллионы раз, поэтому
+выгоднее сначала сосчитать, сколько раз встречается каждый пароль, и
+оценить каждый уникальный пароль ровно один раз.
+
+Пока уникальных паролей не больше max_unique, они считаются в словаре
+в памяти. Дальше словарь выгружается на диск в partitions файлов-корзин
+по хэшу пароля (строки "число<TAB>пароль") и очищается. Одинаковые
+пароли всегда попадают в одну корзину, поэтому в конце каждая корзина
+досчитывается отдельно, а корзина, которая все равно не помещается
+в память, делится еще раз - по другим битам хэша.
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Сколько уникальных паролей держать в памяти до выгрузки на диск
+DEDUP_MAX_UNIQUE = 1_000_000
+# Число корзин на каждом уровне деления (не больше 256 - по байту хэша)
+DEDUP_PARTITIONS = 64
+# Сколько раз корзину можно делить повторно (каждый раз - следующий байт хэша)
+MAX_SPLIT_LEVEL = 3
+
+
+def _read_bucket(path: str) -> Iterator[Tuple[str, int]]:
+    with open(path, "r", encoding="utf-8", errors="surrogatepass", newline="\n") as file:
+        for line in file:
+            count, password = line[:-1].split("\t", 1)
+            yield password, int(count)
+
+
+class PasswordCounter:
+    """
+    Счетчик повторов паролей с выгрузкой на диск (см. описание модуля).
+
+    Хэш - встроенный hash() строки: он одинаков в пределах процесса,
+    а корзины живут только до конца подсчета. Временные файлы
+    удаляются в close() (или при выходе из with).
+    """
+
+    def __init__(self, max_unique: int = DEDUP_MAX_UNIQUE,
+                 partitions: int = DEDUP_PARTITIONS, spill_dir: Optional[str] = None):
+        if not 1 < partitions <= 256:
+            raise ValueError("partitions: ожидается от 2 до 256")
+        self.max_unique = max(1, max_unique)
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.total = 0
+        self.spills = 0
+        self._counts: Dict[str, int] = {}
+        self._tempdir: Optional[str] = None
+        self._buckets: Optional[List[TextIO]] = None
+        self._paths: List[str] = []
+        self._splits = 0
+
+    def __enter__(self) -> "PasswordCounter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def update(self, passwords: Iterable[str]):
+        """Учитывает пароли (по одному повтору на каждый)."""
+        counts = self._counts
+        get = counts.get
+        limit = self.max_unique
+        total = 0
+        for password in passwords:
+            counts[password] = get(password, 0) + 1
+            total += 1
+            if len(counts) > limit:
+                self._spill()
+        self.total += total
+
+    def _bucket_paths(self, level: int) -> List[str]:
+        if self._tempdir is None:
+            self._tempdir = tempfile.mkdtemp(prefix="password-dedup-", dir=self.spill_dir)
+        self._splits += 1
+        prefix = os.path.join(self._tempdir, f"{level}-{self._splits}")
+        return [f"{prefix}-{i}" for i in range(self.partitions)]
+
+    def _partition(self, pairs: Iterable[Tuple[str, int]], files: List[TextIO], level: int):
+        shift = 8 * level
+        partitions = self.partitions
+        for password, count in pairs:
+            files[(hash(password) >> shift) % partitions].write(f"{count}\t{password}\n")
+
+    def _spill(self):
+        """Выгружает словарь в корзины первого уровня."""
+        if self._buckets is None:
+            self._paths = self._bucket_paths(0)
+            self._buckets = [
+                open(path, "w", encoding="utf-8", errors="surrogatepass", newline="\n") for path in self._paths
+            ]
+        self._partition(self._counts.items(), self._buckets, 0)
+        self._counts.clear()
+        self.spills += 1
+
+    def _aggregate(self, path: str, level: int) -> Iterator[Tuple[str, int]]:
+        """Досчитывает корзину; слишком большую сначала делит заново."""
+        counts: Dict[str, int] = {}
+        get = counts.get
+        for password, count in _read_bucket(path):
+            counts[password] = get(password, 0) + count
+            if len(counts) > self.max_unique and level < MAX_SPLIT_LEVEL:
+                break
+        else:
+            os.remove(path)
+            yield from counts.items()
+            return
+
+        counts.clear()
+        paths = self._bucket_paths(level + 1)
+        files = [open(sub, "w", encoding="utf-8", errors="surrogatepass", newline="\n") for sub in paths]
+        try:
+            self._partition(_read_bucket(path), files, level + 1)
+        finally:
+            for file in files:
+                file.close()
+        os.remove(path)
+        for sub in paths:
+            yield from self._aggregate(sub, level + 1)
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        """
+        Уникальные пароли и число их повторов (вызывается один раз,
+        после всех update). Порядок: без выгрузки - порядок первого
+        появления, с выгрузкой - по корзинам.
+        """
+        if self._buckets is None:
+            yield from self._counts.items()
+            return
+        self._spill()
+        for file in self._buckets:
+            file.close()
+        for path in self._paths:
+            yield from self._aggregate(path, 0)
+
+    def close(self):
+        """Удаляет временные файлы."""
+        if self._buckets is not None:
+            for file in self._buckets:
+                file.close()
+        if self._tempdir is not None:
+            shutil.rmtree(self._tempdir, ignore_errors=True)
+            self._tempdir = None
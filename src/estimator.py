@@ -0,0 +1,577 @@
+"""
+Оценка стойкости пароля по числу попыток подбора.
+
+Аддитивные баллы checker.py считают "Password1!" очень сильным паролем,
+хотя он подбирается за секунды. Здесь пароль раскладывается на шаблоны,
+которые перебирают реальные атакующие:
+
+* слова из словарей (с учетом регистра, l33t-замен и обратного порядка);
+* проходы по клавиатуре (qwerty, цифровой блок);
+* последовательности (abc, 4321) и повторы (aaa, abcabc);
+* годы и даты.
+
+Затем динамическим программированием выбирается разложение с наименьшим
+числом попыток (подход zxcvbn). Словари, таблицы замен и графы соседства
+клавиш строятся один раз при импорте, поиск шаблонов линеен по длине
+пароля (длина слова в словаре ограничена).
+"""
+
+import math
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from wordmatch import get_word_matcher, l33t_variants, lower_keep_length
+
+# Анализируем не больше этого числа символов - хвост считается перебором
+# (в логарифмах, см. estimate_guesses). Поиск разложения растет примерно
+# как куб длины, поэтому префикс короче, чем в zxcvbn
+MAX_ANALYZED_LENGTH = 64
+# Ограничения поиска разложения на каждую позицию: сколько вариантов
+# (по числу шаблонов) хранить и от скольких последних концов шаблонов
+# начинать участок перебора. Без них пароль из одного повторяющегося
+# символа перебирает все пары позиций
+MAX_SEQUENCE_CANDIDATES = 8
+MAX_BRUTEFORCE_STARTS = 8
+
+# Константы модели подбора (как в zxcvbn)
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MIN_YEAR_SPACE = 20
+REFERENCE_YEAR = 2026
+
+# Границы уровней 0..4 по числу попыток
+SCORE_THRESHOLDS = [1e3, 1e6, 1e8, 1e10]
+
+
+# ==========================================
+# СЛОВАРИ - ранжированы по частоте
+# ==========================================
+
+_PASSWORDS = """
+123456 password 12345678 qwerty 123456789 12345 1234 111111 1234567 dragon
+123123 baseball abc123 football monkey letmein shadow master 666666 qwertyuiop
+123321 mustang 1234567890 michael 654321 superman 1qaz2wsx 7777777 121212
+000000 qazwsx 123qwe killer trustno1 jordan jennifer zxcvbnm asdfgh hunter
+buster soccer harley batman andrew tigger sunshine iloveyou 2000 charlie
+robert thomas hockey ranger daniel starwars klaster 112233 george computer
+michelle jessica pepper 1111 zxcvbn 555555 11111111 131313 freedom 777777
+pass maggie 159753 aaaaaa ginger princess joshua cheese amanda summer love
+ashley nicole chelsea biteme matthew access yankees 987654321 dallas austin
+thunder taylor matrix admin welcome login passw0rd solo qwerty123 monday
+"""
+
+_ENGLISH = """
+the of and to in is you that it he was for on are as with his they at be
+this have from or one had by word but not what all were we when your can
+said there use an each which she do how their if will up other about out
+many then them these so some her would make like him into time has look two
+more write go see number no way could people my than first water been call
+who oil its now find long down day did get come made may part over new sound
+take only little work know place year live me back give most very after
+thing our just name good sentence man think say great where help through
+much before line right too mean old any same tell boy follow came want show
+also around form three small set put end does another well large must big
+even such because turn here why ask went men read need land different home
+us move try kind hand picture again change off play spell air away animal
+house point page letter mother answer found study still learn should world
+secret summer winter spring autumn sun moon star happy lucky money power
+super magic angel devil heaven hello dream heart flower orange purple silver
+golden black white green yellow blue red pink cookie coffee cat dog bear
+tiger lion eagle wolf dragon fire water earth wind storm ninja pirate
+"""
+
+_NAMES = """
+james john robert michael william david richard joseph thomas charles
+christopher daniel matthew anthony mark donald steven paul andrew joshua
+mary patricia jennifer linda elizabeth barbara susan jessica sarah karen
+nancy lisa betty margaret sandra ashley kimberly emily donna michelle
+alex anna maria olga elena natasha ivan dmitriy sergey andrey alexey
+"""
+
+
+def _build_ranked(*word_lists: str) -> Dict[str, int]:
+    """Объединяет словари: слово -> лучший (наименьший) ранг."""
+    ranked: Dict[str, int] = {}
+    for words in word_lists:
+        for rank, word in enumerate(words.split(), 1):
+            if word not in ranked or rank < ranked[word]:
+                ranked[word] = rank
+    return ranked
+
+
+RANKED_DICTIONARY = _build_ranked(_PASSWORDS, _ENGLISH, _NAMES)
+_MAX_WORD_LENGTH = max(map(len, RANKED_DICTIONARY))
+
+
+# ==========================================
+# ГРАФЫ СОСЕДСТВА КЛАВИШ
+# ==========================================
+
+_QWERTY = """
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+
+    qQ wW eE rR tT yY uU iI oO pP [{ ]} \\|
+     aA sS dD fF gG hH jJ kK lL ;: '"
+      zZ xX cC vV bB nN mM ,< .> /?
+"""
+
+_KEYPAD = """
+  / * -
+7 8 9 +
+4 5 6
+1 2 3
+  0 .
+"""
+
+
+def _build_adjacency(layout: str, slanted: bool) -> Dict[str, List[Optional[str]]]:
+    """
+    Строит граф соседства клавиш по текстовой раскладке.
+
+    Returns:
+        Dict[str, List[Optional[str]]]: символ -> клавиши-соседи по
+            направлениям (None, если соседа нет)
+    """
+    positions: Dict[Tuple[int, int], str] = {}
+    token_size = None
+    for y, line in enumerate(layout.strip("\n").split("\n")):
+        slant = y - 1 if slanted else 0
+        for token in line.split():
+            token_size = token_size or len(token) + 1
+            x = (line.index(token) - slant) // token_size
+            positions[(x, y)] = token
+
+    if slanted:
+        deltas = [(-1, 0), (0, -1), (1, -1), (1, 0), (0, 1), (-1, 1)]
+    else:
+        deltas = [(-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1)]
+
+    graph: Dict[str, List[Optional[str]]] = {}
+    for (x, y), token in positions.items():
+        neighbours = [positions.get((x + dx, y + dy)) for dx, dy in deltas]
+        for char in token:
+            graph[char] = neighbours
+    return graph
+
+
+ADJACENCY_GRAPHS = {
+    "qwerty": _build_adjacency(_QWERTY, slanted=True),
+    "keypad": _build_adjacency(_KEYPAD, slanted=False),
+}
+
+
+def _graph_stats(graph: Dict[str, List[Optional[str]]]) -> Tuple[int, float]:
+    """Число клавиш и средняя степень вершины графа."""
+    keys = set(graph)
+    degrees = [sum(1 for n in graph[char] if n) for char in keys]
+    return len(keys), sum(degrees) / len(degrees)
+
+
+_GRAPH_STATS = {name: _graph_stats(graph) for name, graph in ADJACENCY_GRAPHS.items()}
+
+# Символы, набираемые с Shift (второй символ клавиши qwerty)
+_QWERTY_SHIFTED = frozenset(token[1] for token in _QWERTY.split())
+
+
+# ==========================================
+# ПОИСК ШАБЛОНОВ
+# ==========================================
+
+def _n_choose_k(n: int, k: int) -> int:
+    return math.comb(n, k) if 0 <= k <= n else 0
+
+
+def _uppercase_variations(token: str) -> int:
+    """Сколько вариантов регистра перебирает атакующий для слова."""
+    if token.islower() or not any(c.isalpha() for c in token):
+        return 1
+    if token.isupper() or (token[0].isupper() and token[1:].islower()) or \
+            (token[-1].isupper() and token[:-1].islower()):
+        return 2
+    upper = sum(1 for c in token if c.isupper())
+    lower = sum(1 for c in token if c.islower())
+    return sum(_n_choose_k(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def _l33t_variations(token: str, table: Dict[str, str]) -> int:
+    """Сколько вариантов l33t-замен перебирает атакующий для слова."""
+    variations = 1
+    lowered = token.lower()
+    for subbed, letter in table.items():
+        subs = lowered.count(subbed)
+        if not subs:
+            continue
+        unsubs = lowered.count(letter)
+        if not unsubs:
+            variations *= 2
+        else:
+            variations *= sum(
+                _n_choose_k(subs + unsubs, i) for i in range(1, min(subs, unsubs) + 1)
+            )
+    return variations
+
+
+def _dictionary_matches(password: str) -> List[dict]:
+    """Слова словаря: как есть, задом наперед и после l33t-замен."""
+    matches = []
+    lowered = lower_keep_length(password)
+    variants = l33t_variants(lowered)
+    reversed_lowered = lowered[::-1]
+    n = len(password)
+
+    for i in range(n):
+        for j in range(i + 2, min(n, i + _MAX_WORD_LENGTH)):
+            token = password[i:j + 1]
+            for text, table in variants:
+                rank = RANKED_DICTIONARY.get(text[i:j + 1])
+                if rank is None or (table is not None and text[i:j + 1] == lowered[i:j + 1]):
+                    continue
+                guesses = rank * _uppercase_variations(token)
+                pattern = "dictionary"
+                if table is not None:
+                    guesses *= _l33t_variations(token, table)
+                    pattern = "l33t"
+                matches.append({"pattern": pattern, "i": i, "j": j,
+                                "token": token, "guesses": guesses})
+            # Слово задом наперед
+            rank = RANKED_DICTIONARY.get(reversed_lowered[n - 1 - j:n - i])
+            if rank is not None and j > i + 1:
+                matches.append({"pattern": "reversed", "i": i, "j": j, "token": token,
+                                "guesses": rank * _uppercase_variations(token) * 2})
+
+    # Большой словарь из автомата Ахо-Корасик (wordmatch.py), если подключен
+    matcher = get_word_matcher()
+    if matcher is not None:
+        for text, table in variants:
+            for i, j, rank in matcher.iter_matches(text):
+                if table is not None and text[i:j + 1] == lowered[i:j + 1]:
+                    continue
+                token = password[i:j + 1]
+                guesses = rank * _uppercase_variations(token)
+                pattern = "dictionary"
+                if table is not None:
+                    guesses *= _l33t_variations(token, table)
+                    pattern = "l33t"
+                matches.append({"pattern": pattern, "i": i, "j": j,
+                                "token": token, "guesses": guesses})
+    return matches
+
+
+def _spatial_matches(password: str) -> List[dict]:
+    """Проходы по соседним клавишам длиной от 3 символов."""
+    matches = []
+    n = len(password)
+    for name, graph in ADJACENCY_GRAPHS.items():
+        keys, degree = _GRAPH_STATS[name]
+        i = 0
+        while i < n - 2:
+            j = i + 1
+            turns = 0
+            shifted = 0
+            last_direction = None
+            if name == "qwerty" and password[i] in _QWERTY_SHIFTED:
+                shifted = 1
+            while j < n:
+                neighbours = graph.get(password[j - 1])
+                direction = None
+                if neighbours:
+                    for index, neighbour in enumerate(neighbours):
+                        if neighbour and password[j] in neighbour:
+                            direction = index
+                            if neighbour.index(password[j]) == 1:
+                                shifted += 1
+                            break
+                if direction is None:
+                    break
+                if direction != last_direction:
+                    turns += 1
+                    last_direction = direction
+                j += 1
+            if j - i >= 3:
+                matches.append({
+                    "pattern": "spatial", "i": i, "j": j - 1,
+                    "token": password[i:j],
+                    "guesses": _spatial_guesses(j - i, turns, shifted, keys, degree),
+                })
+            i = j
+    return matches
+
+
+def _spatial_guesses(length: int, turns: int, shifted: int, keys: int,
+                     degree: float) -> float:
+    guesses = 0.0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += _n_choose_k(i - 1, j - 1) * keys * degree ** j
+    if shifted:
+        unshifted = length - shifted
+        if not unshifted:
+            guesses *= 2
+        else:
+            guesses *= sum(
+                _n_choose_k(shifted + unshifted, i)
+                for i in range(1, min(shifted, unshifted) + 1)
+            )
+    return guesses
+
+
+def _sequence_matches(password: str) -> List[dict]:
+    """Последовательности с постоянным шагом: abc, 2468, zyx."""
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        delta = ord(password[i + 1]) - ord(password[i])
+        j = i + 1
+        if 1 <= abs(delta) <= 5:
+            while j + 1 < n and ord(password[j + 1]) - ord(password[j]) == delta:
+                j += 1
+        if j - i >= 2:
+            token = password[i:j + 1]
+            first = token[0]
+            if first in "aAzZ019":
+                base = 4
+            elif first.isdigit():
+                base = 10
+            else:
+                base = 26
+            if delta < 0:
+                base *= 2
+            matches.append({"pattern": "sequence", "i": i, "j": j,
+                            "token": token, "guesses": base * len(token)})
+            i = j
+        else:
+            i += 1
+    return matches
+
+
+_GREEDY_REPEAT = re.compile(r"(.+)\1+", re.DOTALL)
+_LAZY_REPEAT = re.compile(r"(.+?)\1+", re.DOTALL)
+_LAZY_ANCHORED = re.compile(r"^(.+?)\1+$", re.DOTALL)
+
+
+def _repeat_matches(password: str) -> List[dict]:
+    """Повторы фрагмента: aaa, abcabc."""
+    matches = []
+    start = 0
+    n = len(password)
+    while start < n:
+        greedy = _GREEDY_REPEAT.search(password, start)
+        if not greedy:
+            break
+        lazy = _LAZY_REPEAT.search(password, start)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            match = greedy
+            base = _LAZY_ANCHORED.match(match.group(0)).group(1)
+        else:
+            match = lazy
+            base = match.group(1)
+        token = match.group(0)
+        repeat_count = len(token) // len(base)
+        base_guesses = _estimate(base)["guesses"]
+        matches.append({"pattern": "repeat", "i": match.start(), "j": match.end() - 1,
+                        "token": token, "guesses": base_guesses * repeat_count})
+        start = match.end()
+    return matches
+
+
+_YEAR = re.compile(r"19\d\d|20\d\d")
+_DATE_WITH_SEPARATOR = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})")
+_DIGITS = re.compile(r"\d{4,8}")
+
+
+def _year_guesses(year: int) -> float:
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+
+def _valid_date(first: int, second: int, third: int) -> Optional[int]:
+    """Возвращает год, если три числа образуют правдоподобную дату."""
+    for year, a, b in ((third, first, second), (first, second, third)):
+        if year < 100:
+            year += 1900 if year > 50 else 2000
+        if not 1000 <= year <= 2050:
+            continue
+        for day, month in ((a, b), (b, a)):
+            if 1 <= day <= 31 and 1 <= month <= 12:
+                return year
+    return None
+
+
+def _date_matches(password: str) -> List[dict]:
+    """Годы и даты (с разделителями и без)."""
+    matches = []
+    for match in _YEAR.finditer(password):
+        matches.append({"pattern": "year", "i": match.start(), "j": match.end() - 1,
+                        "token": match.group(0),
+                        "guesses": _year_guesses(int(match.group(0)))})
+
+    for match in _DATE_WITH_SEPARATOR.finditer(password):
+        year = _valid_date(int(match.group(1)), int(match.group(3)), int(match.group(4)))
+        if year is not None:
+            matches.append({"pattern": "date", "i": match.start(), "j": match.end() - 1,
+                            "token": match.group(0),
+                            "guesses": _year_guesses(year) * 365 * 4})
+
+    n = len(password)
+    for i in range(n):
+        for length in (6, 8):
+            token = password[i:i + length]
+            if len(token) != length or not token.isdigit():
+                continue
+            if length == 6:
+                splits = [(token[:2], token[2:4], token[4:])]
+            else:
+                splits = [(token[:2], token[2:4], token[4:]), (token[:4], token[4:6], token[6:])]
+            for first, second, third in splits:
+                year = _valid_date(int(first), int(second), int(third))
+                if year is not None:
+                    matches.append({"pattern": "date", "i": i, "j": i + length - 1,
+                                    "token": token, "guesses": _year_guesses(year) * 365})
+                    break
+    return matches
+
+
+def _omnimatch(password: str) -> List[dict]:
+    return (
+        _dictionary_matches(password)
+        + _spatial_matches(password)
+        + _sequence_matches(password)
+        + _repeat_matches(password)
+        + _date_matches(password)
+    )
+
+
+# ==========================================
+# ВЫБОР РАЗЛОЖЕНИЯ С МИНИМУМОМ ПОПЫТОК
+# ==========================================
+
+def _bruteforce_guesses(length: int) -> float:
+    guesses = float(BRUTEFORCE_CARDINALITY) ** length
+    minimum = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if length == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+    return max(guesses, minimum + 1)
+
+
+def _match_guesses(match: dict, password_length: int) -> float:
+    if len(match["token"]) < password_length:
+        minimum = (MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(match["token"]) == 1
+                   else MIN_SUBMATCH_GUESSES_MULTI_CHAR)
+        return max(match["guesses"], minimum)
+    return max(match["guesses"], 1)
+
+
+def _estimate(password: str) -> dict:
+    """
+    Находит разложение пароля с минимальным числом попыток.
+
+    optimal[k][l] - лучшее число попыток для префикса password[:k + 1],
+    разложенного на l шаблонов; итог штрафуется l! (порядок шаблонов)
+    и MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1).
+    """
+    n = len(password)
+    if not n:
+        return {"guesses": 1.0, "sequence": []}
+
+    by_end: List[List[dict]] = [[] for _ in range(n)]
+    for match in _omnimatch(password):
+        match["guesses"] = _match_guesses(match, n)
+        by_end[match["j"]].append(match)
+
+    factorials = [math.factorial(length) for length in range(n + 2)]
+    penalties = [MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (length - 1) if length else 0
+                 for length in range(n + 2)]
+
+    # best[k]: {l: (g, pi, match, i)} - лучшие варианты для префикса до k,
+    # i - начало последнего шаблона; match = None означает участок
+    # перебора (словарь для него создается только при восстановлении)
+    best: List[Dict[int, Tuple[float, float, Optional[dict], int]]] = [{} for _ in range(n)]
+
+    def update(i: int, k: int, guesses: float, length: int, match: Optional[dict]):
+        pi = guesses
+        if length > 1:
+            pi *= best[i - 1][length - 1][1]
+        g = factorials[length] * pi + penalties[length]
+        # Вариант хуже, если есть более короткое разложение не хуже по попыткам
+        candidates = best[k]
+        for other_length, other in candidates.items():
+            if other_length <= length and other[0] <= g:
+                return
+        candidates[length] = (g, pi, match, i)
+        if len(candidates) > MAX_SEQUENCE_CANDIDATES:
+            del candidates[max(candidates, key=lambda key: candidates[key][0])]
+
+    # Позиции, где заканчивается хотя бы один шаблон: только после них
+    # имеет смысл начинать участок перебора (перебор подряд с перебором
+    # не склеивается)
+    match_ends: List[int] = []
+    for k in range(n):
+        for match in by_end[k]:
+            i = match["i"]
+            if i == 0:
+                update(0, k, match["guesses"], 1, match)
+            else:
+                for length in list(best[i - 1]):
+                    update(i, k, match["guesses"], length + 1, match)
+        update(0, k, _bruteforce_guesses(k + 1), 1, None)
+        for end in match_ends[-MAX_BRUTEFORCE_STARTS:]:
+            guesses = _bruteforce_guesses(k - end)
+            for length, (_, _, last, _) in list(best[end].items()):
+                if last is not None:
+                    update(end + 1, k, guesses, length + 1, None)
+        if by_end[k]:
+            match_ends.append(k)
+
+    # Восстанавливаем лучшую последовательность
+    length, (guesses, _, _, _) = min(best[n - 1].items(), key=lambda item: item[1][0])
+    sequence = []
+    k = n - 1
+    while k >= 0:
+        _, _, match, i = best[k][length]
+        if match is None:
+            match = {"pattern": "bruteforce", "i": i, "j": k,
+                     "token": password[i:k + 1], "guesses": _bruteforce_guesses(k - i + 1)}
+        sequence.append(match)
+        k = match["i"] - 1
+        length -= 1
+    sequence.reverse()
+    return {"guesses": guesses, "sequence": sequence}
+
+
+def guesses_to_score(guesses: float) -> int:
+    """Переводит число попыток в уровень 0..4."""
+    score = 0
+    for threshold in SCORE_THRESHOLDS:
+        if guesses >= threshold + 5:
+            score += 1
+    return score
+
+
+def estimate_guesses(password: str) -> dict:
+    """
+    Оценивает число попыток, за которое подбирается пароль.
+
+    Args:
+        password (str): Пароль для оценки
+
+    Returns:
+        dict: Результат оценки:
+            "guesses" - ожидаемое число попыток,
+            "guesses_log10" - его десятичный логарифм,
+            "score" - уровень 0..4 (0 - подбирается мгновенно),
+            "sequence" - найденные шаблоны (pattern, token, i, j, guesses)
+    """
+    analyzed = password[:MAX_ANALYZED_LENGTH]
+    result = _estimate(analyzed)
+    # Хвост за MAX_ANALYZED_LENGTH досчитывается в логарифмах: при длине
+    # MAX_PASSWORD_LENGTH число попыток не помещается во float
+    tail = len(password) - len(analyzed)
+    guesses_log10 = math.log10(result["guesses"]) + tail * math.log10(BRUTEFORCE_CARDINALITY)
+    guesses = (10.0 ** guesses_log10 if guesses_log10 < sys.float_info.max_10_exp
+               else sys.float_info.max)
+    return {
+        "guesses": guesses,
+        "guesses_log10": guesses_log10,
+        "score": guesses_to_score(guesses),
+        "sequence": result["sequence"],
+    }
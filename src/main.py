@@ -1,13 +1,43 @@
 """
 CLI (Command Line Interface) для проверки паролей.
 Позволяет проверять пароли прямо из командной строки.
+
+CLI вызывают тысячи раз из скриптов, поэтому проверка одного пароля
+импортирует только нужное: JSON, пул процессов, профилировщик, кэш и
+сборка словарей подключаются в тех ветках, где используются.
 """
 
 import argparse
-import json
-from typing import Optional
-from checker import evaluate_password
+import sys
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, TextIO
+
+from checker import (
+    STRENGTH_LEVELS,
+    Evaluation,
+    PasswordState,
+    Policy,
+    RuleProfile,
+    prepare_batch,
+)
 from config import config
+from policy import configure_policy, get_policy
+from resources import load_resources
+
+# Кэш результатов для проверки файла (создается при первом обращении;
+# None, если выключен)
+result_cache = None
+
+
+def get_result_cache():
+    """Возвращает кэш результатов, если он включен в конфигурации."""
+    global result_cache
+    if result_cache is None and config["result_cache_enabled"]:
+        from cache import build_result_cache
+        result_cache = build_result_cache(config)
+    return result_cache
 
 
 def check_single_password(password: str, json_output: bool = False):
@@ -18,10 +48,11 @@ def check_single_password(password: str, json_output: bool = False):
         password (str): Пароль для проверки
         json_output (bool): Выводить результат в формате JSON
     """
-    result = evaluate_password(password)
+    result = get_policy().evaluate_password(password)
     
     if json_output:
         # Вывод в формате JSON (удобно для автоматической обработки)
+        import json
         print(json.dumps(result, ensure_ascii=False, indent=2))
     else:
         # Красивый вывод для человека
@@ -44,36 +75,453 @@ def check_single_password(password: str, json_output: bool = False):
         print("=" * 50)
 
 
-def check_from_file(filename: str, json_output: bool = False):
+# Подписи правил в интерактивном индикаторе (имена - Evaluation.rule_states)
+METER_LABELS = {
+    "min_length": "длина",
+    "digits": "цифры",
+    "uppercase": "заглавные",
+    "lowercase": "строчные",
+    "special": "спецсимволы",
+    "not_common": "не простой",
+    "guessability": "подбор",
+}
+
+
+def render_meter(evaluation: Evaluation) -> str:
+    """Строка индикатора сложности: маска пароля, балл, уровень и правила."""
+    rules = " ".join(
+        f"{'✅' if passed else '❌'}{METER_LABELS.get(name, name)}"
+        for name, passed in evaluation.rule_states().items()
+    )
+    return (f"{'*' * evaluation.length}  {evaluation.score}/{evaluation.policy.max_score}"
+            f" {evaluation.strength}  {rules}")
+
+
+def _skip_escape_sequence(stream: TextIO):
+    """Пропускает остаток escape-последовательности (стрелки, Home, Delete...)."""
+    if stream.read(1) in ("[", "O"):
+        while not "@" <= stream.read(1) <= "~":
+            pass
+
+
+def read_password_interactive() -> str:
+    """
+    Читает пароль с индикатором сложности, который обновляется при
+    каждом нажатии клавиши (checker.PasswordState - без пересчета
+    пароля целиком). Без терминала (или без termios) - обычный input().
+    """
+    try:
+        import termios
+    except ImportError:
+        termios = None
+    if termios is None or not sys.stdin.isatty():
+        return input("Введите пароль для проверки: ")
+    
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    mode = termios.tcgetattr(fd)
+    # Посимвольный ввод без эха
+    mode[3] &= ~(termios.ECHO | termios.ICANON)
+    mode[6][termios.VMIN], mode[6][termios.VTIME] = 1, 0
+    
+    state = PasswordState(get_policy())
+    print("Введите пароль (Enter - подробный результат, Ctrl+U - стереть все):")
+    try:
+        termios.tcsetattr(fd, termios.TCSAFLUSH, mode)
+        while True:
+            sys.stdout.write("\r\x1b[K" + render_meter(state.result()))
+            sys.stdout.flush()
+            char = sys.stdin.read(1)
+            if char in ("", "\n", "\r"):
+                break
+            if char in ("\x7f", "\b"):
+                state.delete()
+            elif char == "\x15":
+                state.delete(len(state))
+            elif char == "\x1b":
+                _skip_escape_sequence(sys.stdin)
+            elif char.isprintable():
+                state.append(char)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+        print()
+    return state.password
+
+
+# Сколько паролей оценивается за раз в потоковом режиме
+STREAM_CHUNK_SIZE = 10000
+
+
+@contextmanager
+def open_password_source(filename: str) -> Iterator[TextIO]:
+    """
+    Открывает источник паролей: файл или stdin (если имя файла "-").
+    
+    Args:
+        filename (str): Имя файла или "-"
+    """
+    if filename == "-":
+        yield sys.stdin
+    else:
+        with open(filename, 'r', encoding='utf-8') as file:
+            yield file
+
+
+def iter_passwords(file: TextIO) -> Iterator[str]:
+    """Лениво читает непустые пароли из файла, по одному на строку."""
+    for line in file:
+        password = line.strip()
+        if password:
+            yield password
+
+
+def iter_chunks(passwords: Iterator[str], size: int) -> Iterator[List[str]]:
+    """Нарезает поток паролей на списки не длиннее size."""
+    while True:
+        chunk = list(islice(passwords, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def check_from_file(filename: str, json_output: bool = False) -> int:
     """
     Читает пароли из файла и проверяет их.
     
     Args:
-        filename (str): Имя файла с паролями
+        filename (str): Имя файла с паролями ("-" - читать из stdin)
         json_output (bool): Выводить результат в формате JSON
+        
+    Returns:
+        int: Сколько паролей проверено
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            passwords = [line.strip() for line in file if line.strip()]
+        with open_password_source(filename) as file:
+            passwords = list(iter_passwords(file))
+        
+        policy = get_policy()
+        cache = get_result_cache()
+        if cache is not None:
+            # RESULT_CACHE_ENABLED: повторы пароля в файле берутся из кэша
+            results = [cache.evaluate(password, policy) for password in passwords]
+            scores = [result["score"] for result in results]
+            strengths = [result["strength"] for result in results]
+        else:
+            columns = policy.evaluate_batch(passwords)
+            results = None
+            scores = columns["score"]
+            strengths = (STRENGTH_LEVELS[level] for level in columns["strength"])
         
         if json_output:
-            results = [evaluate_password(pwd) for pwd in passwords]
+            import json
+            if results is None:
+                results = policy.batch_to_dicts(passwords, columns)
             print(json.dumps(results, ensure_ascii=False, indent=2))
         else:
             print(f"\n📁 Проверяем пароли из файла: {filename}")
             print(f"Найдено паролей: {len(passwords)}")
             print("=" * 50)
             
-            for i, password in enumerate(passwords, 1):
-                result = evaluate_password(password)
-                print(f"{i}. '{password}' - {result['score']}/100 ({result['strength']})")
+            rows = zip(passwords, scores, strengths, strict=True)
+            for i, (password, score, strength) in enumerate(rows, 1):
+                print(f"{i}. '{password}' - {score}/{policy.max_score} ({strength})")
             
             print("=" * 50)
+        return len(passwords)
             
     except FileNotFoundError:
         print(f"❌ Ошибка: Файл '{filename}' не найден!")
     except Exception as e:
         print(f"❌ Ошибка при чтении файла: {e}")
+    return 0
+
+
+def _render_chunk(chunk: List[str], json_output: bool, start: int, policy: Policy) -> str:
+    """
+    Оценивает порцию паролей и возвращает готовый текст для вывода.
+    
+    Вызывается и в основном процессе, и в воркерах пула: воркер
+    возвращает одну строку на порцию, что удерживает накладные
+    расходы на передачу данных между процессами низкими.
+    """
+    columns = policy.evaluate_batch(chunk)
+    if json_output:
+        import json
+        return "".join(
+            json.dumps(result, ensure_ascii=False) + "\n"
+            for result in policy.batch_to_dicts(chunk, columns)
+        )
+    rows = zip(chunk, columns["score"], columns["strength"], strict=True)
+    return "".join(
+        f"{i}. '{password}' - {score}/{policy.max_score} ({STRENGTH_LEVELS[strength]})\n"
+        for i, (password, score, strength) in enumerate(rows, start)
+    )
+
+
+def _write_parallel(chunks: Iterator[List[str]], json_output: bool, out: TextIO,
+                    workers: int, ordered: bool) -> int:
+    """
+    Оценивает порции в пуле процессов и пишет результаты в out.
+    
+    В работе одновременно не больше 2 * workers порций, поэтому
+    память остается ограниченной при любом размере входа.
+    
+    Returns:
+        int: Сколько паролей обработано
+    """
+    from collections import deque
+    from concurrent.futures import (
+        FIRST_COMPLETED,
+        ProcessPoolExecutor,
+        as_completed,
+        wait,
+    )
+    
+    total = 0
+    max_pending = workers * 2
+    policy = get_policy()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=load_resources,
+        initargs=(config,),
+    ) as pool:
+        if ordered:
+            queue = deque()
+            for chunk in chunks:
+                queue.append(pool.submit(_render_chunk, chunk, json_output, total + 1, policy))
+                total += len(chunk)
+                if len(queue) >= max_pending:
+                    out.write(queue.popleft().result())
+            while queue:
+                out.write(queue.popleft().result())
+        else:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(_render_chunk, chunk, json_output, total + 1, policy))
+                total += len(chunk)
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        out.write(future.result())
+            for future in as_completed(pending):
+                out.write(future.result())
+    return total
+
+
+def stream_from_file(filename: str, json_output: bool = False,
+                     out: TextIO = sys.stdout, chunk_size: int = STREAM_CHUNK_SIZE,
+                     workers: int = 1, ordered: bool = True) -> int:
+    """
+    Проверяет пароли из файла в потоковом режиме.
+    
+    Пароли читаются и оцениваются порциями по chunk_size, а результаты
+    сразу пишутся в out, поэтому расход памяти не зависит от размера файла.
+    В режиме JSON выводится NDJSON - один результат на строку.
+    
+    Args:
+        filename (str): Имя файла с паролями ("-" - читать из stdin)
+        json_output (bool): Выводить результаты в формате NDJSON
+        out (TextIO): Куда писать результаты
+        chunk_size (int): Размер порции
+        workers (int): Число процессов; больше 1 - порции оцениваются в пуле
+        ordered (bool): Сохранять порядок входа (иначе порции пишутся
+            по мере готовности)
+        
+    Returns:
+        int: Сколько паролей проверено
+    """
+    try:
+        with open_password_source(filename) as file:
+            if not json_output:
+                out.write(f"\n📁 Проверяем пароли из файла: {filename}\n")
+                out.write("=" * 50 + "\n")
+            
+            chunks = iter_chunks(iter_passwords(file), chunk_size)
+            if workers > 1:
+                total = _write_parallel(chunks, json_output, out, workers, ordered)
+            else:
+                total = 0
+                policy = get_policy()
+                for chunk in chunks:
+                    out.write(_render_chunk(chunk, json_output, total + 1, policy))
+                    total += len(chunk)
+            
+            if not json_output:
+                out.write("=" * 50 + "\n")
+                out.write(f"Проверено паролей: {total}\n")
+            return total
+            
+    except FileNotFoundError:
+        print(f"❌ Ошибка: Файл '{filename}' не найден!", file=sys.stderr)
+    except Exception as e:
+        print(f"❌ Ошибка при чтении файла: {e}", file=sys.stderr)
+    return 0
+
+
+def dedup_from_file(filename: str, json_output: bool = False,
+                    out: TextIO = sys.stdout, chunk_size: int = STREAM_CHUNK_SIZE,
+                    max_unique: Optional[int] = None, spill_dir: Optional[str] = None) -> int:
+    """
+    Проверяет файл, оценивая каждый уникальный пароль один раз.
+    
+    Сначала считается, сколько раз встречается каждый пароль (dedup.py;
+    при большом числе уникальных паролей - с выгрузкой в корзины на
+    диске), затем уникальные пароли оцениваются порциями. Результат
+    каждого пароля содержит число его повторов (count), а итоговая
+    сводка (checker.BatchSummary) взвешена по повторам - как если бы
+    проверялся каждый пароль файла. В режиме JSON выводится NDJSON,
+    последняя строка - {"summary": {...}}.
+    
+    Args:
+        filename (str): Имя файла с паролями ("-" - читать из stdin)
+        json_output (bool): Выводить результаты в формате NDJSON
+        out (TextIO): Куда писать результаты
+        chunk_size (int): Сколько уникальных паролей оценивать за раз
+        max_unique (Optional[int]): Сколько уникальных паролей держать
+            в памяти (None - dedup.DEDUP_MAX_UNIQUE)
+        spill_dir (Optional[str]): Каталог для корзин (None - временный)
+        
+    Returns:
+        int: Сколько паролей проверено (с повторами)
+    """
+    import json
+
+    from checker import BatchSummary
+    from dedup import DEDUP_MAX_UNIQUE, PasswordCounter
+    
+    try:
+        with PasswordCounter(max_unique or DEDUP_MAX_UNIQUE, spill_dir=spill_dir) as counter:
+            with open_password_source(filename) as file:
+                counter.update(iter_passwords(file))
+            
+            if not json_output:
+                out.write(f"\n📁 Проверяем пароли из файла: {filename}\n")
+                out.write("=" * 50 + "\n")
+            
+            policy = get_policy()
+            summary = BatchSummary(policy)
+            unique = 0
+            for chunk in iter_chunks(counter.items(), chunk_size):
+                passwords = [password for password, _ in chunk]
+                counts = [count for _, count in chunk]
+                columns = policy.evaluate_batch(passwords)
+                summary.merge(BatchSummary.from_columns(columns, policy, counts))
+                if json_output:
+                    lines = []
+                    results = policy.batch_to_dicts(passwords, columns)
+                    for result, count in zip(results, counts, strict=True):
+                        result["count"] = count
+                        lines.append(json.dumps(result, ensure_ascii=False) + "\n")
+                    out.write("".join(lines))
+                else:
+                    rows = zip(passwords, counts, columns["score"], columns["strength"],
+                               strict=True)
+                    out.write("".join(
+                        f"{i}. '{password}' ×{count} - {score}/{policy.max_score} "
+                        f"({STRENGTH_LEVELS[strength]})\n"
+                        for i, (password, count, score, strength) in enumerate(rows, unique + 1)
+                    ))
+                unique += len(chunk)
+            
+            if json_output:
+                out.write(json.dumps({"summary": {
+                    "total_count": counter.total,
+                    "unique_count": unique,
+                    **summary.to_dict(),
+                }}, ensure_ascii=False) + "\n")
+            else:
+                out.write("=" * 50 + "\n")
+                out.write(f"Проверено паролей: {counter.total}, уникальных: {unique}\n")
+                for level, count in zip(STRENGTH_LEVELS, summary.strengths, strict=True):
+                    share = count / counter.total * 100 if counter.total else 0.0
+                    out.write(f"  {level}: {count} ({share:.1f}%)\n")
+            return counter.total
+    
+    except FileNotFoundError:
+        print(f"❌ Ошибка: Файл '{filename}' не найден!", file=sys.stderr)
+    except Exception as e:
+        print(f"❌ Ошибка при чтении файла: {e}", file=sys.stderr)
+    return 0
+
+
+# Сколько самых затратных функций показывать из статистики cProfile
+PROFILE_TOP_FUNCTIONS = 15
+
+
+def print_rule_profile(profile: RuleProfile, count: int, elapsed: float,
+                       out: Optional[TextIO] = None, setup: float = 0.0):
+    """
+    Печатает время проверки по правилам и пропускную способность.
+    
+    Args:
+        profile (RuleProfile): Профиль, собранный во время проверки
+        count (int): Сколько паролей проверено
+        elapsed (float): Общее время проверки в секундах
+        out (Optional[TextIO]): Куда печатать (по умолчанию stderr - не мешает JSON)
+        setup (float): Время разовой подготовки до замера, секунды
+    """
+    out = out or sys.stderr
+    total_ns = elapsed * 1e9
+    rate = count / elapsed if elapsed else 0.0
+    out.write("\n⏱ ПРОФИЛЬ ПРОВЕРКИ\n")
+    out.write("=" * 64 + "\n")
+    out.write(f"Паролей: {count} за {elapsed:.3f} с ({rate:,.0f} паролей/с)\n")
+    out.write(f"Подготовка (NumPy, таблица классов): {setup * 1000:.2f} мс, не входит в замер\n\n")
+    out.write(f"{'Правило':<20}{'Оценок':>12}{'Всего, мс':>12}{'нс/оценку':>12}{'Доля':>8}\n")
+    for rule, (calls, nanoseconds) in profile.snapshot().items():
+        per_call = nanoseconds / calls if calls else 0
+        share = nanoseconds / total_ns * 100 if total_ns else 0
+        out.write(f"{rule:<20}{calls:>12,}{nanoseconds / 1e6:>12.2f}"
+                  f"{per_call:>12,.0f}{share:>7.1f}%\n")
+    other = max(0.0, total_ns - profile.total_ns())
+    share = other / total_ns * 100 if total_ns else 0
+    out.write(f"{'остальное':<20}{'':>12}{other / 1e6:>12.2f}{'':>12}{share:>7.1f}%\n")
+    out.write("  (остальное - чтение файла, баллы, формирование и вывод результатов)\n")
+    out.write("=" * 64 + "\n")
+
+
+def run_profiled(audit: Callable[[], int], dump_path: Optional[str] = None) -> int:
+    """
+    Выполняет проверку файла с замером времени по правилам.
+    
+    Args:
+        audit: Функция проверки, возвращающая число проверенных паролей
+        dump_path (Optional[str]): Куда сохранить статистику cProfile
+            (None - cProfile не запускается)
+        
+    Returns:
+        int: Сколько паролей проверено
+    """
+    import cProfile
+    import pstats
+    
+    profile = RuleProfile()
+    configure_policy(config, profile)
+    profiler = cProfile.Profile() if dump_path else None
+    
+    # Разовая подготовка пакетной оценки не должна считаться временем правил
+    start = time.perf_counter()
+    prepare_batch()
+    setup = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        count = audit()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    elapsed = time.perf_counter() - start
+    
+    print_rule_profile(profile, count, elapsed, setup=setup)
+    if profiler is not None:
+        profiler.dump_stats(dump_path)
+        print(f"\n📄 Статистика cProfile сохранена: {dump_path} "
+              f"(python -m pstats {dump_path})", file=sys.stderr)
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    return count
 
 
 def create_sample_file():
@@ -97,6 +545,17 @@ def create_sample_file():
     print("Используйте: python src/main.py --file sample_passwords.txt")
 
 
+def positive_int(value: str) -> int:
+    """Тип аргумента argparse: целое число не меньше 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается целое число, получено '{value}'") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"ожидается число не меньше 1, получено {number}")
+    return number
+
+
 def main():
     """Основная функция CLI."""
     # Создаем парсер аргументов командной строки
@@ -107,8 +566,17 @@ def main():
 Примеры использования:
   python src/main.py --password "MyPass123!"
   python src/main.py --password "test" --json
+  python src/main.py --interactive
   python src/main.py --file passwords.txt
+  python src/main.py --file dump.txt --stream --json > results.ndjson
+  cat dump.txt | python src/main.py --file - --stream
+  python src/main.py --file dump.txt --json --workers 32 --unordered
+  python src/main.py --file dump.txt --dedup --json > unique.ndjson
+  python src/main.py --file dump.txt --stream --profile > /dev/null
+  python src/main.py --file dump.txt --profile-dump audit.pstats
   python src/main.py --create-sample
+  python src/main.py --build-blocklist rockyou.txt blocklist.idx
+  python src/main.py --build-word-matcher words.txt words.acm
         """
     )
     
@@ -118,9 +586,77 @@ def main():
         help="Проверить один пароль"
     )
     
+    parser.add_argument(
+        "-i", "--interactive",
+        action="store_true",
+        help="Ввести пароль с индикатором сложности, обновляемым при каждом нажатии"
+    )
+    
     parser.add_argument(
         "-f", "--file",
-        help="Проверить пароли из файла"
+        help="Проверить пароли из файла (\"-\" - читать из stdin)"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Потоковая проверка файла с постоянным расходом памяти "
+             "(с --json выводит NDJSON)"
+    )
+    
+    parser.add_argument(
+        "-w", "--workers",
+        type=positive_int,
+        default=1,
+        help="Число процессов для проверки файла (включает потоковый режим)"
+    )
+    
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="С --workers: выводить результаты по мере готовности, "
+             "не сохраняя порядок файла"
+    )
+    
+    parser.add_argument(
+        "--chunk-size",
+        type=positive_int,
+        default=STREAM_CHUNK_SIZE,
+        help=f"Размер порции паролей в потоковом режиме (по умолчанию {STREAM_CHUNK_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Оценить каждый уникальный пароль один раз и вывести число его "
+             "повторов (с --json - NDJSON и сводка по всем повторам)"
+    )
+    
+    parser.add_argument(
+        "--dedup-memory",
+        type=positive_int,
+        metavar="N",
+        help="С --dedup: сколько уникальных паролей держать в памяти, "
+             "остальные выгружаются в корзины на диске"
+    )
+    
+    parser.add_argument(
+        "--spill-dir",
+        metavar="DIR",
+        help="С --dedup: каталог для корзин (по умолчанию временный)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="После проверки файла показать время по правилам и скорость "
+             "(в stderr; проверка идет в одном процессе)"
+    )
+    
+    parser.add_argument(
+        "--profile-dump",
+        metavar="PATH",
+        help="Вместе с --profile сохранить статистику cProfile (pstats) в файл"
     )
     
     parser.add_argument(
@@ -135,6 +671,20 @@ def main():
         help="Создать пример файла с паролями"
     )
     
+    parser.add_argument(
+        "--build-blocklist",
+        nargs=2,
+        metavar=("WORDLIST", "INDEX"),
+        help="Скомпилировать словарь утекших паролей в индекс блок-листа"
+    )
+    
+    parser.add_argument(
+        "--build-word-matcher",
+        nargs=2,
+        metavar=("WORDLIST", "OUTPUT"),
+        help="Построить автомат поиска словарных слов в паролях"
+    )
+    
     parser.add_argument(
         "--show-config",
         action="store_true",
@@ -144,19 +694,77 @@ def main():
     # Парсим аргументы
     args = parser.parse_args()
     
+    # Подключаем блок-лист и словарь слов, если они указаны в конфигурации
+    if not (args.build_blocklist or args.build_word_matcher):
+        load_resources(config)
+    
     # Обрабатываем аргументы
     if args.show_config:
         from config import print_config
         print_config()
     
+    elif args.build_blocklist:
+        from blocklist import build_blocklist
+        wordlist, index = args.build_blocklist
+        count = build_blocklist(wordlist, index)
+        print(f"✅ Индекс '{index}' создан: {count} уникальных паролей")
+        print(f"Подключите его: BLOCKLIST_PATH={index}")
+    
+    elif args.build_word_matcher:
+        from wordmatch import build_word_matcher
+        wordlist, output = args.build_word_matcher
+        count = build_word_matcher(wordlist, output)
+        print(f"✅ Автомат '{output}' создан: {count} слов")
+        print(f"Подключите его: WORD_MATCHER_PATH={output}")
+    
     elif args.create_sample:
         create_sample_file()
     
     elif args.password:
         check_single_password(args.password, args.json)
     
+    elif args.interactive:
+        check_single_password(read_password_interactive(), args.json)
+    
     elif args.file:
-        check_from_file(args.file, args.json)
+        profiling = args.profile or args.profile_dump
+        if profiling and args.workers > 1:
+            # Замеры и cProfile видят только текущий процесс
+            print("⚠️ --profile проверяет файл в одном процессе, --workers не используется",
+                  file=sys.stderr)
+            args.stream, args.workers = True, 1
+        
+        if args.dedup:
+            if args.workers > 1:
+                # Уникальных паролей обычно во много раз меньше - их хватает одного процесса
+                print("⚠️ --dedup проверяет уникальные пароли в одном процессе, "
+                      "--workers не используется", file=sys.stderr)
+            
+            def audit() -> int:
+                return dedup_from_file(
+                    args.file,
+                    args.json,
+                    chunk_size=args.chunk_size,
+                    max_unique=args.dedup_memory,
+                    spill_dir=args.spill_dir,
+                )
+        elif args.stream or args.workers > 1:
+            def audit() -> int:
+                return stream_from_file(
+                    args.file,
+                    args.json,
+                    chunk_size=args.chunk_size,
+                    workers=args.workers,
+                    ordered=not args.unordered,
+                )
+        else:
+            def audit() -> int:
+                return check_from_file(args.file, args.json)
+        
+        if profiling:
+            run_profiled(audit, args.profile_dump)
+        else:
+            audit()
     
     else:
         # Если не указаны аргументы - показываем справку
@@ -168,8 +776,7 @@ def main():
         
         choice = input().lower()
         if choice == 'y':
-            password = input("Введите пароль для проверки: ")
-            check_single_password(password)
+            check_single_password(read_password_interactive())
 
 
 if __name__ == "__main__":
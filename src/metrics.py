@@ -0,0 +1,280 @@
+"""
+Метрики сервиса в текстовом формате Prometheus (GET /metrics).
+
+Запись метрики не берет блокировок: каждый поток увеличивает
+собственный список счетчиков (как RuleProfile в checker.py), а суммы
+по потокам считаются только при чтении /metrics. Блокировка нужна
+лишь при первой записи потока или новом наборе меток.
+
+Значения, которые и так где-то хранятся (статистика кэша, профиль
+правил), не дублируются - их собирают функции-сборщики при чтении.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Границы корзин: длительность запроса (с) и размер пакета (паролей)
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 10, 100, 1000, 5000, 10000, 50000, 100000)
+
+
+class _Shards:
+    """Список счетчиков на каждый поток; total() суммирует их."""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._all: List[list] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> list:
+        """Счетчики текущего потока."""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0] * self._size
+            with self._lock:
+                self._all.append(values)
+            self._local.values = values
+            return values
+
+    def total(self) -> list:
+        """Суммы по всем потокам."""
+        with self._lock:
+            shards = [list(values) for values in self._all]
+        return [sum(column) for column in zip(*shards, strict=True)] or [0] * self._size
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values, strict=True)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class _Metric:
+    """Общая часть метрик: имя, описание, метки и дочерние метрики."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Метрика для набора значений меток (создается при первом вызове)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _samples(self, child, labels: Tuple[str, ...]) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Строки метрики в формате Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for labels, child in sorted(self._children.items()):
+            lines.extend(self._samples(child, labels))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1):
+        """Увеличивает счетчик."""
+        self._shards.get()[0] += amount
+
+
+class Counter(_Metric):
+    """Монотонный счетчик."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def _samples(self, child, labels):
+        value = child._shards.total()[0]
+        yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_shards")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # Корзины по границам, корзина +Inf и сумма значений
+        self._shards = _Shards(len(bounds) + 2)
+
+    def observe(self, value: float):
+        """Учитывает одно значение."""
+        values = self._shards.get()
+        values[bisect_left(self._bounds, value)] += 1
+        values[-1] += value
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными границами корзин."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _samples(self, child, labels):
+        values = child._shards.total()
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), values[:-1], strict=True):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+            label_text = _format_labels(self.labelnames, labels, f'le="{le}"')
+            yield f"{self.name}_bucket{label_text} {cumulative}"
+        label_text = _format_labels(self.labelnames, labels)
+        yield f"{self.name}_sum{label_text} {_format_value(values[-1])}"
+        yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class Registry:
+    """Набор метрик и сборщиков, отдаваемых /metrics."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, documentation: str,
+                labelnames: Sequence[str] = ()) -> Counter:
+        """Создает и регистрирует счетчик."""
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        """Создает и регистрирует гистограмму."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]):
+        """Добавляет функцию, возвращающую готовые строки метрик при чтении."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def gauge_lines(name: str, documentation: str, kind: str,
+                samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """
+    Строки метрики, значения которой считаются при чтении (для сборщиков).
+
+    Args:
+        name (str): Имя метрики
+        documentation (str): Описание
+        kind (str): Тип ("gauge" или "counter")
+        samples: Пары (метки, значение)
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        label_text = _format_labels(tuple(labels), tuple(labels.values()))
+        lines.append(f"{name}{label_text} {_format_value(value)}")
+    return lines
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: число запросов и длительность по маршрутам.
+
+    Маршрутом считается путь, если он объявлен в приложении, иначе
+    "other" - чтобы случайные URL не плодили метки.
+    """
+
+    def __init__(self, app, requests: Counter, durations: Histogram):
+        self.app = app
+        self._requests = requests
+        self._durations = durations
+        self._routes = None
+        # (маршрут, метод, статус) -> (счетчик, гистограмма)
+        self._children: Dict[tuple, tuple] = {}
+
+    def _route(self, scope) -> str:
+        if self._routes is None:
+            self._routes = frozenset(
+                getattr(route, "path", None) for route in scope["app"].routes
+            )
+        path = scope["path"]
+        return path if path in self._routes else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            key = (scope["path"], scope["method"], status)
+            children = self._children.get(key)
+            if children is None:
+                route = self._route(scope)
+                children = (
+                    self._requests.labels(route, scope["method"], str(status)),
+                    self._durations.labels(route),
+                )
+                if route != "other":
+                    self._children[key] = children
+            children[0].inc()
+            children[1].observe(elapsed)
@@ -0,0 +1,152 @@
+"""
+Активная политика проверки и ее горячая перезагрузка.
+
+Политика (checker.Policy) компилируется из конфигурации один раз.
+Перезагрузка строит новую политику целиком и подменяет ссылку на нее
+одним присваиванием, поэтому запрос видит либо старую, либо новую
+политику, но никогда их смесь.
+
+Перезагрузить политику можно сигналом SIGHUP или изменив файл
+POLICY_FILE (он проверяется раз в POLICY_RELOAD_INTERVAL секунд):
+
+    kill -HUP <pid>
+
+При нескольких воркерах (API_WORKERS > 1) супервизор uvicorn не передает
+SIGHUP воркерам: сигнал нужно слать каждому воркеру или менять POLICY_FILE.
+"""
+
+import os
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from checker import Policy, RuleProfile
+from config import config, load_config
+
+# Активная политика процесса
+_active: Policy = Policy.from_config(config)
+
+
+def get_policy() -> Policy:
+    """Возвращает активную политику."""
+    return _active
+
+
+def configure_policy(policy_config: Dict[str, Any],
+                     profile: Optional[RuleProfile] = None) -> Policy:
+    """
+    Компилирует политику по конфигурации и делает ее активной.
+
+    Args:
+        policy_config: Конфигурация (см. config.load_config)
+        profile: Профиль для замера времени по правилам (None - без замеров)
+
+    Returns:
+        Policy: Новая активная политика
+    """
+    global _active
+    _active = Policy.from_config(policy_config, profile)
+    return _active
+
+
+def reload_policy() -> Optional[Policy]:
+    """
+    Перечитывает конфигурацию (окружение и POLICY_FILE) и подменяет политику.
+
+    Профиль времени по правилам переходит к новой политике.
+
+    Returns:
+        Optional[Policy]: Новая политика или None, если конфигурацию
+            прочитать не удалось (тогда остается прежняя)
+    """
+    try:
+        return configure_policy(load_config(), _active.profile)
+    except (OSError, ValueError) as e:
+        print(f"❌ Политика не перезагружена: {e}", file=sys.stderr)
+        return None
+
+
+def install_reload_signal() -> bool:
+    """
+    Перезагружает политику по сигналу SIGHUP.
+
+    Обработчик ставится в каждом процессе отдельно: при API_WORKERS > 1
+    сигнал родительскому процессу до воркеров не доходит, поэтому там
+    политику перезагружают через POLICY_FILE или `kill -HUP` воркеру.
+
+    Returns:
+        bool: Обработчик установлен (нужен Unix и главный поток)
+    """
+    import signal
+
+    if not hasattr(signal, "SIGHUP"):
+        return False
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    signal.signal(signal.SIGHUP, lambda signum, frame: reload_policy())
+    return True
+
+
+class PolicyWatcher(threading.Thread):
+    """Фоновый поток, перезагружающий политику при изменении файла."""
+
+    def __init__(self, path: str, interval: float):
+        super().__init__(name="policy-watcher", daemon=True)
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._stamp = self._file_stamp()
+
+    def _file_stamp(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> bool:
+        """Перезагружает политику, если файл изменился с прошлой проверки."""
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        return reload_policy() is not None
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """Останавливает поток."""
+        self._stopped.set()
+
+
+_watcher: Optional[PolicyWatcher] = None
+
+
+def start_policy_watcher(path: str, interval: float) -> Optional[PolicyWatcher]:
+    """
+    Запускает слежение за файлом политики.
+
+    Args:
+        path (str): Файл политики; пустая строка - не следить
+        interval (float): Период проверки в секундах; 0 - не следить
+
+    Returns:
+        Optional[PolicyWatcher]: Запущенный поток или None
+    """
+    global _watcher
+    stop_policy_watcher()
+    if not path or interval <= 0:
+        return None
+    _watcher = PolicyWatcher(path, interval)
+    _watcher.start()
+    return _watcher
+
+
+def stop_policy_watcher():
+    """Останавливает слежение за файлом политики."""
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
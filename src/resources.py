@@ -0,0 +1,23 @@
+"""
+Подключение словарных ресурсов процесса.
+
+Блок-лист (blocklist.py) и автомат поиска слов (wordmatch.py) подключаются
+по путям из конфигурации. Функция load_resources вызывается при старте
+API и CLI, а также служит инициализатором воркеров пулов процессов.
+"""
+
+from typing import Any, Dict
+
+from blocklist import configure_blocklist
+from wordmatch import configure_word_matcher
+
+
+def load_resources(config: Dict[str, Any]):
+    """
+    Подключает блок-лист и автомат поиска слов, указанные в конфигурации.
+
+    Args:
+        config: Конфигурация приложения
+    """
+    configure_blocklist(config["blocklist_path"])
+    configure_word_matcher(config["word_matcher_path"])
@@ -0,0 +1,461 @@
+"""
+Поиск словарных слов внутри пароля (автомат Ахо-Корасик).
+
+check_common_passwords ловит только точные совпадения, поэтому
+"MyPassword2024!" и "dragon$$99" проходят проверку. Автомат
+Ахо-Корасик находит все слова словаря, встречающиеся в пароле,
+за один линейный проход - независимо от размера словаря.
+
+Автомат строится заранее из текстового словаря и сохраняется
+в файл плоскими массивами. Процессы отображают файл в память (mmap)
+и ищут прямо по нему - как блок-лист, автомат не копируется в кучу
+каждого воркера:
+
+    python src/wordmatch.py words.txt words.acm
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from array import array
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Формат файла: сигнатура, размер хэш-таблицы переходов, число состояний
+MAGIC = b"PWACM3\0\0"
+_HEADER = struct.Struct("<8sQQ")
+
+# Пустая ячейка хэш-таблицы переходов и множитель хэша ключа
+EMPTY_KEY = -1
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+# Сколько найденных переходов держать в куче процесса. Частые переходы
+# (начала популярных слов) ищутся в обычном dict, остальные - в таблице
+# на mmap; заполненный кэш очищается и набирается заново
+TRANSITION_CACHE_SIZE = 1 << 16
+
+# Слова короче этого не ищем: двух-трехбуквенные слова есть почти в
+# любом пароле и ничего не говорят о его слабости
+MIN_WORD_LENGTH = 4
+
+# Каждая таблица переводит l33t-символы в буквы; неоднозначные символы
+# ("1", "!", "|") разнесены по двум таблицам
+L33T_TABLES = [
+    {"4": "a", "@": "a", "8": "b", "(": "c", "{": "c", "3": "e", "6": "g",
+     "1": "i", "!": "i", "|": "i", "0": "o", "$": "s", "5": "s", "7": "t",
+     "+": "t", "%": "x", "2": "z"},
+    {"4": "a", "@": "a", "8": "b", "(": "c", "{": "c", "3": "e", "9": "g",
+     "1": "l", "!": "l", "|": "l", "0": "o", "$": "s", "5": "s", "7": "t",
+     "+": "t", "%": "x", "2": "z"},
+]
+_L33T_TRANSLATIONS = [str.maketrans(table) for table in L33T_TABLES]
+
+
+def lower_keep_length(text: str) -> str:
+    """
+    Нижний регистр с сохранением длины строки.
+
+    Некоторые символы при str.lower() превращаются в несколько
+    ("İ" -> "i̇"); такие символы остаются как есть, чтобы позиции
+    найденных слов совпадали с позициями в пароле.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+
+def l33t_variants(lowered: str) -> List[Tuple[str, Optional[Dict[str, str]]]]:
+    """
+    Варианты строки для поиска слов: как есть и после l33t-замен.
+
+    Args:
+        lowered (str): Пароль в нижнем регистре
+
+    Returns:
+        List[Tuple[str, Optional[Dict[str, str]]]]: (текст, таблица замен
+            или None для исходной строки)
+    """
+    variants: List[Tuple[str, Optional[Dict[str, str]]]] = [(lowered, None)]
+    for translation, table in zip(_L33T_TRANSLATIONS, L33T_TABLES, strict=True):
+        translated = lowered.translate(translation)
+        if translated != lowered and all(translated != text for text, _ in variants):
+            variants.append((translated, table))
+    return variants
+
+
+class WordMatcher:
+    """
+    Автомат Ахо-Корасик по словарю (слово -> ранг по частоте).
+
+    Все таблицы - плоские массивы int64, поэтому загруженный автомат
+    работает прямо поверх файла, отображенного в память (mmap): страницы
+    общие для всех процессов, в куче каждого воркера автомат не копируется.
+    """
+
+    def __init__(self, keys: Sequence[int], values: Sequence[int], fail: Sequence[int],
+                 lengths: Sequence[int], ranks: Sequence[int], output_link: Sequence[int],
+                 mapping: Optional[mmap.mmap] = None):
+        # keys/values - хэш-таблица переходов бора с открытой адресацией
+        # (ключ state << 21 | ord(char), EMPTY_KEY - пустая ячейка),
+        # fail[state] - суффиксная ссылка, lengths/ranks[state] - длина и
+        # ранг слова, оканчивающегося в state (длина 0 - слова нет),
+        # output_link[state] - ближайшее по суффиксным ссылкам состояние
+        # со словом (0 - нет)
+        self._keys = keys
+        self._values = values
+        self._mask = len(keys) - 1
+        self._fail = fail
+        self._lengths = lengths
+        self._ranks = ranks
+        self._output_link = output_link
+        self._mapping = mapping
+        # Ключ перехода -> состояние (-1 - перехода нет)
+        self._cache: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """Число слов в автомате."""
+        return sum(1 for length in self._lengths if length)
+
+    @classmethod
+    def build(cls, words: List[str]) -> "WordMatcher":
+        """
+        Строит автомат по словам (ранг - позиция слова в списке).
+
+        Args:
+            words: Слова в порядке убывания частоты
+        """
+        transitions: Dict[int, int] = {}
+        children: List[List[int]] = [[]]
+        lengths = [0]
+        ranks = [0]
+        for rank, word in enumerate(words, 1):
+            word = word.lower()
+            if len(word) < MIN_WORD_LENGTH:
+                continue
+            state = 0
+            for char in word:
+                key = state << 21 | ord(char)
+                next_state = transitions.get(key)
+                if next_state is None:
+                    next_state = len(lengths)
+                    transitions[key] = next_state
+                    children[state].append(key)
+                    children.append([])
+                    lengths.append(0)
+                    ranks.append(0)
+                state = next_state
+            if not lengths[state]:
+                lengths[state] = len(word)
+                ranks[state] = rank
+
+        # Суффиксные ссылки обходом в ширину
+        fail = [0] * len(lengths)
+        output_link = [0] * len(lengths)
+        queue = deque(transitions[key] for key in children[0])
+        while queue:
+            state = queue.popleft()
+            for key in children[state]:
+                child = transitions[key]
+                code = key & 0x1FFFFF
+                queue.append(child)
+                link = fail[state]
+                while link and (link << 21 | code) not in transitions:
+                    link = fail[link]
+                target = transitions.get(link << 21 | code, 0)
+                fail[child] = target if target != child else 0
+                output_link[child] = (
+                    fail[child] if lengths[fail[child]] else output_link[fail[child]]
+                )
+
+        keys, values = _hash_table(transitions)
+        return cls(keys, values, array("q", fail), array("q", lengths),
+                   array("q", ranks), array("q", output_link))
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Находит все слова словаря в тексте за один проход.
+
+        Yields:
+            Tuple[int, int, int]: (начало, конец включительно, ранг)
+        """
+        keys, values, mask = self._keys, self._values, self._mask
+        fail, lengths, ranks = self._fail, self._lengths, self._ranks
+        output_link, cache = self._output_link, self._cache
+        state = 0
+        for index, char in enumerate(text):
+            code = ord(char)
+            # Переход по символу; если его нет - по суффиксным ссылкам
+            while True:
+                key = state << 21 | code
+                target = cache.get(key)
+                if target is None:
+                    slot = (key * _HASH_MULTIPLIER >> 32) & mask
+                    stored = keys[slot]
+                    while stored != key and stored != EMPTY_KEY:
+                        slot = (slot + 1) & mask
+                        stored = keys[slot]
+                    target = values[slot] if stored == key else -1
+                    if len(cache) >= TRANSITION_CACHE_SIZE:
+                        cache.clear()
+                    cache[key] = target
+                if target >= 0:
+                    state = target
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            found = state if lengths[state] else output_link[state]
+            while found:
+                yield index - lengths[found] + 1, index, ranks[found]
+                found = output_link[found]
+
+    def step(self, state: int, char: str) -> int:
+        """Переход автомата по одному символу (как в iter_matches)."""
+        keys, values, mask, cache = self._keys, self._values, self._mask, self._cache
+        code = ord(char)
+        while True:
+            key = state << 21 | code
+            target = cache.get(key)
+            if target is None:
+                slot = (key * _HASH_MULTIPLIER >> 32) & mask
+                stored = keys[slot]
+                while stored != key and stored != EMPTY_KEY:
+                    slot = (slot + 1) & mask
+                    stored = keys[slot]
+                target = values[slot] if stored == key else -1
+                if len(cache) >= TRANSITION_CACHE_SIZE:
+                    cache.clear()
+                cache[key] = target
+            if target >= 0:
+                return target
+            if not state:
+                return 0
+            state = self._fail[state]
+
+    def longest_word(self, state: int) -> int:
+        """Длина самого длинного слова, оканчивающегося в состоянии (0 - нет)."""
+        lengths = self._lengths
+        return lengths[state] or lengths[self._output_link[state]]
+
+    def save(self, path: str):
+        """
+        Сохраняет автомат в файл.
+
+        Формат - заголовок и плоские массивы int64 (хэш-таблица переходов
+        и таблицы состояний), которые load() отображает в память как есть.
+        """
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, len(self._keys), len(self._fail)))
+            for column in (self._keys, self._values, self._fail, self._lengths,
+                           self._ranks, self._output_link):
+                file.write(column)
+
+    @classmethod
+    def load(cls, path: str) -> "WordMatcher":
+        """
+        Подключает автомат, сохраненный save(), через mmap.
+
+        Файл не читается в память: таблицы - представления страниц файла,
+        общих для всех процессов, которые его открыли.
+
+        Raises:
+            ValueError: Файл не является сохраненным автоматом
+        """
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"Файл '{path}' не является словарем для поиска слов")
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, table_size, states = _HEADER.unpack_from(mapping)
+        sizes = [table_size, table_size, states, states, states, states]
+        if (magic != MAGIC or table_size & (table_size - 1)
+                or size != _HEADER.size + 8 * sum(sizes)):
+            mapping.close()
+            raise ValueError(f"Файл '{path}' не является словарем для поиска слов"
+                             " (автоматы старого формата нужно пересобрать)")
+
+        view = memoryview(mapping)
+        columns = []
+        offset = _HEADER.size
+        for count in sizes:
+            columns.append(view[offset:offset + 8 * count].cast("q"))
+            offset += 8 * count
+        return cls(*columns, mapping=mapping)
+
+    def close(self):
+        """Закрывает отображение файла (если автомат загружен load())."""
+        self._cache.clear()
+        if self._mapping is None:
+            return
+        for column in (self._keys, self._values, self._fail, self._lengths,
+                       self._ranks, self._output_link):
+            column.release()
+        self._mapping.close()
+        self._mapping = None
+
+
+def _hash_table(transitions: Dict[int, int]) -> Tuple[array, array]:
+    """Хэш-таблица переходов с линейным пробированием, заполненная не больше чем наполовину."""
+    size = 1
+    while size < 2 * len(transitions):
+        size <<= 1
+    mask = size - 1
+    keys = array("q", [EMPTY_KEY]) * size
+    values = array("q", [0]) * size
+    for key, value in transitions.items():
+        slot = (key * _HASH_MULTIPLIER >> 32) & mask
+        while keys[slot] != EMPTY_KEY:
+            slot = (slot + 1) & mask
+        keys[slot] = key
+        values[slot] = value
+    return keys, values
+
+
+def build_word_matcher(source_path: str, output_path: str) -> int:
+    """
+    Строит автомат по текстовому словарю и сохраняет его.
+
+    Args:
+        source_path (str): Словарь, одно слово на строку (частые - выше)
+        output_path (str): Куда сохранить автомат
+
+    Returns:
+        int: Число слов в автомате
+    """
+    with open(source_path, "r", encoding="utf-8", errors="replace") as file:
+        words = [line.strip() for line in file if line.strip()]
+    matcher = WordMatcher.build(words)
+    matcher.save(output_path)
+    return len(matcher)
+
+
+# Активный автомат процесса (подключается из конфигурации)
+_active: Optional[WordMatcher] = None
+
+
+def configure_word_matcher(path: str) -> Optional[WordMatcher]:
+    """
+    Подключает автомат для правила поиска слов и для estimator.py.
+
+    Args:
+        path (str): Путь к автомату; пустая строка отключает поиск слов
+
+    Returns:
+        Optional[WordMatcher]: Подключенный автомат или None
+    """
+    global _active
+    previous = _active
+    _active = WordMatcher.load(path) if path else None
+    if previous is not None:
+        previous.close()
+    return _active
+
+
+def get_word_matcher() -> Optional[WordMatcher]:
+    """Возвращает активный автомат (или None)."""
+    return _active
+
+
+def word_coverage(password: str) -> float:
+    """
+    Доля символов пароля, покрытых словами активного словаря.
+
+    Слова ищутся в пароле в нижнем регистре и в его l33t-нормализованных
+    вариантах. Без подключенного автомата возвращает 0.
+
+    Args:
+        password (str): Пароль для проверки
+
+    Returns:
+        float: Доля от 0 до 1
+    """
+    if _active is None or not password:
+        return 0.0
+    covered = bytearray(len(password))
+    for text, _ in l33t_variants(lower_keep_length(password)):
+        for start, end, _ in _active.iter_matches(text):
+            covered[start:end + 1] = b"\1" * (end - start + 1)
+    return sum(covered) / len(password)
+
+
+class CoverageState:
+    """
+    word_coverage для пароля, который дописывают по символу.
+
+    Для каждой длины префикса хранятся состояния автомата (по одному на
+    вариант: как есть и после каждой таблицы l33t-замен), число покрытых
+    символов и цепочка покрытых отрезков. Символ в конце обрабатывается
+    за O(1) (не считая слияния с отрезками внутри нового слова), а
+    удаление с конца - просто отбрасывание префиксов.
+
+    Символы переводятся в нижний регистр по одному, поэтому при
+    контекстных правилах регистра (греческая финальная сигма)
+    результат может отличаться от word_coverage.
+    """
+
+    __slots__ = ("matcher", "_prefixes")
+
+    def __init__(self, matcher: WordMatcher):
+        self.matcher = matcher
+        # (состояния по вариантам, покрыто символов, (начало, конец, предыдущий))
+        self._prefixes: List[tuple] = [((0,) * (len(L33T_TABLES) + 1), 0, None)]
+
+    def __len__(self) -> int:
+        """Число обработанных символов."""
+        return len(self._prefixes) - 1
+
+    def append(self, char: str):
+        """Обрабатывает следующий символ пароля."""
+        states, covered, intervals = self._prefixes[-1]
+        index = len(self._prefixes) - 1
+        lowered = char.lower()
+        if len(lowered) != 1:
+            lowered = char
+        matcher = self.matcher
+        next_states = [matcher.step(states[0], lowered)]
+        for state, table in zip(states[1:], L33T_TABLES, strict=True):
+            next_states.append(matcher.step(state, table.get(lowered, lowered)))
+        # Все слова оканчиваются на этом символе - достаточно самого длинного
+        start = index + 1
+        for state in next_states:
+            length = matcher.longest_word(state)
+            if length and index - length + 1 < start:
+                start = index - length + 1
+        if start <= index:
+            # Отрезки, которые пересекает новое слово, сливаются с ним
+            while intervals is not None and intervals[1] >= start:
+                covered -= intervals[1] - intervals[0] + 1
+                start = min(start, intervals[0])
+                intervals = intervals[2]
+            covered += index - start + 1
+            intervals = (start, index, intervals)
+        self._prefixes.append((tuple(next_states), covered, intervals))
+
+    def truncate(self, length: int):
+        """Оставляет первые length символов."""
+        del self._prefixes[length + 1:]
+
+    @property
+    def coverage(self) -> float:
+        """Доля покрытых символов (как word_coverage)."""
+        length = len(self._prefixes) - 1
+        return self._prefixes[-1][1] / length if length else 0.0
+
+
+def main():
+    """CLI для построения автомата по словарю."""
+    parser = argparse.ArgumentParser(
+        description="Построение автомата Ахо-Корасик для поиска слов в паролях"
+    )
+    parser.add_argument("wordlist", help="Словарь, одно слово на строку")
+    parser.add_argument("output", help="Файл автомата для записи")
+    args = parser.parse_args()
+
+    count = build_word_matcher(args.wordlist, args.output)
+    print(f"✅ Автомат '{args.output}' создан: {count} слов")
+
+
+if __name__ == "__main__":
+    main()
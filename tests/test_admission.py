@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from admission import (
+    BATCH,
+    SINGLE,
+    AdmissionLimiter,
+    AdmissionMiddleware,
+    collect_admission,
+)
+
+
+def test_limiter_queue_and_rejection():
+    """Тест: сверх лимита запросы ждут в очереди, сверх очереди - отклоняются."""
+    async def scenario():
+        limiter = AdmissionLimiter(limit=1, queue_size=1, timeout=5)
+        assert await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        assert not await limiter.acquire()
+        
+        limiter.release()
+        assert await waiting
+        assert limiter.stats()["active"] == 1
+        limiter.release()
+        return limiter.stats()
+    
+    stats = asyncio.run(scenario())
+    assert stats == {"limit": 1, "active": 0, "queue_depth": 0, "queue_size": 1,
+                     "admitted": 2, "rejected": 1}
+
+
+def test_limiter_queue_timeout_and_cancel():
+    """Тест: ожидание ограничено таймаутом, ушедший клиент не занимает место."""
+    async def scenario():
+        limiter = AdmissionLimiter(limit=1, queue_size=4, timeout=0.01)
+        assert await limiter.acquire()
+        assert not await limiter.acquire()
+        
+        limiter.timeout = 5
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert limiter.queue_depth == 0
+        limiter.release()
+        return limiter.stats()
+    
+    stats = asyncio.run(scenario())
+    assert stats["active"] == 0
+    assert stats["rejected"] == 1
+
+
+def test_middleware_separate_budgets():
+    """Тест: пакеты не занимают бюджет /check; отказ - 503 с Retry-After."""
+    async def scenario():
+        limiters = {
+            SINGLE: AdmissionLimiter(limit=1, queue_size=0, timeout=1),
+            BATCH: AdmissionLimiter(limit=1, queue_size=0, timeout=1),
+        }
+        gate = asyncio.Event()
+        
+        async def app(scope, receive, send):
+            if scope["path"] == "/check/batch":
+                await gate.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+        
+        middleware = AdmissionMiddleware(app, limiters, retry_after=2)
+        
+        async def call(path):
+            messages = []
+            
+            async def send(message):
+                messages.append(message)
+            
+            await middleware({"type": "http", "path": path}, None, send)
+            return messages[0]
+        
+        slow_batch = asyncio.create_task(call("/check/batch"))
+        await asyncio.sleep(0)
+        rejected = await call("/check/stream")
+        single = await call("/check")
+        health = await call("/health")
+        gate.set()
+        batch = await slow_batch
+        return rejected, single, health, batch, collect_admission(limiters)
+    
+    rejected, single, health, batch, lines = asyncio.run(scenario())
+    assert rejected["status"] == 503
+    assert (b"retry-after", b"2") in rejected["headers"]
+    assert single["status"] == health["status"] == batch["status"] == 200
+    assert 'admission_rejected_total{class="batch"} 1' in lines
+    assert 'admission_admitted_total{class="single"} 1' in lines
+    assert 'admission_queue_depth{class="batch"} 0' in lines
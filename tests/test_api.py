@@ -2,6 +2,8 @@
 Тесты для API (требует запущенного сервера).
 """
 
+import json
+
 import pytest
 import requests
 
@@ -55,6 +57,166 @@ def test_api_batch_check(api_url):
     assert len(data["results"]) == 3
 
 
+def test_api_fast_response_matches_schema(api_url):
+    """Тест: ответ без response_model совпадает с моделью, схема OpenAPI прежняя."""
+    response = requests.post(
+        f"{api_url}/check/batch",
+        json={"passwords": ["Пароль1!", "qwerty"]}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert set(data) == {"results", "total_count", "strong_count", "weak_count"}
+    assert set(data["results"][0]) == {"password", "score", "max_score", "strength", "details"}
+    assert data["results"][0]["password"] == "Пароль1!"
+
+    paths = requests.get(f"{api_url}/openapi.json").json()["paths"]
+    schema = paths["/check"]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"$ref": "#/components/schemas/CheckResult"}
+    # /check/batch отдает и сводку (mode=summary)
+    schema = paths["/check/batch"]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/BatchResult"} in schema["anyOf"]
+
+
+def test_api_binary_batch(api_url):
+    """Тест: кадры с длиной и MessagePack дают те же баллы, что и JSON."""
+    from codec import FRAMES_HEADER, FRAMES_TYPE, encode_frames
+
+    passwords = ["123", "password", "P@ssw0rd!", "Пароль1!Xy"]
+    expected = requests.post(
+        f"{api_url}/check/batch", json={"passwords": passwords}
+    ).json()
+    scores = [result["score"] for result in expected["results"]]
+
+    for path in ("/check/batch", "/check/batch/binary"):
+        response = requests.post(
+            f"{api_url}{path}",
+            data=encode_frames(passwords),
+            headers={"Content-Type": FRAMES_TYPE},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == FRAMES_TYPE
+        count, _, strong, weak = FRAMES_HEADER.unpack_from(response.content)
+        assert (count, strong, weak) == (4, expected["strong_count"], expected["weak_count"])
+        assert list(response.content[FRAMES_HEADER.size:][:count]) == scores
+
+    msgpack = pytest.importorskip("msgpack")
+    response = requests.post(
+        f"{api_url}/check/batch/binary",
+        data=msgpack.packb({"passwords": passwords}),
+        headers={"Content-Type": "application/msgpack"},
+    )
+    assert response.status_code == 200
+    assert list(msgpack.unpackb(response.content)["scores"]) == scores
+
+    response = requests.post(f"{api_url}/check/batch/binary", json={"passwords": passwords})
+    assert response.status_code == 415
+
+
+def test_api_batch_summary(api_url):
+    """Тест: mode=summary - только сводка, размер ответа не зависит от пакета."""
+    passwords = ["123", "password", "P@ssw0rd!", "Пароль1!Xy"]
+    full = requests.post(f"{api_url}/check/batch", json={"passwords": passwords}).json()
+    sizes = []
+    for count in (1, 100):
+        response = requests.post(
+            f"{api_url}/check/batch?mode=summary", json={"passwords": passwords * count}
+        )
+        assert response.status_code == 200
+        sizes.append(len(response.content))
+    data = response.json()
+    assert "results" not in data
+    assert data["total_count"] == 400
+    assert data["strong_count"] == full["strong_count"] * 100
+    assert sum(data["strength_histogram"].values()) == 400
+    assert set(data["score"]) == {"mean", "min", "max", "p50", "p90", "p99"}
+    assert data["failed_rules"]["digits"] == 100
+    # Растут только числа в сводке
+    assert sizes[1] - sizes[0] < 50
+
+    response = requests.post(f"{api_url}/check/batch?mode=all", json={"passwords": passwords})
+    assert response.status_code == 422
+
+
+def test_api_stream_check(api_url):
+    """Тест потоковой проверки: NDJSON с итоговой строкой."""
+    response = requests.post(
+        f"{api_url}/check/stream",
+        data="123\npassword\n\nP@ssw0rd!\n".encode("utf-8"),
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 4
+    assert lines[0]["password"] == "123"
+    assert lines[-1]["summary"]["total_count"] == 3
+
+
+def test_api_websocket_meter():
+    """Тест индикатора сложности по WebSocket: в ответ - только изменения."""
+    from starlette.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+
+    import api
+
+    with TestClient(api.app).websocket_connect("/check/ws") as websocket:
+        state = websocket.receive_json()
+        assert state["score"] == 0 and state["max_score"] == 100
+        assert set(state["rules"]) == {
+            "min_length", "digits", "uppercase", "lowercase", "special", "not_common"
+        }
+
+        websocket.send_json({"op": "append", "text": "Pass"})
+        diff = websocket.receive_json()
+        assert diff["rules"] == {"uppercase": True, "lowercase": True, "not_common": True}
+        assert "max_score" not in diff and "password" not in diff
+
+        websocket.send_json({"op": "append", "text": "w0rd!"})
+        diff = websocket.receive_json()
+        assert diff["score"] == 100
+        assert diff["rules"] == {"min_length": True, "digits": True, "special": True}
+
+        websocket.send_json({"op": "replace", "start": 5, "end": 6, "text": "o"})
+        diff = websocket.receive_json()
+        assert diff["rules"] == {"digits": False}
+
+        websocket.send_json({"op": "set", "text": "Passwerd!"})
+        websocket.send_json({"op": "delete", "count": 9})
+        diff = websocket.receive_json()
+        assert diff["score"] == 0
+
+        websocket.send_json({"op": "append", "text": "x" * 10_000})
+        assert "error" in websocket.receive_json()
+        websocket.send_json({"text": "a"})
+        assert "error" in websocket.receive_json()
+        websocket.send_text("not json")
+        assert "error" in websocket.receive_json()
+
+        websocket.send_bytes(b"\x00")
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+        assert closed.value.code == 1003
+
+
+def test_api_batch_too_large(api_url):
+    """Тест ограничения размера пакета (MAX_BATCH_SIZE)."""
+    config = requests.get(f"{api_url}/config").json()["config"]
+    response = requests.post(
+        f"{api_url}/check/batch",
+        json={"passwords": ["x"] * (config["max_batch_size"] + 1)}
+    )
+    assert response.status_code == 413
+
+
+def test_api_password_too_long(api_url):
+    """Тест ограничения длины пароля (MAX_PASSWORD_LENGTH)."""
+    config = requests.get(f"{api_url}/config").json()["config"]
+    response = requests.post(
+        f"{api_url}/check",
+        json={"password": "x" * (config["max_password_length"] + 1)}
+    )
+    assert response.status_code == 422
+
+
 def test_api_config(api_url):
     """Тест эндпоинта конфигурации."""
     response = requests.get(f"{api_url}/config")
@@ -64,6 +226,20 @@ def test_api_config(api_url):
     assert "password_rules" in data
 
 
+def test_api_metrics(api_url):
+    """Тест метрик в формате Prometheus."""
+    requests.post(f"{api_url}/check", json={"password": "P@ssw0rd!"})
+    response = requests.get(f"{api_url}/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'http_requests_total{route="/check",method="POST",status="200"}' in text
+    assert 'http_request_duration_seconds_bucket{route="/check",le="+Inf"}' in text
+    assert "password_strength_total" in text
+    assert 'password_rule_evaluations_total{rule="not_common"}' in text
+    assert 'admission_queue_depth{class="batch"}' in text
+
+
 def test_api_invalid_json(api_url):
     """Тест обработки невалидного JSON."""
     response = requests.post(
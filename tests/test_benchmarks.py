@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from loadgen import LatencyHistogram, StepStats, is_saturated, parse_mix  # noqa: E402
+from run import compare_metrics  # noqa: E402
+
+
+def test_compare_flags_regressions():
+    """Тест: сравнение учитывает направление метрики и порог."""
+    base = {
+        "throughput": {"value": 1000.0, "unit": "ops/s", "better": "higher"},
+        "latency": {"value": 10.0, "unit": "ms", "better": "lower"},
+        "stable": {"value": 50.0, "unit": "ops/s", "better": "higher"},
+        "removed": {"value": 1.0, "unit": "ops/s", "better": "higher"},
+    }
+    new = {
+        "throughput": {"value": 800.0, "unit": "ops/s", "better": "higher"},
+        "latency": {"value": 5.0, "unit": "ms", "better": "lower"},
+        "stable": {"value": 52.0, "unit": "ops/s", "better": "higher"},
+    }
+    statuses = {row[0]: row[4] for row in compare_metrics(base, new, threshold=10)}
+    assert statuses == {"latency": "improved", "stable": "ok", "throughput": "regression"}
+
+
+def test_latency_histogram_percentiles():
+    """Тест: перцентили гистограммы задержек с погрешностью не больше 1.6%."""
+    histogram = LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value)
+    assert histogram.total == 100_000
+    assert histogram.min == 1 and histogram.max == 100_000
+    for percentile in (50, 90, 99, 99.9):
+        expected = percentile / 100 * 100_000
+        assert abs(histogram.value_at_percentile(percentile) - expected) <= expected * 0.016
+    assert histogram.value_at_percentile(100) == 100_000
+
+    merged = LatencyHistogram()
+    merged.merge(histogram)
+    merged.merge(histogram)
+    assert merged.total == 200_000
+    assert merged.value_at_percentile(50) == histogram.value_at_percentile(50)
+    assert merged.percentile_distribution()[-1] == (100_000, 1.0, 200_000)
+
+
+def test_loadgen_mix_and_saturation():
+    """Тест: разбор смеси маршрутов и признаки насыщения."""
+    assert parse_mix("check=3,batch=1") == [("check", 0.75), ("batch", 0.25)]
+    with pytest.raises(ValueError):
+        parse_mix("check=1,login=1")
+
+    def step(load, completed, errors=0):
+        stats = StepStats(load)
+        for _ in range(completed):
+            stats.record("check", 1000)
+        stats.sent = completed + errors
+        stats.errors = {"HTTP 503": errors} if errors else {}
+        stats.elapsed = 1.0
+        return stats
+
+    assert is_saturated("open", step(100, 99), None) is None
+    assert is_saturated("open", step(100, 80), None)
+    assert is_saturated("open", step(100, 99, errors=5), None)
+    assert is_saturated("open", step(100, 99), None, slo_ms=0.5)
+    assert is_saturated("closed", step(8, 1000), step(4, 600)) is None
+    assert is_saturated("closed", step(16, 1010), step(8, 1000))
@@ -0,0 +1,70 @@
+import pytest
+
+import blocklist
+from blocklist import Blocklist, build_blocklist, configure_blocklist
+from checker import evaluate_password
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """Собирает небольшой индекс блок-листа."""
+    wordlist = tmp_path / "words.txt"
+    words = [f"leaked{i}" for i in range(1000)] + ["Tr0ub4dor&3", "", "leaked1"]
+    wordlist.write_text("\n".join(words), encoding="utf-8")
+    path = tmp_path / "blocklist.idx"
+    assert build_blocklist(str(wordlist), str(path)) == 1001
+    return str(path)
+
+
+def test_blocklist_membership(index_path):
+    """Тест поиска в индексе."""
+    index = Blocklist(index_path)
+    assert len(index) == 1001
+    assert "leaked0" in index
+    assert "leaked999" in index
+    assert "tr0ub4dor&3" in index  # регистр не учитывается
+    assert "not-leaked" not in index
+    assert "leaked1000" not in index
+    index.close()
+
+
+def test_blocklist_rejects_foreign_file(tmp_path):
+    """Тест: произвольный файл не принимается за индекс."""
+    path = tmp_path / "junk.idx"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        Blocklist(str(path))
+
+
+def test_checker_uses_active_blocklist(index_path):
+    """Тест: подключенный блок-лист влияет на правило простых паролей."""
+    try:
+        assert evaluate_password("Tr0ub4dor&3")["details"][5]["passed"]
+        configure_blocklist(index_path)
+        assert not evaluate_password("Tr0ub4dor&3")["details"][5]["passed"]
+    finally:
+        configure_blocklist("")
+    assert blocklist._active is None
+
+
+def test_build_in_chunks_matches_single_pass(tmp_path, index_path, monkeypatch):
+    """Тест: сборка порциями дает тот же индекс, что и за один проход."""
+    monkeypatch.setattr(blocklist, "BUILD_CHUNK_SIZE", 64)
+    monkeypatch.setattr(blocklist, "BUILD_READ_BLOCK", 50)
+    path = tmp_path / "chunked.idx"
+    assert build_blocklist(str(tmp_path / "words.txt"), str(path)) == 1001
+    assert path.read_bytes() == open(index_path, "rb").read()
+    # Временные порции удалены
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == ["blocklist.idx", "chunked.idx", "words.txt"]
+
+
+def test_reconfigure_closes_previous_index(index_path):
+    """Тест: при замене блок-листа старое отображение закрывается."""
+    try:
+        first = configure_blocklist(index_path)
+        second = configure_blocklist(index_path)
+        assert first._mm.closed and not second._mm.closed
+    finally:
+        configure_blocklist("")
+    assert second._mm.closed
@@ -0,0 +1,64 @@
+from cache import ResultCache, build_result_cache, policy_version
+from checker import evaluate_password
+
+
+class FakeClock:
+    """Управляемые часы для проверки TTL."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hit_returns_same_result():
+    """Тест: повторная проверка берется из кэша."""
+    cache = ResultCache(maxsize=10, ttl=60, version="v1")
+    first = cache.evaluate("P@ssw0rd!")
+    second = cache.evaluate("P@ssw0rd!")
+    
+    assert first == second == evaluate_password("P@ssw0rd!")
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_entry_is_not_shared():
+    """Тест: изменение выданного результата не портит запись кэша."""
+    cache = ResultCache(maxsize=10, ttl=60, version="v1")
+    first = cache.evaluate("P@ssw0rd!")
+    first["details"][0]["passed"] = None
+    cache.evaluate("P@ssw0rd!")["details"].clear()
+
+    assert cache.evaluate("P@ssw0rd!") == evaluate_password("P@ssw0rd!")
+
+
+def test_cache_does_not_store_plaintext():
+    """Тест: ни ключи, ни значения не содержат пароль."""
+    cache = ResultCache(maxsize=10, ttl=60, version="v1")
+    cache.evaluate("SecretValue123!")
+    
+    for key, (_, stored) in cache._data.items():
+        assert b"SecretValue123!" not in key
+        assert "password" not in stored
+
+
+def test_cache_ttl_and_size_limit():
+    """Тест вытеснения по времени жизни и по размеру."""
+    clock = FakeClock()
+    cache = ResultCache(maxsize=2, ttl=10, version="v1", clock=clock)
+    cache.evaluate("a")
+    cache.evaluate("b")
+    cache.evaluate("c")
+    assert cache.stats()["size"] == 2
+    assert cache.get("a") is None
+    
+    clock.now = 11
+    assert cache.get("c") is None
+
+
+def test_policy_version_tracks_config():
+    """Тест: изменение политики меняет версию (и ключи кэша)."""
+    config = {"min_password_length": 8, "result_cache_enabled": False}
+    assert build_result_cache(config) is None
+    assert policy_version(config) != policy_version({**config, "min_password_length": 12})
@@ -1,5 +1,25 @@
 import pytest
-from checker import evaluate_password
+
+import checker
+from checker import (
+    BATCH_MIN_VECTOR_SIZE,
+    DEFAULT_POLICY,
+    RULE_DIGITS,
+    RULE_NOT_COMMON,
+    BatchSummary,
+    PasswordState,
+    batch_to_dicts,
+    check_common_passwords,
+    check_digits,
+    check_length,
+    check_lowercase,
+    check_special_chars,
+    check_uppercase,
+    evaluate,
+    evaluate_batch,
+    evaluate_password,
+    scan_password,
+)
 
 
 def test_empty_password():
@@ -74,8 +94,96 @@ def test_password_details_structure():
         assert "score" in detail
 
 
+@pytest.mark.parametrize("password", ["a", "Ab1!", "ПарольЁ9", "qwerty", "x y\tz", "²³¹"])
+def test_single_pass_matches_rule_functions(password):
+    """Тест: однопроходный сканер дает те же детали, что и отдельные правила."""
+    expected = [
+        check_length(password),
+        check_digits(password),
+        check_uppercase(password),
+        check_lowercase(password),
+        check_special_chars(password),
+        check_common_passwords(password),
+    ]
+    assert evaluate_password(password)["details"] == expected
+
+
+@pytest.mark.parametrize("min_vector_size", [0, BATCH_MIN_VECTOR_SIZE])
+def test_batch_matches_single_evaluation(monkeypatch, min_vector_size):
+    """Тест: пакетная оценка (NumPy и цикл) совпадает с поштучной."""
+    monkeypatch.setattr(checker, "BATCH_MIN_VECTOR_SIZE", min_vector_size)
+    passwords = ["", "123", "password", "Password123!", "ПарольЁ9!", "😀Ab1", "x" * 300]
+    columns = evaluate_batch(passwords)
+
+    assert list(columns["score"]) == [evaluate_password(p)["score"] for p in passwords]
+    assert batch_to_dicts(passwords, columns) == [evaluate_password(p) for p in passwords]
+
+
+def test_batch_summary_matches_results():
+    """Тест: сводка по пакету совпадает с подсчетом по полным результатам."""
+    passwords = ["", "123", "password", "Password123!", "ПарольЁ9!", "qwerty", "x" * 300] * 3
+    results = [evaluate_password(p) for p in passwords]
+    half = len(passwords) // 2
+    summary = BatchSummary.from_columns(evaluate_batch(passwords[:half]), DEFAULT_POLICY)
+    summary.merge(BatchSummary.from_columns(evaluate_batch(passwords[half:]), DEFAULT_POLICY))
+    data = summary.to_dict()
+
+    scores = sorted(result["score"] for result in results)
+    assert data["score"]["min"] == scores[0] and data["score"]["max"] == scores[-1]
+    assert data["score"]["p50"] == scores[(len(scores) + 1) // 2 - 1]
+    assert sum(data["strength_histogram"].values()) == len(passwords)
+    assert data["strength_histogram"]["Очень слабый"] == sum(
+        result["strength"] == "Очень слабый" for result in results
+    )
+    assert data["failed_rules"]["digits"] == sum(
+        not result["password"] or not result["details"][1]["passed"] for result in results
+    )
+    assert "guessability" not in data["failed_rules"]
+
+
+def test_compact_evaluation():
+    """Тест компактного результата: маска правил и ленивые детали."""
+    result = evaluate("abc123")
+
+    assert not hasattr(result, "__dict__")
+    assert result.passed & RULE_DIGITS
+    assert not result.passed & RULE_NOT_COMMON
+    assert result.score == evaluate_password("abc123")["score"]
+    assert result.strength == evaluate_password("abc123")["strength"]
+    assert result.to_dict() == evaluate_password("abc123")
+    assert evaluate("").to_dict() == evaluate_password("")
+
+
+def test_password_state_matches_evaluation():
+    """Тест: инкрементальная оценка совпадает с оценкой пароля целиком."""
+    state = PasswordState()
+    typed = ""
+    for char in "Pa$sw0rdЁ😀1":
+        state.append(char)
+        typed += char
+        assert state.result().to_dict() == evaluate_password(typed)
+
+    state.delete(3)
+    assert state.password == typed[:-3]
+    assert state.result().to_dict() == evaluate_password(typed[:-3])
+    state.set("Pa55word")
+    assert state.result().to_dict() == evaluate_password("Pa55word")
+    assert state.result().rule_states()["special"] is False
+    state.delete(100)
+    assert state.result().to_dict() == evaluate_password("")
+
 if __name__ == "__main__":
     # Запуск тестов без pytest (для отладки)
     test_empty_password()
     test_good_password()
-    print("✅ Все тесты пройдены!")
\ No newline at end of file
+    print("✅ Все тесты пройдены!")
+
+
+def test_class_table_matches_scan():
+    """Тест: векторная таблица классов BMP совпадает с scan_password."""
+    pytest.importorskip("numpy")
+    checker._load_numpy()
+    table = checker._get_class_table()
+    expected = [scan_password(chr(code)) for code in range(1, 0x10000)]
+    assert table[0] == 0
+    assert table[1:].tolist() == expected
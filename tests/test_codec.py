@@ -0,0 +1,52 @@
+import struct
+
+import pytest
+
+import codec
+from codec import (
+    FRAMES_HEADER,
+    FRAMES_TYPE,
+    decode_frames,
+    decode_passwords,
+    encode_frames,
+    encode_results,
+)
+
+
+def test_frames_round_trip():
+    """Тест: кадры с длиной разбираются обратно в те же пароли."""
+    passwords = ["", "123", "Пароль1!", "x" * 300]
+    assert decode_frames(encode_frames(passwords), max_bytes=1024) == passwords
+
+
+def test_frames_errors():
+    """Тест: обрезанные, слишком длинные и не UTF-8 кадры отклоняются."""
+    data = encode_frames(["password"])
+    with pytest.raises(ValueError):
+        decode_frames(data[:-1], max_bytes=64)
+    with pytest.raises(ValueError):
+        decode_frames(data[:2], max_bytes=64)
+    with pytest.raises(ValueError):
+        decode_frames(data, max_bytes=4)
+    with pytest.raises(ValueError):
+        decode_frames(struct.pack("!I", 2) + b"\xff\xfe", max_bytes=64)
+
+
+def test_encode_results_frames():
+    """Тест: ответ в кадрах - заголовок и три столбца по байту на пароль."""
+    body = encode_results(FRAMES_TYPE, 100, b"\x1e\x64", b"\x01\x04", b"\x1d\x00", 1, 1)
+    assert FRAMES_HEADER.unpack_from(body) == (2, 100, 1, 1)
+    assert body[FRAMES_HEADER.size:] == b"\x1e\x64" + b"\x01\x04" + b"\x1d\x00"
+
+
+@pytest.mark.skipif(codec.msgpack is None, reason="msgpack не установлен")
+def test_msgpack_request_forms():
+    """Тест: MessagePack - список строк или {"passwords": [...]}."""
+    packb = codec.msgpack.packb
+    passwords = ["123", "Пароль1!"]
+    assert decode_passwords(packb(passwords), "application/msgpack", 64) == passwords
+    assert decode_passwords(packb({"passwords": passwords}), "application/msgpack", 64) == passwords
+    with pytest.raises(ValueError):
+        decode_passwords(packb([1, 2]), "application/msgpack", 64)
+    with pytest.raises(ValueError):
+        decode_passwords(b"\xc1", "application/msgpack", 64)
@@ -0,0 +1,27 @@
+import os
+import random
+from collections import Counter
+
+from dedup import PasswordCounter
+
+
+def test_counts_in_memory():
+    """Тест: без выгрузки пароли считаются в порядке первого появления."""
+    with PasswordCounter() as counter:
+        counter.update(["123456", "qwerty", "123456", "x\ty", "123456"])
+        assert list(counter.items()) == [("123456", 3), ("qwerty", 1), ("x\ty", 1)]
+        assert counter.total == 5 and counter.spills == 0
+
+
+def test_spill_to_disk_buckets(tmp_path):
+    """Тест: с выгрузкой в корзины (и повторным делением) счет тот же."""
+    rng = random.Random(5)
+    passwords = [f"pw{rng.randint(0, 3000)}" for _ in range(20000)] + ["пароль\tЁ"] * 7
+    expected = Counter(passwords)
+    
+    with PasswordCounter(max_unique=100, partitions=4, spill_dir=str(tmp_path)) as counter:
+        counter.update(passwords)
+        assert counter.spills > 1
+        assert dict(counter.items()) == expected
+        assert counter.total == len(passwords)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,86 @@
+import sys
+import time
+
+import pytest
+
+from checker import evaluate_batch, evaluate_password
+from estimator import ADJACENCY_GRAPHS, MAX_ANALYZED_LENGTH, estimate_guesses
+
+
+@pytest.mark.parametrize("password,pattern", [
+    ("password", "dictionary"),
+    ("P@ssw0rd", "l33t"),
+    ("drowssap", "reversed"),
+    ("zxcvbnm,./", "spatial"),
+    ("abcdefg", "sequence"),
+    ("aaaaaaaa", "repeat"),
+    ("12.05.1990", "date"),
+])
+def test_patterns_are_detected(password, pattern):
+    """Тест распознавания шаблонов."""
+    result = estimate_guesses(password)
+    assert [match["pattern"] for match in result["sequence"]] == [pattern]
+    assert result["score"] <= 1
+
+
+def test_random_password_is_strong():
+    """Тест: случайный пароль без шаблонов подбирается долго."""
+    result = estimate_guesses("xK9#mQ2$vL7!pR")
+    assert result["score"] == 4
+    assert result["sequence"][0]["pattern"] == "bruteforce"
+
+
+def test_sequence_covers_password():
+    """Тест: найденные шаблоны покрывают весь пароль без пропусков."""
+    password = "MySuper$tr0ngP@ss!1990"
+    sequence = estimate_guesses(password)["sequence"]
+    assert "".join(match["token"] for match in sequence) == password
+
+
+def test_keyboard_graph_neighbours():
+    """Тест графа соседства клавиш qwerty."""
+    neighbours = [key for key in ADJACENCY_GRAPHS["qwerty"]["g"] if key]
+    assert sorted(neighbours) == sorted(["fF", "tT", "yY", "hH", "bB", "vV"])
+
+
+def test_estimator_rule_caps_score():
+    """Тест: правило оценки подбора ограничивает итоговый балл."""
+    plain = evaluate_password("Password1!")
+    estimated = evaluate_password("Password1!", estimate=True)
+    
+    assert plain["strength"] == "Очень сильный"
+    assert estimated["score"] < 70
+    assert estimated["details"][-1]["rule"] == "Устойчивость к подбору"
+    assert not estimated["details"][-1]["passed"]
+
+
+def test_long_password_does_not_overflow():
+    """Тест: пароль максимальной длины оценивается без переполнения."""
+    password = "xK9#mQ2$vL7!pR" * 74
+    result = estimate_guesses(password[:1024])
+    assert result["score"] == 4
+    assert result["guesses_log10"] > sys.float_info.max_10_exp
+    assert result["guesses"] == sys.float_info.max
+
+    estimated = evaluate_password(password[:1024], estimate=True)
+    assert estimated["details"][-1]["passed"]
+    assert "10^inf" not in estimated["details"][-1]["message"]
+
+
+def test_worst_case_time_is_bounded():
+    """Тест: повтор одного символа не раздувает поиск разложения."""
+    password = "a" * MAX_ANALYZED_LENGTH
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        result = estimate_guesses(password)
+        best = min(best, time.perf_counter() - started)
+    assert result["sequence"][0]["pattern"] == "repeat"
+    # Без ограничений (и с префиксом в 100 символов) - около 40 мс
+    assert best < 0.02
+
+    # Одинаковые пароли пакета оцениваются один раз
+    started = time.perf_counter()
+    batch = evaluate_batch([password] * 500, estimate=True)
+    assert time.perf_counter() - started < 0.2
+    assert set(batch["guess_score"]) == {0}
@@ -0,0 +1,206 @@
+import io
+import json
+import os
+import pstats
+import select
+import sys
+import time
+
+import pytest
+
+import checker
+import main as cli
+import policy
+from checker import DEFAULT_POLICY, BatchSummary, evaluate_batch, evaluate_password
+from main import check_from_file, dedup_from_file, main, run_profiled, stream_from_file
+
+
+def test_stream_ndjson(tmp_path):
+    """Тест потокового режима: NDJSON, по одному результату на строку."""
+    passwords = ["123", "password", "", "P@ssw0rd!"]
+    path = tmp_path / "passwords.txt"
+    path.write_text("\n".join(passwords), encoding="utf-8")
+
+    out = io.StringIO()
+    stream_from_file(str(path), json_output=True, out=out, chunk_size=2)
+
+    lines = out.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        evaluate_password(pwd) for pwd in passwords if pwd
+    ]
+
+
+def test_stream_reads_stdin(monkeypatch):
+    """Тест чтения паролей из stdin ("-")."""
+    monkeypatch.setattr("sys.stdin", io.StringIO("abc\nqwerty\n"))
+
+    out = io.StringIO()
+    stream_from_file("-", out=out)
+
+    text = out.getvalue()
+    assert "1. 'abc'" in text
+    assert "2. 'qwerty'" in text
+    assert "Проверено паролей: 2" in text
+
+
+def test_parallel_matches_serial(tmp_path):
+    """Тест: проверка в пуле процессов дает тот же вывод, что и без него."""
+    path = tmp_path / "passwords.txt"
+    path.write_text("\n".join(f"Pass{i}word!" for i in range(50)), encoding="utf-8")
+
+    serial = io.StringIO()
+    stream_from_file(str(path), json_output=True, out=serial, chunk_size=7)
+    ordered = io.StringIO()
+    stream_from_file(str(path), json_output=True, out=ordered, chunk_size=7, workers=2)
+    unordered = io.StringIO()
+    stream_from_file(
+        str(path),
+        json_output=True,
+        out=unordered,
+        chunk_size=7,
+        workers=2,
+        ordered=False,
+    )
+
+    assert ordered.getvalue() == serial.getvalue()
+    assert sorted(unordered.getvalue().splitlines()) == sorted(
+        serial.getvalue().splitlines()
+    )
+
+
+@pytest.mark.parametrize("option", ["--chunk-size", "--workers", "--dedup-memory"])
+@pytest.mark.parametrize("value", ["0", "-5", "x"])
+def test_rejects_non_positive_numbers(tmp_path, monkeypatch, capsys, option, value):
+    """Тест: числовые параметры меньше 1 - ошибка, а не пустая проверка."""
+    path = tmp_path / "passwords.txt"
+    path.write_text("123456\n", encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["main.py", "-f", str(path), option, value])
+    with pytest.raises(SystemExit) as exited:
+        main()
+    assert exited.value.code == 2
+    assert option in capsys.readouterr().err
+
+
+def test_profile_reports_rules(tmp_path, capsys):
+    """Тест --profile: разбивка по правилам, скорость и дамп cProfile."""
+    path = tmp_path / "passwords.txt"
+    path.write_text("\n".join(f"Pass{i}word!" for i in range(20)), encoding="utf-8")
+    dump = tmp_path / "audit.pstats"
+    active = policy.get_policy()
+    out = io.StringIO()
+    try:
+        count = run_profiled(lambda: stream_from_file(str(path), out=out), str(dump))
+    finally:
+        policy._active = active
+
+    assert count == 20
+    report = capsys.readouterr().err
+    assert "Паролей: 20" in report
+    assert "character_classes" in report
+    assert "not_common" in report
+    assert "Подготовка" in report
+    assert os.path.exists(dump)
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+
+def test_profile_excludes_batch_setup(tmp_path, capsys, monkeypatch):
+    """Тест --profile: построение таблицы классов не считается временем правила."""
+    monkeypatch.setattr(checker, "BATCH_MIN_VECTOR_SIZE", 0)
+    monkeypatch.setattr(checker, "_class_table", None)
+    path = tmp_path / "passwords.txt"
+    path.write_text("123456\nPassword1!\nqwerty\nXk9#mQ2$vL7!\n", encoding="utf-8")
+    active = policy.get_policy()
+    try:
+        run_profiled(lambda: stream_from_file(str(path), out=io.StringIO()))
+    finally:
+        policy._active = active
+
+    line = next(
+        line
+        for line in capsys.readouterr().err.splitlines()
+        if line.startswith("character_classes")
+    )
+    per_call = int(line.split()[3].replace(",", ""))
+    # Таблица на 65 тыс. символов строится миллисекунды - на 4 пароля это
+    # были бы миллионы нс на оценку
+    assert per_call < 200_000
+
+
+def test_dedup_weights_by_occurrences(tmp_path):
+    """Тест --dedup: уникальный пароль оценивается раз, сводка - по всем повторам."""
+    passwords = ["123456", "P@ssw0rd!", "123456", "qwerty", "123456", "P@ssw0rd!"]
+    source = tmp_path / "dump.txt"
+    source.write_text("\n".join(passwords) + "\n", encoding="utf-8")
+    out = io.StringIO()
+
+    assert dedup_from_file(str(source), json_output=True, out=out, max_unique=1) == 6
+
+    *rows, last = (json.loads(line) for line in out.getvalue().splitlines())
+    assert {row["password"]: row["count"] for row in rows} == {
+        "123456": 3,
+        "P@ssw0rd!": 2,
+        "qwerty": 1,
+    }
+    for row in rows:
+        assert row == {**evaluate_password(row["password"]), "count": row["count"]}
+
+    expected = BatchSummary.from_columns(
+        evaluate_batch(passwords), DEFAULT_POLICY
+    ).to_dict()
+    assert last["summary"] == {"total_count": 6, "unique_count": 3, **expected}
+
+
+@pytest.mark.parametrize("json_output", [True, False])
+def test_file_uses_result_cache(tmp_path, monkeypatch, capsys, json_output):
+    """Тест --file с RESULT_CACHE_ENABLED: повторы берутся из кэша, вывод прежний."""
+    passwords = ["123456", "P@ssw0rd!", "123456", "qwerty", "123456"]
+    path = tmp_path / "passwords.txt"
+    path.write_text("\n".join(passwords), encoding="utf-8")
+    check_from_file(str(path), json_output)
+    expected = capsys.readouterr().out
+
+    monkeypatch.setitem(cli.config, "result_cache_enabled", True)
+    monkeypatch.setattr(cli, "result_cache", None)
+    assert check_from_file(str(path), json_output) == 5
+
+    assert capsys.readouterr().out == expected
+    assert cli.result_cache.stats()["hits"] == 2
+    assert cli.result_cache.stats()["misses"] == 3
+
+
+def _read_until(fd: int, marker: bytes, timeout: float = 10) -> bytes:
+    """Читает вывод псевдотерминала, пока не встретится marker (или конец)."""
+    output = b""
+    deadline = time.monotonic() + timeout
+    while marker not in output and time.monotonic() < deadline:
+        if select.select([fd], [], [], 0.1)[0]:
+            try:
+                data = os.read(fd, 4096)
+            except OSError:
+                break
+            if not data:
+                break
+            output += data
+    return output
+
+
+def test_interactive_meter():
+    """Тест интерактивного режима: индикатор обновляется при каждом нажатии."""
+    pty = pytest.importorskip("pty")
+    pid, fd = pty.fork()
+    if pid == 0:
+        src = os.path.join(os.path.dirname(__file__), "..", "src")
+        os.execv(
+            sys.executable, [sys.executable, os.path.join(src, "main.py"), "-i", "-j"]
+        )
+
+    output = _read_until(fd, "Очень слабый".encode())
+    for keys in ("P", "a9", "x\x7f", "!", "\x1b[D", "\r"):
+        os.write(fd, keys.encode("utf-8"))
+    output += _read_until(fd, b"}\r\n")
+    os.waitpid(pid, 0)
+
+    text = output.decode("utf-8").replace("\r", "")
+    assert "*  30/100 Слабый" in text
+    assert "****  80/100 Сильный" in text
+    assert '"password": "Pa9!"' in text
@@ -0,0 +1,59 @@
+import threading
+
+from checker import Policy, RuleProfile
+from metrics import Registry
+
+
+def test_counter_and_histogram_render():
+    """Тест текстового формата счетчиков и гистограмм."""
+    registry = Registry()
+    requests = registry.counter("requests_total", "Запросы", ("route",))
+    durations = registry.histogram("duration_seconds", "Время", buckets=(0.1, 1.0))
+    requests.labels("/check").inc()
+    requests.labels("/check").inc(2)
+    durations.labels().observe(0.05)
+    durations.labels().observe(0.5)
+    durations.labels().observe(5)
+
+    text = registry.render()
+    assert '# TYPE requests_total counter' in text
+    assert 'requests_total{route="/check"} 3' in text
+    assert 'duration_seconds_bucket{le="0.1"} 1' in text
+    assert 'duration_seconds_bucket{le="1"} 2' in text
+    assert 'duration_seconds_bucket{le="+Inf"} 3' in text
+    assert "duration_seconds_sum 5.55" in text
+    assert "duration_seconds_count 3" in text
+
+
+def test_counter_sums_threads():
+    """Тест: счетчики потоков не теряются и суммируются при чтении."""
+    registry = Registry()
+    counter = registry.counter("events_total", "События").labels()
+
+    def work():
+        for _ in range(10000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert "events_total 40000" in registry.render()
+
+
+def test_rule_profile_counts_evaluations():
+    """Тест: профиль правил считает оценки одиночные и пакетные."""
+    profile = RuleProfile()
+    policy = Policy(profile=profile, estimate=True)
+    policy.evaluate("Password123!")
+    policy.evaluate("")
+    policy.evaluate_batch(["abc", "Tr0ub4dor&3"])
+
+    snapshot = profile.snapshot()
+    assert snapshot["character_classes"][0] == 3
+    assert snapshot["not_common"][0] == 3
+    assert snapshot["guessability"][0] == 3
+    assert all(nanoseconds >= 0 for _, nanoseconds in snapshot.values())
+    plain = Policy(estimate=True).evaluate_password("Password123!")
+    assert policy.evaluate_password("Password123!") == plain
@@ -0,0 +1,116 @@
+import pickle
+
+import pytest
+
+import checker
+import policy
+from cache import ResultCache
+from checker import (
+    DEFAULT_POLICY,
+    RULE_DIGITS,
+    RULE_GUESSES,
+    RULE_LENGTH,
+    RULE_NOT_COMMON,
+    RULE_SPECIAL,
+    RULE_UPPERCASE,
+    Policy,
+    evaluate_password,
+)
+from config import load_config
+
+
+@pytest.fixture
+def restore_policy():
+    """Возвращает исходную активную политику после теста."""
+    active = policy.get_policy()
+    yield
+    policy._active = active
+
+
+def test_default_policy_matches_evaluate_password():
+    """Тест: политика по умолчанию дает прежние результаты."""
+    for password in ["", "123", "password", "Password123", "MySuper$tr0ngP@ss!"]:
+        assert DEFAULT_POLICY.evaluate_password(password) == evaluate_password(password)
+
+
+def test_disabled_rules_are_removed():
+    """Тест: выключенные правила не проверяются и не выводятся."""
+    relaxed = Policy(min_length=12, require_special=False, require_uppercase=False)
+    result = relaxed.evaluate_password("longpassword123")
+
+    rules = [detail["rule"] for detail in result["details"]]
+    assert "Специальные символы" not in rules
+    assert "Заглавные буквы" not in rules
+    assert result["max_score"] == 65
+    assert result["score"] == 65
+    assert result["strength"] == "Очень сильный"
+    assert "минимум 12" in result["details"][0]["message"]
+
+
+def test_policy_batch_matches_single():
+    """Тест: пакетная оценка учитывает политику так же, как поштучная."""
+    strict = Policy(min_length=12, require_digits=False)
+    passwords = ["", "Password123", "Password!with-words", "abc123", "Кириллица2024!"]
+    columns = strict.evaluate_batch(passwords)
+    assert strict.batch_to_dicts(passwords, columns) == [
+        strict.evaluate_password(password) for password in passwords
+    ]
+
+
+def test_policy_pickle_roundtrip():
+    """Тест: политика передается в пул процессов и собирается заново."""
+    original = Policy(min_length=10, require_special=False, estimate=True)
+    restored = pickle.loads(pickle.dumps(original))
+    assert restored.version == original.version
+    assert restored.evaluate_password("Tr0ub4dor&3") == original.evaluate_password("Tr0ub4dor&3")
+
+
+def test_cache_separates_policies():
+    """Тест: результаты разных политик не смешиваются в кэше."""
+    cache = ResultCache(maxsize=10, ttl=60, version="v1")
+    strict = Policy(min_length=16)
+    assert cache.evaluate("Password123!") != cache.evaluate("Password123!", strict)
+    assert cache.evaluate("Password123!", strict) == strict.evaluate_password("Password123!")
+
+
+def test_reload_from_policy_file(tmp_path, monkeypatch, restore_policy):
+    """Тест: изменение файла политики подменяет активную политику."""
+    policy_file = tmp_path / "policy.env"
+    policy_file.write_text("MIN_PASSWORD_LENGTH=10\n", encoding="utf-8")
+    monkeypatch.setenv("POLICY_FILE", str(policy_file))
+    assert load_config()["min_password_length"] == 10
+
+    watcher = policy.PolicyWatcher(str(policy_file), interval=60)
+    assert not watcher.check()
+
+    policy_file.write_text("MIN_PASSWORD_LENGTH=14\nREQUIRE_SPECIAL_CHARS=false\n",
+                           encoding="utf-8")
+    assert watcher.check()
+    active = policy.get_policy()
+    assert active.min_length == 14
+    assert active.max_score == 80
+
+
+def test_reload_keeps_policy_on_error(monkeypatch, restore_policy):
+    """Тест: при ошибке чтения остается прежняя политика."""
+    active = policy.get_policy()
+    monkeypatch.setenv("POLICY_FILE", "/nonexistent/policy.env")
+    assert policy.reload_policy() is None
+    assert policy.get_policy() is active
+
+
+def test_failed_rules_mask(monkeypatch):
+    """Тест: маска провалов - только включенные правила; NumPy и списки совпадают."""
+    monkeypatch.setattr(checker, "BATCH_MIN_VECTOR_SIZE", 0)
+    passwords = ["", "password", "abc!def", "Abcdef12!x"]
+    relaxed = Policy(require_special=False, estimate=True)
+    columns = relaxed.evaluate_batch(passwords)
+    failed = [int(mask) for mask in relaxed.failed_rules(columns)]
+    assert failed[2] == RULE_LENGTH | RULE_DIGITS | RULE_UPPERCASE | RULE_GUESSES
+    assert failed[1] & RULE_NOT_COMMON and failed[1] & RULE_GUESSES
+    assert not any(mask & RULE_SPECIAL for mask in failed)
+    assert failed[3] & ~RULE_GUESSES == 0
+
+    python_columns = checker._evaluate_batch_python(passwords, relaxed)
+    python_columns["guess_score"] = [int(score) for score in columns["guess_score"]]
+    assert relaxed.failed_rules(python_columns) == failed
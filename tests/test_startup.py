@@ -0,0 +1,70 @@
+"""
+Тесты времени запуска CLI.
+
+Проверка одного пароля из CLI должна импортировать только нужное:
+тяжелые зависимости (NumPy, стек API, JSON, пул процессов, оценщик
+подбора) загружаются лениво. Время импорта меряется через -X importtime.
+"""
+
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# Бюджет на импорт main со всеми его модулями, мкс. Сейчас это около
+# 10 мс; одна только NumPy добавила бы ~60 мс
+IMPORT_BUDGET_US = 50_000
+
+# Модули, которые не должны загружаться при импорте main
+LAZY_MODULES = (
+    "numpy",
+    "fastapi",
+    "uvicorn",
+    "json",
+    "estimator",
+    "cache",
+    "cProfile",
+    "pstats",
+    "concurrent.futures",
+    "multiprocessing",
+)
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    # Байткод должен записываться, иначе меряется компиляция исходников
+    env = {key: value for key, value in os.environ.items()
+           if key != "PYTHONDONTWRITEBYTECODE"}
+    return subprocess.run(
+        [sys.executable, *args], cwd=SRC, env=env,
+        capture_output=True, text=True, check=True,
+    )
+
+
+def _import_time_us() -> int:
+    """Суммарное время импорта main по -X importtime, мкс."""
+    output = _run_python("-X", "importtime", "-c", "import main").stderr
+    for line in output.splitlines():
+        if line.startswith("import time:") and line.split("|")[-1].strip() == "main":
+            return int(line.split("|")[1])
+    raise AssertionError("main не найден в выводе -X importtime")
+
+
+def test_main_import_skips_heavy_modules():
+    """Тест: импорт main не тянет тяжелые модули."""
+    script = (
+        "import sys; before = set(sys.modules); import main; "
+        "print('\\n'.join(sorted(set(sys.modules) - before)))"
+    )
+    loaded = set(_run_python("-c", script).stdout.split())
+    assert not [
+        module for module in loaded
+        if any(module == lazy or module.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    ]
+
+
+def test_main_import_time_budget():
+    """Тест: импорт main укладывается в бюджет времени."""
+    _run_python("-c", "import main")  # прогрев: байткод и кэш ОС
+    best = min(_import_time_us() for _ in range(3))
+    assert best < IMPORT_BUDGET_US, f"импорт main занял {best} мкс"
@@ -0,0 +1,142 @@
+import random
+
+import pytest
+
+import wordmatch
+from checker import RULE_NOT_COMMON, PasswordState, evaluate_password
+from config import load_config
+from resources import load_resources
+from wordmatch import (
+    WordMatcher,
+    build_word_matcher,
+    configure_word_matcher,
+    word_coverage,
+)
+
+
+def test_finds_all_embedded_words():
+    """Тест: все слова, включая пересекающиеся, находятся за один проход."""
+    matcher = WordMatcher.build(["password", "word", "sword", "dragon", "he"])
+    found = {
+        ("mypasswordxdragon"[i : j + 1], rank)
+        for i, j, rank in matcher.iter_matches("mypasswordxdragon")
+    }
+    assert found == {("password", 1), ("word", 2), ("sword", 3), ("dragon", 4)}
+
+
+def test_save_and_load(tmp_path):
+    """Тест: автомат сохраняется в файл и загружается без перестроения."""
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("monkey\nsunshine\n", encoding="utf-8")
+    path = tmp_path / "words.acm"
+    assert build_word_matcher(str(wordlist), str(path)) == 2
+
+    matcher = WordMatcher.load(str(path))
+    assert list(matcher.iter_matches("xsunshinex")) == [(1, 8, 2)]
+
+    junk = tmp_path / "junk.acm"
+    junk.write_bytes(b"not an automaton")
+    with pytest.raises(ValueError):
+        WordMatcher.load(str(junk))
+
+
+def test_word_based_password_is_common(tmp_path):
+    """Тест: пароль на основе слова (с l33t-заменами) считается простым."""
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("password\ndragon\n", encoding="utf-8")
+    path = tmp_path / "words.acm"
+    build_word_matcher(str(wordlist), str(path))
+
+    try:
+        assert evaluate_password("MyPassword2024!")["details"][5]["passed"]
+        configure_word_matcher(str(path))
+        assert word_coverage("dr4g0n$$99") >= 0.5
+        detail = evaluate_password("MyPassword2024!")["details"][5]
+        assert not detail["passed"]
+        assert detail["message"] == "Пароль построен на словарном слове"
+        assert evaluate_password("Xk9#mQ2$vL7!")["details"][5]["passed"]
+    finally:
+        configure_word_matcher("")
+    assert wordmatch.get_word_matcher() is None
+
+
+def test_word_rule_is_off_by_default():
+    """Тест: без WORD_MATCHER_PATH поиск слов выключен, правило проходит."""
+    config = load_config({})
+    assert config["word_matcher_path"] == ""
+    load_resources(config)
+
+    assert wordmatch.get_word_matcher() is None
+    assert word_coverage("MyPassword2024!") == 0
+    assert evaluate_password("MyPassword2024!")["details"][5]["passed"]
+
+
+def test_loaded_matcher_is_shared_mapping(tmp_path, monkeypatch):
+    """Тест: загруженный автомат работает по mmap, кэш переходов ограничен."""
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("password\ndragon\nmonkey\n", encoding="utf-8")
+    path = tmp_path / "words.acm"
+    build_word_matcher(str(wordlist), str(path))
+    built = WordMatcher.build(["password", "dragon", "monkey"])
+
+    monkeypatch.setattr(wordmatch, "TRANSITION_CACHE_SIZE", 4)
+    matcher = WordMatcher.load(str(path))
+    text = "xdragonpasswordmonkeyx"
+    assert list(matcher.iter_matches(text)) == list(built.iter_matches(text))
+    assert len(matcher._cache) <= 4
+
+    matcher.close()
+    matcher.close()
+
+
+def test_password_state_tracks_words(tmp_path):
+    """Тест: инкрементальный поиск слов совпадает с word_coverage при любых правках."""
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("password\ndragon\nmonkey\nsunshine\nword\n", encoding="utf-8")
+    path = tmp_path / "words.acm"
+    build_word_matcher(str(wordlist), str(path))
+
+    rng = random.Random(7)
+    alphabet = "passwordragonmky$0413!AZ"
+    try:
+        configure_word_matcher(str(path))
+        state = PasswordState()
+        for _ in range(500):
+            password = state.password
+            edit = rng.random()
+            if edit < 0.5:
+                state.append(rng.choice(alphabet))
+            elif edit < 0.7:
+                state.delete(rng.randint(1, 3))
+            else:
+                start = rng.randint(0, len(password))
+                end = rng.randint(start, len(password))
+                state.replace_range(
+                    start, end, "".join(rng.choices(alphabet, k=rng.randint(0, 4)))
+                )
+            assert state.result().to_dict() == evaluate_password(state.password)
+
+        state.set("dr4g0nM0nk3y!")
+        assert not state.result().passed & RULE_NOT_COMMON
+        with pytest.raises(IndexError):
+            state.replace_range(5, 100, "")
+    finally:
+        configure_word_matcher("")
+
+
+def test_failed_reload_keeps_previous_matcher(tmp_path):
+    """Тест: если новый автомат не загрузился, прежний остается рабочим."""
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("dragon\n", encoding="utf-8")
+    path = tmp_path / "words.acm"
+    build_word_matcher(str(wordlist), str(path))
+    junk = tmp_path / "junk.acm"
+    junk.write_bytes(b"not an automaton")
+
+    try:
+        configure_word_matcher(str(path))
+        with pytest.raises(ValueError):
+            configure_word_matcher(str(junk))
+        assert word_coverage("dragon") == 1
+    finally:
+        configure_word_matcher("")